@@ -0,0 +1,260 @@
+"""A local WebSocket proxy which splits large messages from the server into smaller ones for the Brotato client.
+
+Godot 3.5's WebSocket client silently drops any message larger than its input buffer (see PayloadSize.py). Large
+collects and releases can send more items in one message than the client can receive, and the server sends other
+commands, like the PrintJSON messages for each item, in the same frame. This proxy sits between the client and the
+server, and re-packs each message from the server into messages no larger than a byte budget:
+
+- Commands are grouped into as few messages as fit in the budget, in their original order.
+- A ReceivedItems command which doesn't fit on its own is split into several ReceivedItems commands with contiguous
+  indexes, so the client sees the same items in the same order.
+- The messages making up a split message are sent with a short delay between them so the client can keep up.
+
+Messages under the budget, and everything the client sends to the server, are passed through unchanged.
+
+To use it, run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.ChunkingProxy wss://archipelago.gg:38281
+
+then connect the Brotato client to `ws://localhost:38282`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import websockets
+
+from .PayloadSize import CLIENT_IN_BUFFER_BYTES
+
+logger = logging.getLogger("BrotatoChunkingProxy")
+
+DEFAULT_PORT = 38282
+# Leave plenty of headroom below the client's buffer size, since Godot also buffers the frame's headers.
+DEFAULT_MAX_MESSAGE_BYTES = CLIENT_IN_BUFFER_BYTES // 4
+DEFAULT_CHUNK_INTERVAL_SECONDS = 0.05
+
+# Size of the "[" and "]" around the commands in a message, and the "," between them.
+_MESSAGE_OVERHEAD_BYTES = 2
+_SEPARATOR_BYTES = 1
+
+_encoder = json.JSONEncoder(ensure_ascii=False, check_circular=False, separators=(",", ":"))
+
+
+def _encoded_size(obj: Any) -> int:
+    return len(_encoder.encode(obj).encode("utf-8"))
+
+
+def split_received_items(command: Dict[str, Any], max_command_bytes: int) -> List[Dict[str, Any]]:
+    """Split a ReceivedItems command into commands no larger than `max_command_bytes`, with contiguous indexes.
+
+    Each resulting command has at least one item, so a command containing a single item larger than the budget is
+    still returned, just larger than requested.
+    """
+    items: List[Any] = command["items"]
+    index: int = command["index"]
+    empty_size = _encoded_size({**command, "items": []})
+
+    chunks: List[Dict[str, Any]] = []
+    chunk_items: List[Any] = []
+    chunk_size = empty_size
+    for item in items:
+        item_size = _encoded_size(item) + (_SEPARATOR_BYTES if chunk_items else 0)
+        if chunk_items and chunk_size + item_size > max_command_bytes:
+            chunks.append({**command, "index": index, "items": chunk_items})
+            index += len(chunk_items)
+            chunk_items = []
+            chunk_size = empty_size
+            item_size -= _SEPARATOR_BYTES
+        chunk_items.append(item)
+        chunk_size += item_size
+    if chunk_items or not chunks:
+        chunks.append({**command, "index": index, "items": chunk_items})
+    return chunks
+
+
+def split_message(commands: Sequence[Dict[str, Any]], max_message_bytes: int) -> List[str]:
+    """Re-pack a list of commands into encoded messages no larger than `max_message_bytes`, preserving their order.
+
+    Only ReceivedItems commands are split. Any other command which doesn't fit in the budget on its own is sent in a
+    message by itself.
+    """
+    max_command_bytes = max_message_bytes - _MESSAGE_OVERHEAD_BYTES
+    messages: List[str] = []
+    message_commands: List[str] = []
+    message_size = _MESSAGE_OVERHEAD_BYTES
+
+    for command in commands:
+        encoded_command = _encoder.encode(command)
+        if len(encoded_command.encode("utf-8")) > max_command_bytes and command.get("cmd") == "ReceivedItems":
+            encoded_commands = [_encoder.encode(chunk) for chunk in split_received_items(command, max_command_bytes)]
+        else:
+            encoded_commands = [encoded_command]
+
+        for encoded in encoded_commands:
+            command_size = len(encoded.encode("utf-8")) + (_SEPARATOR_BYTES if message_commands else 0)
+            if message_commands and message_size + command_size > max_message_bytes:
+                messages.append(f"[{','.join(message_commands)}]")
+                message_commands = []
+                message_size = _MESSAGE_OVERHEAD_BYTES
+                command_size -= _SEPARATOR_BYTES
+            message_commands.append(encoded)
+            message_size += command_size
+
+    if message_commands or not messages:
+        messages.append(f"[{','.join(message_commands)}]")
+    return messages
+
+
+@dataclass
+class ProxyStats:
+    """Counters for the messages sent from the server to the client through the proxy."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    server_messages: int = 0
+    """Messages received from the server."""
+    server_bytes: int = 0
+    split_messages: int = 0
+    """Messages from the server which were over the budget and had to be split."""
+    client_messages: int = 0
+    """Messages sent to the client, including the ones resulting from split messages."""
+    oversized_client_messages: int = 0
+    """Messages sent to the client which are still over the budget, since they couldn't be split."""
+    processing_seconds: float = 0.0
+    """Time spent checking, decoding and re-packing every message from the server, which is the latency the proxy adds
+    before forwarding them."""
+    pacing_seconds: float = 0.0
+    """Time spent waiting between the parts of split messages."""
+
+    def report(self) -> str:
+        elapsed = time.perf_counter() - self.started_at
+        throughput = self.server_bytes / elapsed / 1024 if elapsed > 0 else 0.0
+        overhead = self.processing_seconds / self.server_messages * 1000 if self.server_messages else 0.0
+        return (
+            f"{self.server_messages} messages ({self.server_bytes / 1024:.1f} KiB) from server in {elapsed:.1f}s "
+            f"({throughput:.1f} KiB/s), {self.split_messages} split into {self.client_messages} messages to client, "
+            f"{self.oversized_client_messages} still oversized. Mean overhead {overhead:.3f}ms per message, "
+            f"{self.pacing_seconds:.2f}s spent pacing."
+        )
+
+
+class ChunkingProxy:
+    """Proxies WebSocket connections to an Archipelago server, splitting messages which are too large for the client.
+
+    Each client connecting to the proxy gets its own connection to the server.
+    """
+
+    server_url: str
+    max_message_bytes: int
+    chunk_interval: float
+    stats: ProxyStats
+    """Combined stats for all connections made through the proxy."""
+
+    def __init__(
+        self,
+        server_url: str,
+        max_message_bytes: int = DEFAULT_MAX_MESSAGE_BYTES,
+        chunk_interval: float = DEFAULT_CHUNK_INTERVAL_SECONDS,
+    ):
+        self.server_url = server_url
+        self.max_message_bytes = max_message_bytes
+        self.chunk_interval = chunk_interval
+        self.stats = ProxyStats()
+
+    def serve(self, host: str = "localhost", port: int = DEFAULT_PORT):
+        """Start accepting client connections. Use the result as an async context manager, like websockets.serve."""
+        # The client's messages are small, so keep the default incoming size limit from the client.
+        return websockets.serve(self.handle_client, host, port, ping_interval=None)
+
+    async def handle_client(self, client: Any, path: Optional[str] = None):
+        # Messages from the server can be much larger than the default limit of 1 MiB.
+        async with websockets.connect(self.server_url, max_size=None, ping_interval=None) as server:
+            tasks = [
+                asyncio.ensure_future(self._forward_to_client(server, client)),
+                asyncio.ensure_future(self._forward_to_server(client, server)),
+            ]
+            try:
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            for task in done:
+                exception = task.exception()
+                if exception and not isinstance(exception, websockets.ConnectionClosed):
+                    raise exception
+        logger.info(self.stats.report())
+
+    async def _forward_to_server(self, client: Any, server: Any):
+        async for message in client:
+            await server.send(message)
+
+    async def _forward_to_client(self, server: Any, client: Any):
+        async for message in server:
+            start = time.perf_counter()
+            stats = self.stats
+            stats.server_messages += 1
+            # Most messages are tiny, so only the size check is done for them.
+            message_size = len(message) if isinstance(message, bytes) else len(message.encode("utf-8"))
+            stats.server_bytes += message_size
+            if message_size <= self.max_message_bytes:
+                stats.processing_seconds += time.perf_counter() - start
+                stats.client_messages += 1
+                await client.send(message)
+                continue
+
+            parts = split_message(json.loads(message), self.max_message_bytes)
+            stats.processing_seconds += time.perf_counter() - start
+            stats.split_messages += 1
+            for i, part in enumerate(parts):
+                if i > 0:
+                    await asyncio.sleep(self.chunk_interval)
+                    stats.pacing_seconds += self.chunk_interval
+                stats.client_messages += 1
+                if len(part.encode("utf-8")) > self.max_message_bytes:
+                    stats.oversized_client_messages += 1
+                await client.send(part)
+            logger.debug(f"Split a {message_size} byte message into {len(parts)} messages.")
+
+
+async def _run_proxy(args: argparse.Namespace):
+    proxy = ChunkingProxy(args.server_url, args.max_message_bytes, args.chunk_interval)
+    async with proxy.serve(args.host, args.port):
+        logger.info(f"Proxying ws://{args.host}:{args.port} to {args.server_url}.")
+        await asyncio.Future()
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("server_url", help="URL of the Archipelago server, e.g. wss://archipelago.gg:38281.")
+    parser.add_argument("--host", default="localhost", help="Host to accept client connections on.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to accept client connections on.")
+    parser.add_argument(
+        "--max-message-bytes",
+        type=int,
+        default=DEFAULT_MAX_MESSAGE_BYTES,
+        help="Largest message to send to the client. Larger messages from the server are split.",
+    )
+    parser.add_argument(
+        "--chunk-interval",
+        type=float,
+        default=DEFAULT_CHUNK_INTERVAL_SECONDS,
+        help="Seconds to wait between sending the parts of a split message.",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every split message.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s")
+    try:
+        asyncio.run(_run_proxy(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -92,3 +92,32 @@ LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE = "Legendary Loot Crate {num}"
 WAVE_COMPLETE_LOCATION_TEMPLATE = "Wave {wave} Completed ({char})"
 RUN_COMPLETE_LOCATION_TEMPLATE = "Run Won ({char})"
 SHOP_ITEM_LOCATION_TEMPLATE = "{tier} Shop Item {num}"
+
+# Data storage key the client records the characters the player has won a run with in, as a bitmask with bit i set for
+# CHARACTERS[i]. "Run Won" locations are events, so the server doesn't know which runs the player won otherwise.
+RUN_WINS_DATA_STORAGE_KEY_TEMPLATE = "Brotato_RunWins_{team}_{slot}"
+
+# Location ID layout. Each kind of location has a fixed block of IDs, and the ID of a location is computed from its
+# position within its block. These values must never change, since generated games and clients rely on them.
+#
+# NOTE: Location IDs start at twice BASE_ID. This is a quirk of how IDs were originally assigned and is kept so that
+# existing IDs stay the same.
+LOCATION_BASE_ID = BASE_ID * 2
+# Each character has a block of NUM_WAVES + 1 IDs: one for each wave, followed by one which was used for winning a run.
+# "Run Won" locations are now events without an ID, so the last ID in each block is retired and never reused.
+# ID = base + (character index * CHARACTER_LOCATION_ID_STRIDE) + (wave - 1)
+WAVE_COMPLETE_LOCATION_BASE_ID = LOCATION_BASE_ID
+CHARACTER_LOCATION_ID_STRIDE = NUM_WAVES + 1
+# ID = base + tier offset + (num - 1)
+SHOP_ITEM_LOCATION_BASE_ID = LOCATION_BASE_ID + 924
+SHOP_ITEM_LOCATION_TIER_OFFSETS = {
+    ItemRarity.COMMON: 0,
+    ItemRarity.UNCOMMON: 20,
+    ItemRarity.RARE: 30,
+    ItemRarity.LEGENDARY: 40,
+}
+# ID = base + (num - 1)
+CRATE_DROP_LOCATION_BASE_ID = LOCATION_BASE_ID + 974
+# ID = base + (num - 1)
+LEGENDARY_CRATE_DROP_LOCATION_BASE_ID = LOCATION_BASE_ID + 1024
+LOCATION_MAX_ID = LEGENDARY_CRATE_DROP_LOCATION_BASE_ID + MAX_LEGENDARY_CRATE_DROPS - 1
@@ -0,0 +1,102 @@
+"""Build and load the manifest of every item and location ID Brotato has ever assigned.
+
+The item and location names and IDs are defined in Items.py and Locations.py, which are the only source of them the
+world uses. `data/id_manifest.json` records the ID of every item and location that has ever existed, so tests can
+check that none of them changed. IDs in it must never change, and IDs of removed items and locations are kept as
+retired so they're never reused for something else.
+
+Rebuild the manifest after adding or removing any item or location, from the root of an Archipelago installation:
+
+    python -m worlds.brotato.DataPackage
+
+Use `--check` to only check that the manifest is up to date.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pkgutil
+from typing import Any, Dict, Optional, Sequence
+
+from .Items import item_name_to_id
+from .Locations import location_name_to_id
+
+ID_MANIFEST_FILE = "data/id_manifest.json"
+
+
+def build_id_manifest(previous_manifest: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, Dict[str, int]]:
+    """Add the current items and locations to the ID manifest, retiring any which no longer exist.
+
+    Raises ValueError if the ID of an existing item or location changed, or if an ID was reused.
+    """
+    previous_manifest = previous_manifest or {}
+    manifest: Dict[str, Dict[str, int]] = {}
+    for kind, name_to_id in (("items", item_name_to_id), ("locations", location_name_to_id)):
+        previous_ids = previous_manifest.get(kind, {})
+        retired_ids = dict(previous_manifest.get(f"retired_{kind}", {}))
+        for name, previous_id in previous_ids.items():
+            if name not in name_to_id:
+                retired_ids[name] = previous_id
+            elif name_to_id[name] != previous_id:
+                raise ValueError(f"ID of {name} changed from {previous_id} to {name_to_id[name]}.")
+
+        ids_in_use = {id_: name for name, id_ in retired_ids.items()}
+        for name, id_ in name_to_id.items():
+            if name in retired_ids:
+                raise ValueError(f"{name} was retired with ID {retired_ids[name]} and can't be added back.")
+            if id_ in ids_in_use:
+                raise ValueError(f"ID {id_} of {name} was already used by {ids_in_use[id_]}.")
+            ids_in_use[id_] = name
+
+        manifest[kind] = dict(sorted(name_to_id.items(), key=lambda name_and_id: name_and_id[1]))
+        manifest[f"retired_{kind}"] = dict(sorted(retired_ids.items(), key=lambda name_and_id: name_and_id[1]))
+    return manifest
+
+
+def load_id_manifest() -> Dict[str, Dict[str, int]]:
+    return json.loads(pkgutil.get_data(__package__, ID_MANIFEST_FILE))
+
+
+def _dump(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, indent=2) + "\n"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Check the files are up to date instead of writing them.")
+    args = parser.parse_args(argv)
+
+    world_dir = os.path.dirname(__file__)
+    try:
+        previous_manifest = load_id_manifest()
+    except OSError:
+        previous_manifest = None
+    outputs = {ID_MANIFEST_FILE: _dump(build_id_manifest(previous_manifest))}
+
+    out_of_date = []
+    for file_name, contents in outputs.items():
+        path = os.path.join(world_dir, file_name)
+        if args.check:
+            try:
+                with open(path, encoding="utf-8") as existing_file:
+                    up_to_date = existing_file.read() == contents
+            except FileNotFoundError:
+                up_to_date = False
+            if not up_to_date:
+                out_of_date.append(file_name)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8", newline="\n") as output_file:
+                output_file.write(contents)
+            print(f"Wrote {path}")
+
+    if out_of_date:
+        print(f"Out of date, rebuild with `python -m worlds.brotato.DataPackage`: {', '.join(out_of_date)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,331 @@
+"""Check whether Brotato options can be generated, without generating anything.
+
+The number of locations and items a Brotato player has only depends on their options, so we can count them and find
+option combinations that would fail generation, such as more items than locations, before spending minutes
+generating a large multiworld.
+
+Player YAMLs can weight several values for an option. Every count only increases or only decreases as an option
+increases, so checking every combination of the lowest and highest possible value of each option is enough to find
+whether any roll of the YAML can fail. Bundling filler only removes locations when there's filler left over, so it
+never makes a roll fail. Triggers aren't applied.
+
+To check a folder of player YAMLs, run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.Feasibility Players/
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+from typing import Any, Collection, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from Options import Choice, Range
+
+from .Constants import CHARACTERS, DEFAULT_CHARACTERS, MAX_SHOP_SLOTS, NUM_CHARACTERS, NUM_WAVES
+from .Options import BrotatoOptions
+from .PayloadSize import estimate_message_sizes
+
+GAME = "Brotato"
+
+# The options the counts depend on. Every other option is left at its default when checking YAMLs.
+COUNTED_OPTIONS = (
+    "starting_characters",
+    "num_starting_characters",
+    "waves_per_drop",
+    "num_common_crate_drops",
+    "num_legendary_crate_drops",
+    "num_common_upgrades",
+    "num_uncommon_upgrades",
+    "num_rare_upgrades",
+    "num_legendary_upgrades",
+    "num_starting_shop_slots",
+    "filler_bundle_size",
+)
+
+
+class SlotCounts(NamedTuple):
+    """The number of locations and items a Brotato player has, as created by BrotatoWorld."""
+
+    num_locations: int
+    """Locations items can be placed in, not including the "Run Won" event locations."""
+    num_items: int
+    """Items in the item pool before filler is added."""
+    num_starting_characters: int
+    """Characters the player starts with, which they receive as items when connecting."""
+    num_removed_wave_checks: int = 0
+    """Wave complete locations left out because bundling filler leaves fewer items, see FillerBundleSize."""
+
+    @property
+    def num_filler_items(self) -> int:
+        """The number of filler items added to fill the remaining locations. Negative if there are too many items.
+
+        This is after bundling, so each item may be a bundle of several gold or XP items.
+        """
+        return self.num_locations - self.num_items
+
+
+class Verdict(NamedTuple):
+    counts: SlotCounts
+    errors: Tuple[str, ...]
+    """Problems which will make generation fail."""
+    warnings: Tuple[str, ...]
+    """Problems which won't stop generation, but can break the game once generated."""
+
+    @property
+    def feasible(self) -> bool:
+        return not self.errors
+
+
+def get_waves_with_checks(waves_per_drop: int) -> List[int]:
+    """Get the waves which have a "Wave Complete" location for each character."""
+    return list(range(waves_per_drop, NUM_WAVES + 1, waves_per_drop))
+
+
+def spread_removed_wave_checks(
+    num_removed: int, num_waves_with_checks: int, starting_characters: Collection[str]
+) -> List[int]:
+    """Choose how many wave complete checks bundling filler removes from each character, in CHARACTERS order.
+
+    Each character loses the checks for their highest waves. Characters the player doesn't start with lose checks
+    first, spread as evenly as possible, to leave the locations reachable at the start to the main fill.
+    """
+    num_removed_by_character = [0] * NUM_CHARACTERS
+    other_indexes = [i for i, character in enumerate(CHARACTERS) if character not in starting_characters]
+    starting_indexes = [i for i, character in enumerate(CHARACTERS) if character in starting_characters]
+    for indexes in (other_indexes, starting_indexes):
+        if not indexes:
+            continue
+        num_removed_from_group = min(num_removed, len(indexes) * num_waves_with_checks)
+        num_each, num_extra = divmod(num_removed_from_group, len(indexes))
+        for position, index in enumerate(indexes):
+            num_removed_by_character[index] = num_each + (position < num_extra)
+        num_removed -= num_removed_from_group
+    return num_removed_by_character
+
+
+def count_slot(options: BrotatoOptions) -> SlotCounts:
+    """Count the locations and items a player with these options will have, without creating any of them."""
+    num_waves_with_checks = len(get_waves_with_checks(options.waves_per_drop.value))
+    num_common_crate_drops = options.num_common_crate_drops.value
+    num_legendary_crate_drops = options.num_legendary_crate_drops.value
+    if options.starting_characters.value == 0:
+        num_starting_characters = len(DEFAULT_CHARACTERS)
+    else:
+        num_starting_characters = options.num_starting_characters.value
+
+    num_items = (
+        # Characters to unlock
+        NUM_CHARACTERS
+        - num_starting_characters
+        # One item for each crate drop location
+        + num_common_crate_drops
+        + num_legendary_crate_drops
+        + options.num_common_upgrades.value
+        + options.num_uncommon_upgrades.value
+        + options.num_rare_upgrades.value
+        + options.num_legendary_upgrades.value
+        + max(MAX_SHOP_SLOTS - options.num_starting_shop_slots.value, 0)
+    )
+    num_locations = NUM_CHARACTERS * num_waves_with_checks + num_common_crate_drops + num_legendary_crate_drops
+
+    # Bundling turns every `bundle_size` filler items into one, and a wave complete check is removed for each item
+    # saved, so the items still match the locations. See BrotatoWorld.create_itempool.
+    num_removed_wave_checks = 0
+    num_unbundled_filler_items = num_locations - num_items
+    if num_unbundled_filler_items > 0:
+        num_bundles, num_left_over = divmod(num_unbundled_filler_items, options.filler_bundle_size.value)
+        num_removed_wave_checks = num_unbundled_filler_items - num_bundles - num_left_over
+    return SlotCounts(
+        num_locations=num_locations - num_removed_wave_checks,
+        num_items=num_items,
+        num_starting_characters=num_starting_characters,
+        num_removed_wave_checks=num_removed_wave_checks,
+    )
+
+
+def check_options(options: BrotatoOptions, num_players: int = 1, check_message_sizes: bool = True) -> Verdict:
+    """Check whether a player with these options can be generated in a multiworld with `num_players` players.
+
+    Estimating the message sizes takes far longer than the other checks, so can be skipped.
+    """
+    counts = count_slot(options)
+    errors: List[str] = []
+    warnings: List[str] = []
+    if counts.num_filler_items < 0:
+        errors.append(
+            f"{counts.num_items} items but only {counts.num_locations} locations. Lower the number of upgrades, "
+            "lower waves_per_drop, or add more crate drop locations."
+        )
+    if check_message_sizes:
+        warnings += _message_size_warnings(options, num_players)
+    return Verdict(counts, tuple(errors), tuple(warnings))
+
+
+def _message_size_warnings(options: BrotatoOptions, num_players: int) -> List[str]:
+    oversized_messages = estimate_message_sizes(options, num_players).oversized_messages()
+    if oversized_messages:
+        return [f"Messages may be too large for the client to receive: {', '.join(oversized_messages)}."]
+    return []
+
+
+def options_from_values(values: Mapping[str, Any]) -> BrotatoOptions:
+    """Create BrotatoOptions from a value for each option, using the default for any which are missing."""
+    return BrotatoOptions(
+        **{
+            name: option_type.from_any(values.get(name, option_type.default))
+            for name, option_type in BrotatoOptions.type_hints.items()
+        }
+    )
+
+
+def _possible_values(option_type: type, weighted_value: Any) -> List[Any]:
+    """Get every value an option can roll to from a YAML value, which may be weighted or random."""
+    if isinstance(weighted_value, dict):
+        values = [value for value, weight in weighted_value.items() if weight]
+    else:
+        values = [weighted_value]
+
+    possible_values = []
+    for value in values:
+        if isinstance(value, str) and value.startswith("random"):
+            if issubclass(option_type, Range):
+                low, high = option_type.range_start, option_type.range_end
+                if value.startswith("random-range-"):
+                    # random-range-<low>-<high>, or random-range-<low|middle|high>-<low>-<high>
+                    low, high = sorted(int(bound) for bound in value.split("-")[-2:])
+                possible_values += [max(low, option_type.range_start), min(high, option_type.range_end)]
+            elif issubclass(option_type, Choice):
+                possible_values += option_type.options.values()
+            else:
+                raise ValueError(f"Can't check random values for {option_type.__name__}.")
+        else:
+            possible_values.append(option_type.from_any(value).value)
+    return possible_values
+
+
+def option_extremes(weighted_options: Mapping[str, Any]) -> Iterable[Dict[str, Any]]:
+    """Get every combination of the lowest and highest possible values of each counted option in a YAML section."""
+    type_hints = BrotatoOptions.type_hints
+    candidates: Dict[str, List[Any]] = {}
+    for name in COUNTED_OPTIONS:
+        option_type = type_hints[name]
+        possible_values = _possible_values(option_type, weighted_options.get(name, option_type.default))
+        if issubclass(option_type, Range):
+            candidates[name] = sorted({min(possible_values), max(possible_values)})
+        else:
+            candidates[name] = sorted(set(possible_values), key=str)
+    for values in itertools.product(*candidates.values()):
+        yield dict(zip(candidates, values))
+
+
+class SlotResult(NamedTuple):
+    path: str
+    name: str
+    num_rolls: int
+    """The number of option combinations checked."""
+    failing_rolls: List[Tuple[Dict[str, Any], Verdict]]
+    warnings: List[str]
+
+    @property
+    def status(self) -> str:
+        if not self.failing_rolls:
+            return "OK"
+        return "FAILS" if len(self.failing_rolls) == self.num_rolls else "CAN FAIL"
+
+
+def check_weighted_options(
+    path: str, name: str, weighted_options: Mapping[str, Any], num_players: int = 1
+) -> SlotResult:
+    """Check every extreme roll of a player's Brotato YAML section, see option_extremes."""
+    num_rolls = 0
+    failing_rolls: List[Tuple[Dict[str, Any], Verdict]] = []
+    largest_roll: Optional[Tuple[Tuple[int, int], BrotatoOptions]] = None
+    for values in option_extremes(weighted_options):
+        num_rolls += 1
+        options = options_from_values(values)
+        verdict = check_options(options, num_players, check_message_sizes=False)
+        if not verdict.feasible:
+            failing_rolls.append((values, verdict))
+        # Messages are largest for the roll with the most locations and starting characters. The options for these
+        # don't depend on each other, so one roll has the most of both. Bundling filler can remove fewer wave checks
+        # from a roll between the extremes, so this can miss a few locations, fewer than one bundle.
+        size = (verdict.counts.num_locations, verdict.counts.num_starting_characters)
+        if largest_roll is None or size > largest_roll[0]:
+            largest_roll = (size, options)
+    warnings = _message_size_warnings(largest_roll[1], num_players) if largest_roll else []
+    return SlotResult(path, name, num_rolls, failing_rolls, warnings)
+
+
+def check_yaml_file(path: str, num_players: int = 1) -> List[SlotResult]:
+    """Check every Brotato player in a YAML file. Players which can't roll Brotato are skipped."""
+    from Utils import parse_yamls
+
+    with open(path, encoding="utf-8-sig") as yaml_file:
+        documents = list(parse_yamls(yaml_file.read()))
+
+    results = []
+    for document in documents:
+        game = document.get("game")
+        if not (game == GAME or (isinstance(game, dict) and game.get(GAME))):
+            continue
+        name = str(document.get("name", os.path.basename(path)))
+        results.append(check_weighted_options(path, name, document.get(GAME) or {}, num_players))
+    return results
+
+
+def _yaml_paths(paths: Sequence[str]) -> List[str]:
+    yaml_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            yaml_paths += sorted(
+                os.path.join(path, file_name)
+                for file_name in os.listdir(path)
+                if file_name.endswith((".yaml", ".yml"))
+            )
+        else:
+            yaml_paths.append(path)
+    return yaml_paths
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    # Imported here since the world imports this module for count_slot, and multiprocessing is slow to import.
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Player YAML files, or folders containing them.")
+    parser.add_argument(
+        "--players", type=int, default=None, help="Players in the multiworld. Defaults to the number of YAMLs."
+    )
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes. Defaults to the CPU count.")
+    parser.add_argument("--quiet", action="store_true", help="Only print players which can fail.")
+    args = parser.parse_args(argv)
+
+    yaml_paths = _yaml_paths(args.paths)
+    num_players = args.players or len(yaml_paths)
+    with ProcessPoolExecutor(args.processes) as executor:
+        file_results = executor.map(
+            check_yaml_file, yaml_paths, itertools.repeat(num_players), chunksize=max(len(yaml_paths) // 256, 1)
+        )
+        results = [result for results in file_results for result in results]
+
+    for result in results:
+        if args.quiet and result.status == "OK":
+            continue
+        print(f"{result.path}: {result.name}: {result.status} ({len(result.failing_rolls)}/{result.num_rolls} rolls)")
+        if result.failing_rolls:
+            values, verdict = result.failing_rolls[0]
+            print(f"  e.g. {', '.join(f'{name}={value}' for name, value in values.items())}")
+            for error in verdict.errors:
+                print(f"  ERROR: {error}")
+        for warning in result.warnings:
+            print(f"  WARNING: {warning}")
+
+    num_failing = sum(1 for result in results if result.failing_rolls)
+    print(f"{num_failing}/{len(results)} Brotato player(s) can fail generation.")
+    return 1 if num_failing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+"""A compact description of Brotato's item and location IDs, sent to the client in slot data.
+
+Location IDs are computed from their kind and position (see the location ID layout in Constants.py), and item IDs are
+consecutive, so a few base IDs and two name lists are enough for the client to compute the ID of every location it
+checks and the name of every item it receives. This lets the client connect without requesting the data package,
+which is much larger. See `BrotatoDataPackage.from_id_layout` in the client's data_package.gd.
+
+Each item's effect is sent alongside its name, so the client can apply received items by looking them up by ID instead
+of matching on their names.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional
+
+from .Constants import (
+    CHARACTER_LOCATION_ID_STRIDE,
+    CHARACTERS,
+    CRATE_DROP_LOCATION_BASE_ID,
+    LEGENDARY_CRATE_DROP_LOCATION_BASE_ID,
+    WAVE_COMPLETE_LOCATION_BASE_ID,
+    ItemRarity,
+)
+from .Items import ItemEffectKind, ItemName, get_item_effect, item_name_to_id
+
+# Increase when the meaning of any existing field changes, so the client can fall back to the data package.
+# Version 2 removed "run_complete_base_id", since "Run Won" locations are now events without IDs.
+ID_LAYOUT_VERSION = 2
+
+
+def get_id_layout(item_name_to_id: Mapping[str, int]) -> Dict[str, Any]:
+    """Get the ID layout to send to the client in slot data.
+
+    `items` lists the item names in ID order starting from `item_base_id`, with null for any unused IDs in between.
+    `characters` lists the characters in the order of their blocks of wave complete location IDs.
+    `item_effects` is aligned with `items`, giving each item's effect as `[kind, amount, tier]`, where `kind` and `tier`
+    are indexes into `item_effect_kinds` and `item_tiers`, and `tier` is -1 for items without one.
+    """
+    effect_kinds = list(ItemEffectKind)
+    tiers = list(ItemRarity)
+    item_base_id = min(item_name_to_id.values())
+    items: List[Optional[str]] = [None] * (max(item_name_to_id.values()) - item_base_id + 1)
+    item_effects: List[Optional[List[int]]] = [None] * len(items)
+    for name, item_id in item_name_to_id.items():
+        effect = get_item_effect(ItemName(name))
+        items[item_id - item_base_id] = name
+        item_effects[item_id - item_base_id] = [
+            effect_kinds.index(effect.kind),
+            effect.amount,
+            tiers.index(effect.tier) if effect.tier is not None else -1,
+        ]
+
+    return {
+        "version": ID_LAYOUT_VERSION,
+        "wave_complete_base_id": WAVE_COMPLETE_LOCATION_BASE_ID,
+        "character_stride": CHARACTER_LOCATION_ID_STRIDE,
+        "crate_drop_base_id": CRATE_DROP_LOCATION_BASE_ID,
+        "legendary_crate_drop_base_id": LEGENDARY_CRATE_DROP_LOCATION_BASE_ID,
+        "characters": list(CHARACTERS),
+        "item_base_id": item_base_id,
+        "items": items,
+        "item_effect_kinds": [kind.value for kind in effect_kinds],
+        "item_tiers": [tier.value for tier in tiers],
+        "item_effects": item_effects,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_world_id_layout() -> Dict[str, Any]:
+    """Get the ID layout for the world's items. Built on first call and shared by every player afterwards, so don't
+    modify it."""
+    return get_id_layout(item_name_to_id)
@@ -0,0 +1,166 @@
+"""Opt-in timing and counters for Brotato generation.
+
+Set the `BROTATO_INSTRUMENTATION` environment variable to `1` before generating to record, for each Brotato player:
+
+* The time spent in each world stage, such as create_regions and fill_slot_data.
+* The number of regions, entrances, locations and items created, and how many of the items are filler.
+* How many times the character entrance rules and the goal condition are evaluated.
+
+These are logged as a single JSON line for each player, once the multidata is written. Set
+`BROTATO_INSTRUMENTATION_FILE` to a path to also write all players to a single JSON file.
+
+When neither variable is set, BrotatoWorld isn't changed at all, so this has no cost.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+from weakref import WeakKeyDictionary
+
+from BaseClasses import CollectionState, Entrance, MultiWorld
+from worlds.AutoWorld import World
+
+from .Items import bundled_filler_items, filler_items
+
+logger = logging.getLogger("Brotato")
+
+INSTRUMENTATION_ENV_VAR = "BROTATO_INSTRUMENTATION"
+INSTRUMENTATION_FILE_ENV_VAR = "BROTATO_INSTRUMENTATION_FILE"
+
+# Every world method called during generation, in the order Main.py calls them.
+INSTRUMENTED_STAGES = (
+    "generate_early",
+    "create_regions",
+    "create_items",
+    "set_rules",
+    "generate_basic",
+    "pre_fill",
+    "post_fill",
+    "generate_output",
+    "fill_slot_data",
+    "modify_multidata",
+)
+
+_filler_item_names = frozenset(filler_items + bundled_filler_items)
+
+
+@dataclass
+class PlayerStats:
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    """Total time spent in each stage. Stages called more than once, like fill_slot_data, add up."""
+    counts: Dict[str, int] = field(default_factory=dict)
+    """Number of regions, entrances, locations and items created, and filler items drawn."""
+    rule_calls: Counter[str] = field(default_factory=Counter)
+    """Number of times the character entrance rules and the goal condition were evaluated."""
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"stage_seconds": self.stage_seconds, "counts": self.counts, "rule_calls": dict(self.rule_calls)}
+
+
+_generation_stats: WeakKeyDictionary[MultiWorld, Dict[int, PlayerStats]] = WeakKeyDictionary()
+
+
+def instrumentation_enabled() -> bool:
+    return bool(os.environ.get(INSTRUMENTATION_ENV_VAR) or os.environ.get(INSTRUMENTATION_FILE_ENV_VAR))
+
+
+def get_generation_stats(multiworld: MultiWorld) -> Dict[int, PlayerStats]:
+    """Get the stats recorded for each Brotato player in a multiworld, keyed by player."""
+    return _generation_stats.setdefault(multiworld, {})
+
+
+def _get_player_stats(world: World) -> PlayerStats:
+    return get_generation_stats(world.multiworld).setdefault(world.player, PlayerStats())
+
+
+def _counted_rule(rule: Callable[[CollectionState], bool], rule_calls: Counter[str], rule_name: str):
+    def counted_rule(state: CollectionState) -> bool:
+        rule_calls[rule_name] += 1
+        return rule(state)
+
+    return counted_rule
+
+
+def _record_stage(world: World, stage: str, stats: PlayerStats, itempool_start: int, precollected_start: int):
+    """Record the counts and wrap the rules added by a stage."""
+    multiworld = world.multiworld
+    player = world.player
+    if stage == "create_regions":
+        regions = list(multiworld.get_regions(player))
+        stats.counts["regions"] = len(regions)
+        stats.counts["entrances"] = sum(len(region.exits) for region in regions)
+        stats.counts["locations"] = sum(len(region.locations) for region in regions)
+    elif stage == "create_items":
+        new_items = multiworld.itempool[itempool_start:]
+        # Filler kept out of the item pool to place in pre_fill, see LocalFillerPercentage.
+        local_filler_items = getattr(world, "_local_filler_items", [])
+        stats.counts["items"] = (
+            len(new_items) + len(local_filler_items) + len(multiworld.precollected_items[player]) - precollected_start
+        )
+        stats.counts["filler_items"] = len(local_filler_items) + sum(
+            1 for item in new_items if item.name in _filler_item_names
+        )
+        stats.counts["local_filler_items"] = len(local_filler_items)
+    elif stage == "set_rules":
+        for region in multiworld.get_regions(player):
+            for entrance in region.exits:
+                # Only the entrances into character regions have rules.
+                if entrance.access_rule is not Entrance.access_rule:
+                    entrance.access_rule = _counted_rule(entrance.access_rule, stats.rule_calls, "character_entrance")
+        multiworld.completion_condition[player] = _counted_rule(
+            multiworld.completion_condition[player], stats.rule_calls, "goal"
+        )
+    elif stage == "modify_multidata":
+        _emit(world, stats)
+
+
+def _emit(world: World, stats: PlayerStats) -> None:
+    multiworld = world.multiworld
+    player_name = multiworld.get_player_name(world.player)
+    logger.info(f"Brotato instrumentation for {player_name}: {json.dumps(stats.to_json())}")
+
+    summary_path = os.environ.get(INSTRUMENTATION_FILE_ENV_VAR)
+    # Write the file once every Brotato player has been recorded, which is after the last one's multidata.
+    if summary_path and world.player == max(multiworld.get_game_players(world.game)):
+        summary = {
+            multiworld.get_player_name(player): player_stats.to_json()
+            for player, player_stats in sorted(get_generation_stats(multiworld).items())
+        }
+        with open(summary_path, "w", encoding="utf-8") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+
+
+def _instrument_stage(stage: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def instrumented_stage(self: World, *args, **kwargs):
+        stats = _get_player_stats(self)
+        itempool_start = len(self.multiworld.itempool)
+        precollected_start = len(self.multiworld.precollected_items[self.player])
+        start = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        stats.stage_seconds[stage] = stats.stage_seconds.get(stage, 0.0) + time.perf_counter() - start
+        _record_stage(self, stage, stats, itempool_start, precollected_start)
+        return result
+
+    return instrumented_stage
+
+
+def instrumented_stages(world_type: type) -> Dict[str, Callable[..., Any]]:
+    """Get instrumented versions of each stage method of a world type, keyed by name."""
+    return {stage: _instrument_stage(stage, getattr(world_type, stage)) for stage in INSTRUMENTED_STAGES}
+
+
+def instrument_world(world_type: type, enabled: Optional[bool] = None) -> None:
+    """Replace the stage methods of a world type with instrumented ones, if instrumentation is enabled."""
+    if enabled is None:
+        enabled = instrumentation_enabled()
+    if enabled:
+        for stage, method in instrumented_stages(world_type).items():
+            setattr(world_type, stage, method)
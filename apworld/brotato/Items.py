@@ -1,31 +1,65 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
-from itertools import count
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
 
 from BaseClasses import Item, ItemClassification
 
-from .Constants import BASE_ID
-
-_id_generator = count(BASE_ID, step=1)
+from .Constants import BASE_ID, CHARACTERS, ItemRarity
 
 
 class BrotatoItem(Item):
     game = "Brotato"
 
+    # Item already uses __slots__, so this keeps instances from getting a __dict__.
+    __slots__ = ()
+
+
+class ItemEffectKind(Enum):
+    ITEM = "item"
+    UPGRADE = "upgrade"
+    SHOP_SLOT = "shop_slot"
+    GOLD = "gold"
+    XP = "xp"
+    CHARACTER = "character"
+    RUN_WON = "run_won"
+
+
+class ItemEffect(NamedTuple):
+    """What an item does when the player receives it, so it doesn't need to be parsed from the item's name.
+
+    `amount` is the gold or XP given for gold and XP items, the number of shop slots for shop slot items, and the index
+    of the character in CHARACTERS for character items. `tier` is only set for item drops and upgrades.
+    """
+
+    kind: ItemEffectKind
+    amount: int = 0
+    tier: Optional[ItemRarity] = None
+
 
 @dataclass(frozen=True)
 class BrotatoItemBase:
     """Hold item data before we assign to a player."""
 
+    # Slots can't be combined with default values on Python < 3.10, so every field needs to be passed.
+    __slots__ = ("name", "classification", "code", "effect")
+
     name: ItemName
     classification: ItemClassification
-    # Auto-increments ID without us having to manually set it, so item definition order matters.
-    code: int = field(default_factory=_id_generator.__next__)
+    code: Optional[int]
+    """The item's ID, or None for events."""
+    effect: ItemEffect
+
+    def get_classification(self, skip_balancing: bool = False) -> ItemClassification:
+        """Get the item's classification, optionally marking progression items to be skipped by balancing."""
+        if skip_balancing and self.classification & ItemClassification.progression:
+            return self.classification | ItemClassification.skip_balancing
+        return self.classification
 
-    def to_item(self, player: int) -> BrotatoItem:
-        return BrotatoItem(self.name.value, self.classification, self.code, player)
+    def to_item(self, player: int, skip_balancing: bool = False) -> BrotatoItem:
+        return BrotatoItem(self.name.value, self.get_classification(skip_balancing), self.code, player)
 
 
 # TODO: Add upgrade items
@@ -95,39 +129,165 @@ class ItemName(Enum):
     CHARACTER_MASOCHIST = "Masochist"
     CHARACTER_KNIGHT = "Knight"
     CHARACTER_DEMON = "Demon"
+    # Larger denominations, only used to bundle the filler above, see FillerBundleSize.
+    GOLD_125 = "Gold (125)"
+    GOLD_250 = "Gold (250)"
+    GOLD_500 = "Gold (500)"
+    GOLD_1000 = "Gold (1000)"
+    GOLD_2000 = "Gold (2000)"
+    XP_125 = "XP (125)"
+    XP_250 = "XP (250)"
+    XP_500 = "XP (500)"
+    XP_750 = "XP (750)"
+    XP_1000 = "XP (1000)"
+    XP_1500 = "XP (1500)"
 
 
 _char_items = [x for x in ItemName if x.name.startswith("CHARACTER_")]
 
-_items: list[BrotatoItemBase] = [
-    BrotatoItemBase(name=ItemName.COMMON_ITEM, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.UNCOMMON_ITEM, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.RARE_ITEM, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.LEGENDARY_ITEM, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.COMMON_UPGRADE, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.UNCOMMON_UPGRADE, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.RARE_UPGRADE, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.LEGENDARY_UPGRADE, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.SHOP_SLOT, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.XP_5, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_10, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_25, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_50, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_100, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_150, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_10, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_25, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_50, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_100, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_200, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.RUN_COMPLETE, classification=ItemClassification.progression),
+# Item IDs are assigned in the order items are defined here, so new items must only ever be added to the end.
+_item_classifications: dict[ItemName, ItemClassification] = {
+    ItemName.COMMON_ITEM: ItemClassification.useful,
+    ItemName.UNCOMMON_ITEM: ItemClassification.useful,
+    ItemName.RARE_ITEM: ItemClassification.useful,
+    ItemName.LEGENDARY_ITEM: ItemClassification.useful,
+    ItemName.COMMON_UPGRADE: ItemClassification.useful,
+    ItemName.UNCOMMON_UPGRADE: ItemClassification.useful,
+    ItemName.RARE_UPGRADE: ItemClassification.useful,
+    ItemName.LEGENDARY_UPGRADE: ItemClassification.useful,
+    ItemName.SHOP_SLOT: ItemClassification.useful,
+    ItemName.XP_5: ItemClassification.filler,
+    ItemName.XP_10: ItemClassification.filler,
+    ItemName.XP_25: ItemClassification.filler,
+    ItemName.XP_50: ItemClassification.filler,
+    ItemName.XP_100: ItemClassification.filler,
+    ItemName.XP_150: ItemClassification.filler,
+    ItemName.GOLD_10: ItemClassification.filler,
+    ItemName.GOLD_25: ItemClassification.filler,
+    ItemName.GOLD_50: ItemClassification.filler,
+    ItemName.GOLD_100: ItemClassification.filler,
+    ItemName.GOLD_200: ItemClassification.filler,
+    ItemName.RUN_COMPLETE: ItemClassification.progression,
     # Individual items for each character
-    *[BrotatoItemBase(name=c, classification=ItemClassification.progression) for c in _char_items],
+    **{c: ItemClassification.progression for c in _char_items},
+    ItemName.GOLD_125: ItemClassification.filler,
+    ItemName.GOLD_250: ItemClassification.filler,
+    ItemName.GOLD_500: ItemClassification.filler,
+    ItemName.GOLD_1000: ItemClassification.filler,
+    ItemName.GOLD_2000: ItemClassification.filler,
+    ItemName.XP_125: ItemClassification.filler,
+    ItemName.XP_250: ItemClassification.filler,
+    ItemName.XP_500: ItemClassification.filler,
+    ItemName.XP_750: ItemClassification.filler,
+    ItemName.XP_1000: ItemClassification.filler,
+    ItemName.XP_1500: ItemClassification.filler,
+}
+
+# How much gold or XP each item gives, so the amounts don't need to be parsed from the names.
+gold_item_amounts: Dict[str, int] = {
+    ItemName.GOLD_10.value: 10,
+    ItemName.GOLD_25.value: 25,
+    ItemName.GOLD_50.value: 50,
+    ItemName.GOLD_100.value: 100,
+    ItemName.GOLD_200.value: 200,
+    ItemName.GOLD_125.value: 125,
+    ItemName.GOLD_250.value: 250,
+    ItemName.GOLD_500.value: 500,
+    ItemName.GOLD_1000.value: 1000,
+    ItemName.GOLD_2000.value: 2000,
+}
+xp_item_amounts: Dict[str, int] = {
+    ItemName.XP_5.value: 5,
+    ItemName.XP_10.value: 10,
+    ItemName.XP_25.value: 25,
+    ItemName.XP_50.value: 50,
+    ItemName.XP_100.value: 100,
+    ItemName.XP_150.value: 150,
+    ItemName.XP_125.value: 125,
+    ItemName.XP_250.value: 250,
+    ItemName.XP_500.value: 500,
+    ItemName.XP_750.value: 750,
+    ItemName.XP_1000.value: 1000,
+    ItemName.XP_1500.value: 1500,
+}
+
+_item_tiers: Dict[ItemName, Tuple[ItemEffectKind, ItemRarity]] = {
+    ItemName.COMMON_ITEM: (ItemEffectKind.ITEM, ItemRarity.COMMON),
+    ItemName.UNCOMMON_ITEM: (ItemEffectKind.ITEM, ItemRarity.UNCOMMON),
+    ItemName.RARE_ITEM: (ItemEffectKind.ITEM, ItemRarity.RARE),
+    ItemName.LEGENDARY_ITEM: (ItemEffectKind.ITEM, ItemRarity.LEGENDARY),
+    ItemName.COMMON_UPGRADE: (ItemEffectKind.UPGRADE, ItemRarity.COMMON),
+    ItemName.UNCOMMON_UPGRADE: (ItemEffectKind.UPGRADE, ItemRarity.UNCOMMON),
+    ItemName.RARE_UPGRADE: (ItemEffectKind.UPGRADE, ItemRarity.RARE),
+    ItemName.LEGENDARY_UPGRADE: (ItemEffectKind.UPGRADE, ItemRarity.LEGENDARY),
+}
+
+
+def get_item_effect(item: ItemName) -> ItemEffect:
+    """Get what an item does when received."""
+    if item in _item_tiers:
+        kind, tier = _item_tiers[item]
+        return ItemEffect(kind, tier=tier)
+    elif item.value in gold_item_amounts:
+        return ItemEffect(ItemEffectKind.GOLD, gold_item_amounts[item.value])
+    elif item.value in xp_item_amounts:
+        return ItemEffect(ItemEffectKind.XP, xp_item_amounts[item.value])
+    elif item.value in CHARACTERS:
+        return ItemEffect(ItemEffectKind.CHARACTER, CHARACTERS.index(item.value))
+    elif item == ItemName.SHOP_SLOT:
+        return ItemEffect(ItemEffectKind.SHOP_SLOT, 1)
+    elif item == ItemName.RUN_COMPLETE:
+        return ItemEffect(ItemEffectKind.RUN_WON, 1)
+    raise ValueError(f"No effect defined for {item.value}.")
+
+
+# Items only ever placed at event locations, so they have no ID. They're kept in _item_classifications so the IDs of
+# the items after them don't change.
+_event_items = frozenset({ItemName.RUN_COMPLETE})
+
+item_name_to_id = {
+    item.value: BASE_ID + i for i, item in enumerate(_item_classifications) if item not in _event_items
+}
+# Event items, keyed by name since they have no ID.
+event_item_table: Dict[str, BrotatoItemBase] = {
+    item.value: BrotatoItemBase(
+        name=item, classification=_item_classifications[item], code=None, effect=get_item_effect(item)
+    )
+    for item in _event_items
+}
+# Filler drawn at random to fill out the item pool.
+filler_items = [
+    ItemName.XP_5.value,
+    ItemName.XP_10.value,
+    ItemName.XP_25.value,
+    ItemName.XP_50.value,
+    ItemName.XP_100.value,
+    ItemName.XP_150.value,
+    ItemName.GOLD_10.value,
+    ItemName.GOLD_25.value,
+    ItemName.GOLD_50.value,
+    ItemName.GOLD_100.value,
+    ItemName.GOLD_200.value,
 ]
+# Filler only added by bundling the items in filler_items.
+bundled_filler_items = [
+    item.value
+    for item, classification in _item_classifications.items()
+    if classification == ItemClassification.filler and item.value not in filler_items
+]
+
+_items_by_amount: Dict[Tuple[str, int], str] = {
+    **{("gold", amount): name for name, amount in gold_item_amounts.items()},
+    **{("xp", amount): name for name, amount in xp_item_amounts.items()},
+}
+
+
+def bundled_filler_item(name: str, bundle_size: int) -> str:
+    """Get the item giving the same gold or XP as `bundle_size` copies of a filler item, see FillerBundleSize."""
+    if name in gold_item_amounts:
+        return _items_by_amount["gold", gold_item_amounts[name] * bundle_size]
+    return _items_by_amount["xp", xp_item_amounts[name] * bundle_size]
 
-item_table = {item.code: item for item in _items}
-item_name_to_id = {item.name.value: item.code for item in _items}
-filler_items = [item.name.value for item in item_table.values() if item.classification == ItemClassification.filler]
 
 item_name_groups = {
     "Item Drops": {
@@ -155,6 +315,19 @@ item_name_groups = {
         ItemName.GOLD_50.value,
         ItemName.GOLD_100.value,
         ItemName.GOLD_200.value,
+        *bundled_filler_items,
     },
     "Characters": set(c.value for c in _char_items),
 }
+
+
+@lru_cache(maxsize=None)
+def get_item_table() -> dict[int, BrotatoItemBase]:
+    """Get the item data for every item except events, keyed by ID. Built on first call and reused afterwards."""
+    return {
+        item_name_to_id[name.value]: BrotatoItemBase(
+            name=name, classification=classification, code=item_name_to_id[name.value], effect=get_item_effect(name)
+        )
+        for name, classification in _item_classifications.items()
+        if name not in _event_items
+    }
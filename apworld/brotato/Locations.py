@@ -1,48 +1,180 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from itertools import count
-from typing import get_args
+import inspect
+import types
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, get_args
 
 from BaseClasses import Location, LocationProgressType, Region
 
 from .Constants import (
-    BASE_ID,
+    CHARACTER_LOCATION_ID_STRIDE,
     CHARACTERS,
+    CRATE_DROP_LOCATION_BASE_ID,
     CRATE_DROP_LOCATION_TEMPLATE,
+    LEGENDARY_CRATE_DROP_LOCATION_BASE_ID,
     LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE,
+    LOCATION_MAX_ID,
     MAX_LEGENDARY_CRATE_DROPS,
     MAX_NORMAL_CRATE_DROPS,
     MAX_SHOP_LOCATIONS_PER_TIER,
     NUM_WAVES,
     RUN_COMPLETE_LOCATION_TEMPLATE,
+    SHOP_ITEM_LOCATION_BASE_ID,
     SHOP_ITEM_LOCATION_TEMPLATE,
+    SHOP_ITEM_LOCATION_TIER_OFFSETS,
+    WAVE_COMPLETE_LOCATION_BASE_ID,
     WAVE_COMPLETE_LOCATION_TEMPLATE,
+    ItemRarity,
 )
 
 # TypeVar that's a union of all character name string literals
 CHARACTER_NAMES = get_args(CHARACTERS)
-_id_generator = count(BASE_ID, step=1)
+
+_character_index = {char: i for i, char in enumerate(CHARACTERS)}
+
+
+# Attributes Archipelago sets on locations as the world is generated, which Location may have class-level defaults for.
+_LOCATION_ATTRIBUTES = (
+    "event",
+    "locked",
+    "show_in_spoiler",
+    "progress_type",
+    "always_allow",
+    "access_rule",
+    "item_rule",
+    "item",
+)
+
+
+def _get_location_defaults() -> Dict[str, Any]:
+    """Get the class-level defaults Location has for the attributes in `_LOCATION_ATTRIBUTES`.
+
+    Which attributes Location has differs between Archipelago versions, so attributes it doesn't have are skipped, as
+    are ones it implements as a property or slot, since a slot with the same name in a subclass would hide them.
+    """
+    defaults: Dict[str, Any] = {}
+    for attribute in _LOCATION_ATTRIBUTES:
+        if not hasattr(Location, attribute):
+            continue
+        static_value = inspect.getattr_static(Location, attribute)
+        if isinstance(static_value, (property, types.MemberDescriptorType, types.GetSetDescriptorType)):
+            continue
+        defaults[attribute] = getattr(Location, attribute)
+    return defaults
+
+
+_location_defaults = _get_location_defaults()
 
 
 class BrotatoLocation(Location):
     game = "Brotato"
 
+    # Location doesn't use __slots__, so instances still have a __dict__, but it's only allocated once an attribute
+    # not in a slot is set. Storing everything Archipelago sets on locations in slots keeps it from being allocated,
+    # which makes each location much smaller. Slots hide the class-level defaults from Location, so __init__ has to
+    # set them.
+    __slots__ = ("player", "name", "address", "parent_region", *_location_defaults)
+
+    def __init__(self, player: int, name: str = "", address: Optional[int] = None, parent: Optional[Region] = None):
+        super().__init__(player, name, address, parent)
+        for attribute, default in _location_defaults.items():
+            setattr(self, attribute, default)
+
+
+class LocationKind(Enum):
+    WAVE_COMPLETE = "Wave Complete"
+    SHOP_ITEM = "Shop Item"
+    CRATE_DROP = "Crate Drop"
+    LEGENDARY_CRATE_DROP = "Legendary Crate Drop"
+
+
+class LocationIdInfo(NamedTuple):
+    """The structured meaning of a location ID, as returned by `decode_location_id`.
+
+    `num` is the wave number for wave complete locations, and the crate or item number for crate drop and shop item
+    locations. `character` is only set for wave complete locations, and `tier` only for shop item locations.
+    """
+
+    kind: LocationKind
+    character: Optional[str] = None
+    num: Optional[int] = None
+    tier: Optional[ItemRarity] = None
+
+
+def encode_location_id(
+    kind: LocationKind,
+    character: Optional[str] = None,
+    num: Optional[int] = None,
+    tier: Optional[ItemRarity] = None,
+) -> int:
+    """Get the ID of a location from its kind and position, without looking up or formatting its name.
+
+    See the location ID layout in Constants.py for how IDs are assigned.
+    """
+    if kind is LocationKind.WAVE_COMPLETE:
+        if not 1 <= num <= NUM_WAVES:
+            raise ValueError(f"Invalid wave number {num}.")
+        return WAVE_COMPLETE_LOCATION_BASE_ID + (_character_index[character] * CHARACTER_LOCATION_ID_STRIDE) + (num - 1)
+    elif kind is LocationKind.SHOP_ITEM:
+        if not 1 <= num <= MAX_SHOP_LOCATIONS_PER_TIER[tier]:
+            raise ValueError(f"Invalid {tier.value} shop item number {num}.")
+        return SHOP_ITEM_LOCATION_BASE_ID + SHOP_ITEM_LOCATION_TIER_OFFSETS[tier] + (num - 1)
+    elif kind is LocationKind.CRATE_DROP:
+        if not 1 <= num <= MAX_NORMAL_CRATE_DROPS:
+            raise ValueError(f"Invalid crate drop number {num}.")
+        return CRATE_DROP_LOCATION_BASE_ID + (num - 1)
+    elif kind is LocationKind.LEGENDARY_CRATE_DROP:
+        if not 1 <= num <= MAX_LEGENDARY_CRATE_DROPS:
+            raise ValueError(f"Invalid legendary crate drop number {num}.")
+        return LEGENDARY_CRATE_DROP_LOCATION_BASE_ID + (num - 1)
+    raise ValueError(f"Unknown location kind {kind}.")
+
+
+def _decode_shop_item_location_id(offset: int) -> LocationIdInfo:
+    for tier, tier_offset in SHOP_ITEM_LOCATION_TIER_OFFSETS.items():
+        if tier_offset <= offset < tier_offset + MAX_SHOP_LOCATIONS_PER_TIER[tier]:
+            return LocationIdInfo(LocationKind.SHOP_ITEM, num=offset - tier_offset + 1, tier=tier)
+    raise ValueError(f"Invalid shop item location offset {offset}.")
+
+
+def decode_location_id(location_id: int) -> LocationIdInfo:
+    """Get the kind, character, wave/crate number and tier of a location from its ID, without using its name.
+
+    This is the inverse of `encode_location_id`. Raises a ValueError if the ID is not a Brotato location ID.
+    """
+    if location_id > LOCATION_MAX_ID:
+        raise ValueError(f"{location_id} is not a Brotato location ID.")
+    elif location_id >= LEGENDARY_CRATE_DROP_LOCATION_BASE_ID:
+        return LocationIdInfo(
+            LocationKind.LEGENDARY_CRATE_DROP, num=location_id - LEGENDARY_CRATE_DROP_LOCATION_BASE_ID + 1
+        )
+    elif location_id >= CRATE_DROP_LOCATION_BASE_ID:
+        return LocationIdInfo(LocationKind.CRATE_DROP, num=location_id - CRATE_DROP_LOCATION_BASE_ID + 1)
+    elif location_id >= SHOP_ITEM_LOCATION_BASE_ID:
+        return _decode_shop_item_location_id(location_id - SHOP_ITEM_LOCATION_BASE_ID)
+    elif location_id >= WAVE_COMPLETE_LOCATION_BASE_ID:
+        character_index, wave_index = divmod(location_id - WAVE_COMPLETE_LOCATION_BASE_ID, CHARACTER_LOCATION_ID_STRIDE)
+        if wave_index == NUM_WAVES:
+            raise ValueError(f'{location_id} is a retired "Run Won" location ID.')
+        return LocationIdInfo(LocationKind.WAVE_COMPLETE, character=CHARACTERS[character_index], num=wave_index + 1)
+    raise ValueError(f"{location_id} is not a Brotato location ID.")
+
 
 @dataclass(frozen=True)
 class BrotatoLocationBase:
+    # Slots can't be combined with default values on Python < 3.10, so every field needs to be passed.
+    __slots__ = ("name", "id", "progress_type")
+
     name: str
-    is_event: bool = False
-    id: int = field(init=False)
-    progress_type: LocationProgressType = LocationProgressType.DEFAULT
-
-    def __post_init__(self):
-        if not self.is_event:
-            id_ = BASE_ID + next(_id_generator)
-        else:
-            id_ = None
-        # Necessary to set field on frozen dataclass
-        object.__setattr__(self, "id", id_)
+    id: Optional[int]
+    progress_type: LocationProgressType
+
+    @property
+    def is_event(self) -> bool:
+        return self.id is None
 
     def to_location(self, player: int, parent: Region | None = None) -> BrotatoLocation:
         location = BrotatoLocation(player, name=self.name, address=self.id, parent=parent)
@@ -52,49 +184,61 @@ class BrotatoLocationBase:
 
 _wave_count = range(1, NUM_WAVES + 1)
 
-_character_wave_complete_locations: list[BrotatoLocationBase] = []
-_character_run_won_locations: list[BrotatoLocationBase] = []
-for char in CHARACTERS:
-    _char_wave_complete_locations = [
-        BrotatoLocationBase(name=WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=w, char=char)) for w in _wave_count
-    ]
-    _char_run_complete_location = BrotatoLocationBase(name=RUN_COMPLETE_LOCATION_TEMPLATE.format(char=char))
-    _character_wave_complete_locations += _char_wave_complete_locations
-    _character_run_won_locations.append(_char_run_complete_location)
-
-
-_shop_item_locations: list[BrotatoLocationBase] = []
-for tier, max_shop_locs in MAX_SHOP_LOCATIONS_PER_TIER.items():
-    _shop_item_locations += [
-        BrotatoLocationBase(name=SHOP_ITEM_LOCATION_TEMPLATE.format(tier=tier.value, num=i))
-        for i in range(1, max_shop_locs + 1)
-    ]
-
-_loot_crate_drop_locations = [
-    BrotatoLocationBase(name=CRATE_DROP_LOCATION_TEMPLATE.format(num=i)) for i in range(1, MAX_NORMAL_CRATE_DROPS + 1)
-]
-_legendary_loot_crate_drop_locations = [
-    BrotatoLocationBase(
-        name=LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE.format(num=i),
+# Only the location names and IDs are built at import, since they're needed to register the world. The location table
+# is built from them the first time it's used, see get_location_table().
+_character_wave_complete_location_ids: dict[str, int] = {
+    WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=w, char=char): encode_location_id(
+        LocationKind.WAVE_COMPLETE, character=char, num=w
+    )
+    for char in CHARACTERS
+    for w in _wave_count
+}
+_shop_item_location_ids: dict[str, int] = {
+    SHOP_ITEM_LOCATION_TEMPLATE.format(tier=tier.value, num=i): encode_location_id(
+        LocationKind.SHOP_ITEM, num=i, tier=tier
     )
+    for tier, max_shop_locs in MAX_SHOP_LOCATIONS_PER_TIER.items()
+    for i in range(1, max_shop_locs + 1)
+}
+_loot_crate_drop_location_ids: dict[str, int] = {
+    CRATE_DROP_LOCATION_TEMPLATE.format(num=i): encode_location_id(LocationKind.CRATE_DROP, num=i)
+    for i in range(1, MAX_NORMAL_CRATE_DROPS + 1)
+}
+_legendary_loot_crate_drop_location_ids: dict[str, int] = {
+    LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE.format(num=i): encode_location_id(LocationKind.LEGENDARY_CRATE_DROP, num=i)
     for i in range(1, MAX_LEGENDARY_CRATE_DROPS + 1)
-]
-
-_all_locations: list[BrotatoLocationBase] = [
-    *_character_wave_complete_locations,
-    *_character_run_won_locations,
-    *_shop_item_locations,
-    *_loot_crate_drop_locations,
-    *_legendary_loot_crate_drop_locations,
-]
-
-location_table: dict[str, BrotatoLocationBase] = {loc.name: loc for loc in _all_locations}
+}
 
-location_name_to_id: dict[str, int] = {loc.name: loc.id for loc in _all_locations}
+location_name_to_id: dict[str, int] = {
+    **_character_wave_complete_location_ids,
+    **_shop_item_location_ids,
+    **_loot_crate_drop_location_ids,
+    **_legendary_loot_crate_drop_location_ids,
+}
 location_name_groups: dict[str, set[str]] = {
-    "Wave Complete Specific Character": set(c.name for c in _character_wave_complete_locations),
-    "Run Win Specific Character": set(c.name for c in _character_run_won_locations),
-    "Normal Crate Drops": set(c.name for c in _loot_crate_drop_locations),
-    "Legendary Crate Drops": set(c.name for c in _legendary_loot_crate_drop_locations),
-    "Shop Items": set(c.name for c in _shop_item_locations),
+    "Wave Complete Specific Character": set(_character_wave_complete_location_ids),
+    "Normal Crate Drops": set(_loot_crate_drop_location_ids),
+    "Legendary Crate Drops": set(_legendary_loot_crate_drop_location_ids),
+    "Shop Items": set(_shop_item_location_ids),
 }
+
+
+# Event locations, which hold the "Run Won" event for each character. They have no ID, so they're not in the data
+# package and the client never checks them, see RUN_WINS_DATA_STORAGE_KEY_TEMPLATE.
+run_won_location_names: list[str] = [RUN_COMPLETE_LOCATION_TEMPLATE.format(char=char) for char in CHARACTERS]
+
+
+@lru_cache(maxsize=None)
+def get_location_table() -> dict[str, BrotatoLocationBase]:
+    """Get the location data for every location, including events, keyed by name. Built on first call and reused
+    afterwards."""
+    return {
+        **{
+            name: BrotatoLocationBase(name=name, id=id_, progress_type=LocationProgressType.DEFAULT)
+            for name, id_ in location_name_to_id.items()
+        },
+        **{
+            name: BrotatoLocationBase(name=name, id=None, progress_type=LocationProgressType.DEFAULT)
+            for name in run_won_location_names
+        },
+    }
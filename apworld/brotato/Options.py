@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from Options import PerGameCommonOptions, Range, TextChoice
+from Options import Choice, PerGameCommonOptions, Range, TextChoice, Toggle
 
 from .Constants import (
     MAX_COMMON_UPGRADES,
@@ -149,6 +149,79 @@ class NumberShopItems(Range):
     default = 10
 
 
+class SkipBalancing(Choice):
+    """Which Brotato progression items progression balancing ignores.
+
+    Progression balancing takes longer the more progression items there are in the multiworld, so skipping it for
+    these items makes generation faster, especially with many Brotato players. Logic is unchanged.
+
+    None: Balance characters and "Run Won" items.
+
+    Run Won: Skip balancing for "Run Won" items. These are locked to their own locations, so balancing never moves them
+    anyway.
+
+    Characters: Skip balancing for characters. Characters may end up in later spheres of other players' worlds.
+
+    All: Skip balancing for characters and "Run Won" items.
+    """
+
+    option_none = 0
+    option_run_won = 1
+    option_characters = 2
+    option_all = 3
+
+    display_name = "Skip progression balancing"
+    default = 0
+
+
+class LocalFillerPercentage(Range):
+    """The percentage of Brotato's gold and XP filler to place in your own world before the rest of the items.
+
+    This makes generation faster with many Brotato players, since the main fill doesn't need to place these items. The
+    filler is placed in legendary crate drops first, then in locations you can't reach with your starting characters,
+    so there's always room for the first characters you find.
+    """
+
+    range_start = 0
+    range_end = 100
+
+    display_name = "Local filler percentage"
+    default = 0
+
+
+class FillerBundleSize(Choice):
+    """Combine Brotato's gold and XP filler into fewer, larger items.
+
+    Each bundle gives the same gold or XP as several copies of one item, so you get the same gold and XP on average.
+    Bundling leaves fewer items than locations, so one wave complete check is removed for each item it saves. The
+    checks for the highest waves are removed, starting with the characters you don't start with. This means a release
+    or collect sends you far fewer items.
+
+    Off: Don't bundle filler.
+
+    Five: Each bundle is worth 5 copies of a gold or XP item.
+
+    Ten: Each bundle is worth 10 copies of a gold or XP item.
+    """
+
+    option_off = 1
+    option_five = 5
+    option_ten = 10
+
+    display_name = "Filler bundle size"
+    default = 1
+
+
+class FlatRegions(Toggle):
+    """Debug option. Create Brotato's regions with far fewer entrances, which makes generation faster.
+
+    The logic and the locations are exactly the same either way, so this never changes what you can play. It's off by
+    default until it has been used in more multiworlds.
+    """
+
+    display_name = "Flat regions (debug)"
+
+
 @dataclass
 class BrotatoOptions(PerGameCommonOptions):
     num_victories: NumberRequiredWins
@@ -163,3 +236,7 @@ class BrotatoOptions(PerGameCommonOptions):
     num_legendary_upgrades: NumberLegendaryUpgrades
     num_starting_shop_slots: StartingShopSlots
     num_shop_items: NumberShopItems
+    skip_balancing: SkipBalancing
+    local_filler_percentage: LocalFillerPercentage
+    filler_bundle_size: FillerBundleSize
+    flat_regions: FlatRegions
@@ -0,0 +1,245 @@
+"""Estimate and measure the size of the messages the Brotato client receives from the server.
+
+Godot 3.5's WebSocket client silently drops any message larger than its input buffer. The client mod raises the
+buffer size (see `ap_websocket_connection.gd`), but large games can still go over it, at which point the player
+silently stops receiving items. This module computes the size of the largest messages a Brotato player can receive,
+either as a worst-case estimate from the player's options, or exactly from a generated multidata.
+
+To check a generated game, run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.PayloadSize output/AP_12345.zip
+"""
+
+from __future__ import annotations
+
+import argparse
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from NetUtils import NetworkItem, NetworkPlayer, NetworkSlot, SlotType, encode
+
+from .Items import item_name_to_id
+from .Locations import location_name_to_id
+from .Options import BrotatoOptions
+
+GAME = "Brotato"
+
+# Must match the input buffer size set in ap_websocket_connection.gd (the size there is in KiB).
+CLIENT_IN_BUFFER_BYTES = 256 * 1024
+
+# Archipelago limits player names to 16 characters.
+_MAX_PLAYER_NAME_LENGTH = 16
+# Stand-ins used when we don't know anything about the other players in the multiworld.
+_WORST_CASE_GAME_NAME = "x" * 64
+_WORST_CASE_LOCATION_ID = 2**53 - 1
+# Items received from starting inventory use this location ID.
+_STARTING_INVENTORY_LOCATION_ID = -2
+
+
+class MessageSizes(NamedTuple):
+    """Sizes in bytes of the largest messages a Brotato player can receive, as sent over the WebSocket."""
+
+    received_items: int
+    """A ReceivedItems message containing every item for the player, such as after a release or collect."""
+    connected: int
+    """The Connected message, including slot data."""
+    connect_reply: int
+    """The server sends Connected and the player's ReceivedItems in the same message when connecting."""
+    data_package: int
+    """The DataPackage message with only the Brotato data package, as requested by the client."""
+
+    def oversized_messages(self, limit: int = CLIENT_IN_BUFFER_BYTES) -> List[str]:
+        """Get the names of the messages which are too large for the client to receive."""
+        return [name for name, size in self._asdict().items() if size > limit]
+
+
+def _message_size(*commands: Dict[str, Any]) -> int:
+    return len(encode(list(commands)).encode("utf-8"))
+
+
+def _received_items_command(items: Sequence[NetworkItem]) -> Dict[str, Any]:
+    return {"cmd": "ReceivedItems", "index": 0, "items": items}
+
+
+def _connected_command(
+    slot: int,
+    players: Sequence[NetworkPlayer],
+    locations: Sequence[int],
+    slot_info: Dict[int, NetworkSlot],
+    slot_data: Dict[str, Any],
+) -> Dict[str, Any]:
+    # Every location is either missing or checked, so putting them all in one list gives the same size.
+    return {
+        "cmd": "Connected",
+        "team": 0,
+        "slot": slot,
+        "players": players,
+        "missing_locations": locations,
+        "checked_locations": [],
+        "slot_info": slot_info,
+        "hint_points": 0,
+        "slot_data": slot_data,
+    }
+
+
+def _sizes(received_items_size: int, connected_size: int) -> MessageSizes:
+    # Sending both commands in one message only adds a separator to the two messages' sizes, minus one pair of
+    # brackets.
+    separator_size = _message_size(0, 0) - 2 * _message_size(0) + _message_size()
+    return MessageSizes(
+        received_items=received_items_size,
+        connected=connected_size,
+        connect_reply=received_items_size + connected_size - _message_size() + separator_size,
+        data_package=_data_package_message_size(),
+    )
+
+
+def _size_with_copies(make_command: Callable[[int], Dict[str, Any]], num_copies: int) -> int:
+    """Get the encoded size of `make_command(num_copies)` by only encoding it with one and two copies.
+
+    `make_command(n)` must return a command with n copies of the same entries, so each copy after the first adds the
+    same number of bytes. At least one copy is always counted, which only makes the size an overestimate.
+    """
+    one_copy_size = _message_size(make_command(1))
+    return one_copy_size + (max(num_copies, 1) - 1) * (_message_size(make_command(2)) - one_copy_size)
+
+
+@lru_cache(maxsize=1)
+def _data_package_message_size() -> int:
+    from worlds import network_data_package
+
+    game_package = network_data_package["games"][GAME]
+    return _message_size({"cmd": "DataPackage", "data": {"games": {GAME: game_package}}})
+
+
+def estimate_message_sizes(
+    options: BrotatoOptions, num_players: int = 1, slot_data: Optional[Dict[str, Any]] = None
+) -> MessageSizes:
+    """Estimate the largest possible size of the messages a Brotato player can receive.
+
+    This only needs the player's options, so can be used before generation. Since we don't know anything about the
+    other players, this assumes every item comes from a location with the largest possible ID, found by the player
+    with the highest slot number, and that every other player plays a game with a very long name and the highest slot
+    number's number of digits.
+
+    If given, `slot_data` is used as the player's slot data, otherwise the slot data is left out.
+
+    The lists of items, locations and players are never built in full. Their sizes are worked out from the size of a
+    single entry, so this takes the same time however many players and locations there are.
+    """
+    # Imported here since Feasibility imports this module.
+    from .Feasibility import count_slot
+
+    counts = count_slot(options)
+    # Wave complete locations for each character, less any removed by bundling filler, and crate drop locations.
+    # "Run Won" locations are events, which the client never checks.
+    num_locations = counts.num_locations
+    # The player receives an item for each of their locations, plus their starting characters.
+    num_starting_items = counts.num_starting_characters
+
+    worst_case_item = NetworkItem(max(item_name_to_id.values()), _WORST_CASE_LOCATION_ID, num_players, 0b100)
+    received_items_size = _size_with_copies(
+        lambda num_items: _received_items_command([worst_case_item] * num_items), num_locations + num_starting_items
+    )
+
+    worst_case_name = "x" * _MAX_PLAYER_NAME_LENGTH
+    worst_case_player = NetworkPlayer(0, num_players, worst_case_name, worst_case_name)
+    worst_case_slot = NetworkSlot(worst_case_name, _WORST_CASE_GAME_NAME, SlotType.player)
+    # Slots with as many digits as the highest slot number, so every player's entry is the same size.
+    first_slot = 10 ** (len(str(num_players)) - 1)
+    # All location IDs have the same number of digits, so which one we use doesn't change the size.
+    location_id = max(location_name_to_id.values())
+
+    def connected_command(num_locations_: int, num_players_: int) -> Dict[str, Any]:
+        return _connected_command(
+            slot=num_players,
+            players=[worst_case_player] * num_players_,
+            locations=[location_id] * num_locations_,
+            slot_info={slot: worst_case_slot for slot in range(first_slot, first_slot + num_players_)},
+            slot_data={},
+        )
+
+    connected_size = (
+        _size_with_copies(lambda num_locations_: connected_command(num_locations_, 1), num_locations)
+        + _size_with_copies(lambda num_players_: connected_command(1, num_players_), num_players)
+        - _message_size(connected_command(1, 1))
+        # The slot data is only encoded once, replacing the empty slot data.
+        + _message_size(slot_data or {})
+        - _message_size({})
+    )
+    return _sizes(received_items_size, connected_size)
+
+
+def measure_message_sizes(multidata: Dict[str, Any], slot: int) -> MessageSizes:
+    """Measure the exact size of the largest messages a player in a generated multiworld can receive.
+
+    `multidata` is the decompressed multidata saved in the `.archipelago` file of a generated game.
+    """
+    items = [
+        NetworkItem(item_id, location_id, finder, flags)
+        for finder, locations in multidata["locations"].items()
+        for location_id, (item_id, item_player, flags) in locations.items()
+        if item_player == slot
+    ]
+    items += [
+        NetworkItem(item_id, _STARTING_INVENTORY_LOCATION_ID, slot, 0)
+        for item_id in multidata["precollected_items"][slot]
+    ]
+    players = [
+        NetworkPlayer(team, player_slot, name, name)
+        for name, (team, player_slot) in multidata["connect_names"].items()
+    ]
+    connected_command = _connected_command(
+        slot=slot,
+        players=players,
+        locations=sorted(multidata["locations"][slot]),
+        slot_info=multidata["slot_info"],
+        slot_data=multidata["slot_data"][slot],
+    )
+    return _sizes(_message_size(_received_items_command(items)), _message_size(connected_command))
+
+
+def load_multidata(path: str) -> Dict[str, Any]:
+    """Load the multidata from a `.archipelago` file, or from the `.zip` output of a generation."""
+    # Only needed by the CLI, so not imported with the world.
+    import zipfile
+    import zlib
+
+    from Utils import restricted_loads
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as output_zip:
+            multidata_name = next(name for name in output_zip.namelist() if name.endswith(".archipelago"))
+            data = output_zip.read(multidata_name)
+    else:
+        with open(path, "rb") as multidata_file:
+            data = multidata_file.read()
+    # The first byte is the multidata format version.
+    return restricted_loads(zlib.decompress(data[1:]))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("multidata", help="A generated .zip or .archipelago file.")
+    parser.add_argument(
+        "--limit", type=int, default=CLIENT_IN_BUFFER_BYTES, help="Largest message size the client can receive."
+    )
+    args = parser.parse_args(argv)
+
+    multidata = load_multidata(args.multidata)
+    brotato_slots = [slot for slot, info in multidata["slot_info"].items() if info.game == GAME]
+    num_oversized = 0
+    for slot in brotato_slots:
+        sizes = measure_message_sizes(multidata, slot)
+        oversized = sizes.oversized_messages(args.limit)
+        num_oversized += bool(oversized)
+        size_summary = ", ".join(f"{name}={size}" for name, size in sizes._asdict().items())
+        print(f"{multidata['slot_info'][slot].name} (slot {slot}): {size_summary}")
+        if oversized:
+            print(f"  WARNING: too large for the client ({args.limit} bytes): {', '.join(oversized)}")
+    print(f"{num_oversized}/{len(brotato_slots)} Brotato player(s) have messages too large for the client.")
+    return 1 if num_oversized else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""A precompiled table of Brotato's logic, sent in slot data for trackers.
+
+Brotato's logic is simple: the wave complete locations for a character need that character, every other location is
+always in logic, and the goal needs runs won with a number of different characters. Instead of rebuilding the region
+graph from Regions.py, a tracker can read this table from the slot data and decide if a location is in logic with a
+single lookup. `location_in_logic` and `goal_completed` show how to use it, and are checked against the region graph in
+test_reachability.py.
+
+The table looks like:
+
+    {
+        "version": 3,
+        "character_locations": {"first_id": <int>, "stride": <int>},
+        "character_item_ids": [<int>, ...],
+        "free_location_ranges": [[<first id>, <last id>], ...],
+        "removed_location_ranges": [[<first id>, <last id>], ...],
+        "goal": {"data_storage_key": <str>, "count": <int>}
+    }
+
+A location ID in `[first_id, first_id + stride * len(character_item_ids))` needs the character item with the ID
+`character_item_ids[(location_id - first_id) // stride]`. Location IDs in one of the inclusive `free_location_ranges`
+are always in logic. Location IDs in one of the inclusive `removed_location_ranges` are wave complete checks removed
+by bundling filler (see FillerBundleSize), which the player doesn't have, so are never in logic.
+
+"Run Won" locations are events, so the server doesn't know which runs have been won. Instead, the client records them
+in data storage under `data_storage_key`, after replacing `{team}` and `{slot}` with the player's team and slot
+numbers. Its value is a bitmask of the characters the player has won a run with, where bit i is the character with
+the item ID `character_item_ids[i]`. The goal is completed once `count` bits are set.
+
+Version 1 tables, from worlds generated before "Run Won" locations became events, have `{"item_id": <int>, "count":
+<int>}` as the goal instead, and the goal is completed once the player has received `count` items with the ID
+`item_id`. Version 1 and 2 tables have no `removed_location_ranges`, since no checks were removed.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Collection, Dict, List, Mapping, Sequence
+
+from .Constants import (
+    CHARACTER_LOCATION_ID_STRIDE,
+    CHARACTERS,
+    CRATE_DROP_LOCATION_BASE_ID,
+    LEGENDARY_CRATE_DROP_LOCATION_BASE_ID,
+    RUN_WINS_DATA_STORAGE_KEY_TEMPLATE,
+    WAVE_COMPLETE_LOCATION_BASE_ID,
+)
+from .Locations import LocationKind, encode_location_id
+from .Options import BrotatoOptions
+
+REACHABILITY_TABLE_VERSION = 3
+
+
+def get_reachability_table(
+    options: BrotatoOptions, item_name_to_id: Mapping[str, int], removed_wave_checks: Mapping[str, Sequence[int]]
+) -> Dict[str, Any]:
+    """Get the reachability table to send in slot data for a player with the given options.
+
+    `removed_wave_checks` is the waves whose checks were removed by bundling filler, for each character with any.
+    """
+    free_location_ranges: List[List[int]] = []
+    for base_id, num_locations in (
+        (CRATE_DROP_LOCATION_BASE_ID, options.num_common_crate_drops.value),
+        (LEGENDARY_CRATE_DROP_LOCATION_BASE_ID, options.num_legendary_crate_drops.value),
+    ):
+        if num_locations:
+            free_location_ranges.append([base_id, base_id + num_locations - 1])
+    # Each character loses the checks for their highest waves, so a single range covers all of their removed checks.
+    removed_location_ranges = [
+        [
+            encode_location_id(LocationKind.WAVE_COMPLETE, character, min(waves)),
+            encode_location_id(LocationKind.WAVE_COMPLETE, character, max(waves)),
+        ]
+        for character, waves in removed_wave_checks.items()
+    ]
+
+    return {
+        "version": REACHABILITY_TABLE_VERSION,
+        "character_locations": {"first_id": WAVE_COMPLETE_LOCATION_BASE_ID, "stride": CHARACTER_LOCATION_ID_STRIDE},
+        "character_item_ids": [item_name_to_id[character] for character in CHARACTERS],
+        "free_location_ranges": free_location_ranges,
+        "removed_location_ranges": removed_location_ranges,
+        "goal": {"data_storage_key": RUN_WINS_DATA_STORAGE_KEY_TEMPLATE, "count": options.num_victories.value},
+    }
+
+
+def location_in_logic(table: Dict[str, Any], location_id: int, owned_item_ids: Collection[int]) -> bool:
+    """Check if a location is in logic for a player who has received the items with the given IDs.
+
+    Pass a set of item IDs to make this a constant time check.
+    """
+    if any(first_id <= location_id <= last_id for first_id, last_id in table["removed_location_ranges"]):
+        return False
+    character_locations = table["character_locations"]
+    character_index = (location_id - character_locations["first_id"]) // character_locations["stride"]
+    if 0 <= character_index < len(table["character_item_ids"]):
+        return table["character_item_ids"][character_index] in owned_item_ids
+    return any(first_id <= location_id <= last_id for first_id, last_id in table["free_location_ranges"])
+
+
+def goal_completed(table: Dict[str, Any], run_wins: int) -> bool:
+    """Check if the goal is completed for a player with the given value in the run wins data storage key."""
+    return bin(run_wins).count("1") >= table["goal"]["count"]
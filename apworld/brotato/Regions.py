@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, FrozenSet, Sequence, Tuple
 
-from BaseClasses import CollectionState, Item, ItemClassification, MultiWorld, Region
+from BaseClasses import CollectionState, Item, ItemClassification, LocationProgressType, MultiWorld, Region
 
 from .Constants import (
     CHARACTERS,
@@ -11,67 +13,232 @@ from .Constants import (
     RUN_COMPLETE_LOCATION_TEMPLATE,
     WAVE_COMPLETE_LOCATION_TEMPLATE,
 )
-from .Locations import location_table
+from .Feasibility import count_slot
+from .Locations import BrotatoLocation, BrotatoLocationBase, get_location_table
 from .Options import BrotatoOptions
-from .Rules import BrotatoLogic
-
+from .Rules import character_bits
+
+
+@dataclass(frozen=True)
+class CharacterRegionTemplate:
+    """The player-independent parts of a single character's "In-Game" region."""
+
+    character: str
+    region_name: str
+    start_game_entrance_name: str
+    drop_crates_entrance_name: str
+    exit_drop_crates_entrance_name: str
+    locations: Tuple[BrotatoLocationBase, ...]
+
+
+@dataclass(frozen=True)
+class RegionTemplate:
+    """Precomputed region, location and entrance data shared by every player with the same region layout.
+
+    Only the waves with checks and the crate drop counts affect the shape of the region graph, so players with the
+    same values for these can be created from the same template instead of formatting names and looking up locations
+    for each player. Wave complete checks removed by bundling filler are the last locations of each character, so are
+    left off when creating the regions.
+    """
+
+    crate_drop_locations: Tuple[BrotatoLocationBase, ...]
+    legendary_crate_drop_locations: Tuple[BrotatoLocationBase, ...]
+    character_regions: Tuple[CharacterRegionTemplate, ...]
+
+
+@lru_cache(maxsize=None)
+def get_region_template(
+    waves_with_checks: Tuple[int, ...], num_common_crate_drops: int, num_legendary_crate_drops: int
+) -> RegionTemplate:
+    location_table = get_location_table()
+    crate_drop_locations = tuple(
+        location_table[CRATE_DROP_LOCATION_TEMPLATE.format(num=i)] for i in range(1, num_common_crate_drops + 1)
+    )
+    legendary_crate_drop_locations = tuple(
+        location_table[LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE.format(num=i)]
+        for i in range(1, num_legendary_crate_drops + 1)
+    )
+    character_regions = tuple(
+        CharacterRegionTemplate(
+            character=character,
+            region_name=f"In-Game ({character})",
+            start_game_entrance_name=f"Start Game ({character})",
+            drop_crates_entrance_name=f"Drop crates for {character}",
+            exit_drop_crates_entrance_name=f"Exit drop crates for {character}",
+            locations=(
+                location_table[RUN_COMPLETE_LOCATION_TEMPLATE.format(char=character)],
+                *(
+                    location_table[WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=w, char=character)]
+                    for w in waves_with_checks
+                ),
+            ),
+        )
+        for character in CHARACTERS
+    )
+    return RegionTemplate(
+        crate_drop_locations=crate_drop_locations,
+        legendary_crate_drop_locations=legendary_crate_drop_locations,
+        character_regions=character_regions,
+    )
+
+
+def create_regions(
+    multiworld: MultiWorld,
+    player: int,
+    options: BrotatoOptions,
+    waves_with_drops: Sequence[int],
+    num_removed_wave_checks: Sequence[int],
+):
+    """Create the player's regions and locations.
+
+    `num_removed_wave_checks` is how many wave complete checks to leave off each character, in CHARACTERS order, see
+    Feasibility.spread_removed_wave_checks.
+    """
+    template = get_region_template(
+        tuple(waves_with_drops),
+        options.num_common_crate_drops.value,
+        options.num_legendary_crate_drops.value,
+    )
 
-def create_regions(multiworld: MultiWorld, player: int, options: BrotatoOptions, waves_with_drops: Sequence[int]):
     menu_region = Region("Menu", player, multiworld)
     crate_drop_region = Region("Loot Crates", player, multiworld)
 
-    for i in range(1, options.num_common_crate_drops + 1):
-        location_name = CRATE_DROP_LOCATION_TEMPLATE.format(num=i)
-        crate_drop_region.locations.append(location_table[location_name].to_location(player, parent=crate_drop_region))
+    crate_drop_region.locations.extend(
+        loc.to_location(player, parent=crate_drop_region) for loc in template.crate_drop_locations
+    )
 
-    # Prevent progression items from being placed at legendary loot crate drops.
-    # TODO: Ideally we would make the locations EXCLUDED, but that causes fill problems.
-    def legendary_loot_crate_item_rule(item: Item) -> bool:
-        return item.classification not in (
-            ItemClassification.progression,
-            ItemClassification.progression_skip_balancing,
-        )
-
-    for i in range(1, options.num_legendary_crate_drops + 1):
-        location_name = LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE.format(num=i)
-        legendary_crate_drop_location = location_table[location_name].to_location(player, parent=crate_drop_region)
-        legendary_crate_drop_location.item_rule = legendary_loot_crate_item_rule
-        crate_drop_region.locations.append(legendary_crate_drop_location)
+    exclude_legendary_crates = legendary_crates_excluded(options)
+    crate_drop_region.locations.extend(
+        _create_legendary_crate_drop_location(loc, player, crate_drop_region, exclude_legendary_crates)
+        for loc in template.legendary_crate_drop_locations
+    )
 
     menu_region.connect(crate_drop_region, "Drop Loot Crates")
 
     multiworld.regions += [menu_region, crate_drop_region]
 
     character_regions = []
-    for character in CHARACTERS:
-        character_region = Region(f"In-Game ({character})", player, multiworld)
-        has_character_rule = _create_char_region_access_rule(player, character)
-        character_run_won_location = location_table[RUN_COMPLETE_LOCATION_TEMPLATE.format(char=character)]
-        character_region.locations.append(character_run_won_location.to_location(player, parent=character_region))
-
-        char_wave_drop_location_names = [
-            WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=w, char=character) for w in waves_with_drops
-        ]
+    for character_template, num_removed in zip(template.character_regions, num_removed_wave_checks):
+        character_region = Region(character_template.region_name, player, multiworld)
+        has_character_rule = _create_char_region_access_rule(player, character_template.character)
         character_region.locations.extend(
-            location_table[loc].to_location(player, parent=character_region) for loc in char_wave_drop_location_names
+            loc.to_location(player, parent=character_region)
+            for loc in character_template.locations[: len(character_template.locations) - num_removed]
         )
         menu_region.connect(
             character_region,
-            f"Start Game ({character})",
+            character_template.start_game_entrance_name,
             rule=has_character_rule,
         )
 
         # Crates can be gotten with any character...
-        character_region.connect(crate_drop_region, f"Drop crates for {character}")
+        character_region.connect(crate_drop_region, character_template.drop_crates_entrance_name)
         # ...but we need to make sure you don't go to another character's in-game before you have them.
-        crate_drop_region.connect(character_region, f"Exit drop crates for {character}", rule=has_character_rule)
+        crate_drop_region.connect(
+            character_region, character_template.exit_drop_crates_entrance_name, rule=has_character_rule
+        )
         character_regions.append(character_region)
 
     multiworld.regions += character_regions
 
 
+def create_flat_regions(
+    multiworld: MultiWorld,
+    player: int,
+    options: BrotatoOptions,
+    waves_with_drops: Sequence[int],
+    num_removed_wave_checks: Sequence[int],
+):
+    """Create the same logic as create_regions, with far fewer regions and entrances.
+
+    In create_regions, the "Loot Crates" region is connected to and from every character's region, which together with
+    the entrances from "Menu" makes three entrances per character, all of which check for the same character. Going
+    from "Loot Crates" to a character's region needs the same character as going there from "Menu", and "Loot Crates"
+    is reachable from "Menu" with no requirements, so this instead puts the crate drop locations in "Menu" and only
+    keeps the entrances from "Menu" to each character's region. Players always start with at least one character, so
+    crates not requiring any character doesn't matter in practice.
+
+    This gives exactly the same reachability for every set of owned characters, see test_region_topology.
+    """
+    template = get_region_template(
+        tuple(waves_with_drops),
+        options.num_common_crate_drops.value,
+        options.num_legendary_crate_drops.value,
+    )
+
+    menu_region = Region("Menu", player, multiworld)
+
+    menu_region.locations.extend(loc.to_location(player, parent=menu_region) for loc in template.crate_drop_locations)
+
+    exclude_legendary_crates = legendary_crates_excluded(options)
+    menu_region.locations.extend(
+        _create_legendary_crate_drop_location(loc, player, menu_region, exclude_legendary_crates)
+        for loc in template.legendary_crate_drop_locations
+    )
+
+    multiworld.regions.append(menu_region)
+
+    character_regions = []
+    for character_template, num_removed in zip(template.character_regions, num_removed_wave_checks):
+        character_region = Region(character_template.region_name, player, multiworld)
+        character_region.locations.extend(
+            loc.to_location(player, parent=character_region)
+            for loc in character_template.locations[: len(character_template.locations) - num_removed]
+        )
+        menu_region.connect(
+            character_region,
+            character_template.start_game_entrance_name,
+            rule=_create_char_region_access_rule(player, character_template.character),
+        )
+        character_regions.append(character_region)
+
+    multiworld.regions += character_regions
+
+
+# Every classification with the progression flag, including combinations like progression | useful which other games'
+# items can have. Checking membership in a set of ints is much cheaper than combining flags for each item.
+_progression_classifications: FrozenSet[int] = frozenset(
+    classification
+    # Every combination of flags is less than twice the highest flag.
+    for classification in range(max(ItemClassification) * 2)
+    if classification & ItemClassification.progression
+)
+
+
+def legendary_crates_excluded(options: BrotatoOptions) -> bool:
+    """Whether to make the player's legendary loot crate drops EXCLUDED locations.
+
+    Excluded locations are left out of the progression fill entirely, so fill doesn't need to try and reject every
+    progression item at each of them, but Archipelago fails generation if there isn't enough filler to put in every
+    excluded location in the multiworld. Only exclude them when the player's own item pool has enough filler to fill
+    them, so excluding them never makes the multiworld short of filler. The filler is counted after bundling, which
+    can leave far fewer filler items. Local filler doesn't change this, since pre_fill places it at legendary crate
+    drops first.
+    """
+    return count_slot(options).num_filler_items >= options.num_legendary_crate_drops.value
+
+
+def _create_legendary_crate_drop_location(
+    loc: BrotatoLocationBase, player: int, parent: Region, excluded: bool
+) -> BrotatoLocation:
+    location = loc.to_location(player, parent=parent)
+    # Excluded locations can still get progression items from progression balancing, so keep the rule either way.
+    location.item_rule = _legendary_loot_crate_item_rule
+    if excluded:
+        location.progress_type = LocationProgressType.EXCLUDED
+    return location
+
+
+# Prevent progression items from being placed at legendary loot crate drops. Shared by every legendary crate drop.
+def _legendary_loot_crate_item_rule(item: Item) -> bool:
+    return item.classification not in _progression_classifications
+
+
 def _create_char_region_access_rule(player: int, character: str) -> Callable[[CollectionState], bool]:
+    # Equivalent to BrotatoLogic._brotato_has_character, inlined since this is called very often during fill.
+    character_bit = character_bits[character]
+
     def char_region_access_rule(state: CollectionState):
-        return BrotatoLogic._brotato_has_character(state, player, character)
+        return state.brotato_characters[player] & character_bit != 0
 
     return char_region_access_rule
@@ -1,12 +1,34 @@
-from BaseClasses import CollectionState
+from collections import defaultdict
+from typing import Dict
+
+from BaseClasses import CollectionState, MultiWorld
 
 from ..AutoWorld import LogicMixin
-from .Items import ItemName
+from .Constants import CHARACTERS
+
+# Bit used for each character in the owned character bitmask, see BrotatoLogic.
+character_bits: Dict[str, int] = {character: 1 << i for i, character in enumerate(CHARACTERS)}
 
 
 class BrotatoLogic(LogicMixin):
+    # Kept up to date by BrotatoWorld.collect and BrotatoWorld.remove, so rules can check them with a single integer
+    # operation instead of looking up item counts with CollectionState.has.
+    brotato_characters: Dict[int, int]
+    """Bitmask of the characters each player owns, using the bits in character_bits."""
+    brotato_run_wins: Dict[int, int]
+    """Number of "Run Won" items each player has."""
+
+    def init_mixin(self, parent: MultiWorld):
+        self.brotato_characters = defaultdict(int)
+        self.brotato_run_wins = defaultdict(int)
+
+    def copy_mixin(self, new_state: CollectionState) -> CollectionState:
+        new_state.brotato_characters = self.brotato_characters.copy()
+        new_state.brotato_run_wins = self.brotato_run_wins.copy()
+        return new_state
+
     def _brotato_has_character(self: CollectionState, player: int, character: str) -> bool:
-        return self.has(character, player)
+        return self.brotato_characters[player] & character_bits[character] != 0
 
     def _brotato_has_run_wins(self: CollectionState, player: int, count: int) -> bool:
-        return self.has(ItemName.RUN_COMPLETE.value, player, count=count)
+        return self.brotato_run_wins[player] >= count
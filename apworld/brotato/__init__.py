@@ -1,27 +1,39 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Sequence
+from collections import Counter
+from typing import Any, Dict, FrozenSet, List, Sequence, Set
 
-from BaseClasses import MultiWorld, Tutorial
+from BaseClasses import CollectionState, Item, Location, MultiWorld, Tutorial
 from worlds.AutoWorld import WebWorld, World
 
-from .Constants import CHARACTERS, DEFAULT_CHARACTERS, MAX_SHOP_SLOTS, NUM_WAVES
+from .Constants import CHARACTERS, DEFAULT_CHARACTERS, MAX_SHOP_SLOTS
+from .Feasibility import count_slot, get_waves_with_checks, spread_removed_wave_checks
+from .IdLayout import get_world_id_layout
+from .Instrumentation import instrument_world
 from .Items import (
     BrotatoItem,
     ItemName,
+    bundled_filler_item,
+    bundled_filler_items,
+    event_item_table,
     filler_items,
+    get_item_table,
     item_name_groups,
     item_name_to_id,
-    item_table,
 )
-from .Locations import location_name_groups, location_name_to_id
-from .Options import BrotatoOptions
-from .Regions import create_regions
-from .Rules import BrotatoLogic
+from .Locations import location_name_groups, location_name_to_id, run_won_location_names
+from .Options import BrotatoOptions, SkipBalancing
+from .Reachability import get_reachability_table
+from .PayloadSize import CLIENT_IN_BUFFER_BYTES, MessageSizes, estimate_message_sizes
+from .Regions import create_flat_regions, create_regions
+from .Rules import character_bits
 
 logger = logging.getLogger("Brotato")
 
+_run_won_item_name = ItemName.RUN_COMPLETE.value
+_filler_item_names = frozenset(filler_items + bundled_filler_items)
+
 
 class BrotatoWeb(WebWorld):
     # TODO: Add actual tutorial!
@@ -57,12 +69,19 @@ class BrotatoWorld(World):
 
     _filler_items = filler_items
     _starting_characters: list[str]
+    _skip_balancing_items: FrozenSet[str] = frozenset()
+    """Progression items to mark as skip_balancing, from the skip_balancing option. Set in generate_early."""
+    _local_filler_items: List[BrotatoItem]
+    """Filler kept out of the item pool to place in pre_fill, from the local_filler_percentage option."""
 
     location_name_to_id = location_name_to_id
     location_name_groups = location_name_groups
 
     waves_with_checks: Sequence[int]
     """Which waves will count as locations, derived from player options in generate_early"""
+    _num_removed_wave_checks: List[int]
+    """How many wave complete checks bundling filler removes from each character, in CHARACTERS order. Set in
+    generate_early, see FillerBundleSize."""
 
     def __init__(self, world: MultiWorld, player: int):
         super().__init__(world, player)
@@ -70,91 +89,200 @@ class BrotatoWorld(World):
     def create_item(self, name: str | ItemName) -> BrotatoItem:
         if isinstance(name, ItemName):
             name = name.value
-        return item_table[self.item_name_to_id[name]].to_item(self.player)
+        item_base = event_item_table.get(name) or get_item_table()[self.item_name_to_id[name]]
+        return item_base.to_item(self.player, name in self._skip_balancing_items)
 
     def generate_early(self):
-        waves_per_drop = self.options.waves_per_drop.value
-        # Ignore 0 value, but choosing a different start gives the wrong wave results
-        self.waves_with_checks = list(range(0, NUM_WAVES + 1, waves_per_drop))[1:]
+        self.waves_with_checks = get_waves_with_checks(self.options.waves_per_drop.value)
         character_option = self.options.starting_characters.value
         if character_option == 0:  # Default
             self._starting_characters = list(DEFAULT_CHARACTERS)
         else:
             num_starting_characters = self.options.num_starting_characters
             self._starting_characters = self.random.sample(CHARACTERS, num_starting_characters)
+        self._num_removed_wave_checks = spread_removed_wave_checks(
+            count_slot(self.options).num_removed_wave_checks, len(self.waves_with_checks), self._starting_characters
+        )
+
+        skip_balancing = self.options.skip_balancing.value
+        skip_balancing_items: Set[str] = set()
+        if skip_balancing in (SkipBalancing.option_run_won, SkipBalancing.option_all):
+            skip_balancing_items.add(_run_won_item_name)
+        if skip_balancing in (SkipBalancing.option_characters, SkipBalancing.option_all):
+            skip_balancing_items.update(CHARACTERS)
+        self._skip_balancing_items = frozenset(skip_balancing_items)
+
+        oversized_messages = self.estimate_message_sizes().oversized_messages()
+        if oversized_messages:
+            logger.warning(
+                f"Options for Brotato player {self.multiworld.get_player_name(self.player)} may create messages "
+                f"larger than the client can receive ({CLIENT_IN_BUFFER_BYTES} bytes): "
+                f"{', '.join(oversized_messages)}. The client will silently drop these, so the player may not "
+                "receive items. Try increasing waves_per_drop, or lowering the number of crate drop locations."
+            )
+
+    def estimate_message_sizes(self) -> MessageSizes:
+        """Estimate the largest messages the player's client can receive, see PayloadSize.estimate_message_sizes.
+
+        Can be called any time after generate_early.
+        """
+        return estimate_message_sizes(self.options, self.multiworld.players, self.fill_slot_data())
 
     def set_rules(self):
         num_required_victories = self.options.num_victories.value
-        self.multiworld.completion_condition[self.player] = lambda state: BrotatoLogic._brotato_has_run_wins(
-            state, self.player, count=num_required_victories
+        player = self.player
+        # Equivalent to BrotatoLogic._brotato_has_run_wins, inlined since this is called very often during fill.
+        self.multiworld.completion_condition[self.player] = (
+            lambda state: state.brotato_run_wins[player] >= num_required_victories
         )
 
+    def collect(self, state: CollectionState, item: Item) -> bool:
+        change = super().collect(state, item)
+        if change:
+            if item.name == _run_won_item_name:
+                state.brotato_run_wins[self.player] += 1
+            elif item.name in character_bits:
+                state.brotato_characters[self.player] |= character_bits[item.name]
+        return change
+
+    def remove(self, state: CollectionState, item: Item) -> bool:
+        change = super().remove(state, item)
+        if change:
+            if item.name == _run_won_item_name:
+                state.brotato_run_wins[self.player] -= 1
+            elif item.name in character_bits and not state.has(item.name, self.player):
+                # Only clear the bit once all copies of the character have been removed.
+                state.brotato_characters[self.player] &= ~character_bits[item.name]
+        return change
+
     def create_regions(self) -> None:
-        create_regions(self.multiworld, self.player, self.options, self.waves_with_checks)
+        args = (self.multiworld, self.player, self.options, self.waves_with_checks, self._num_removed_wave_checks)
+        if self.options.flat_regions.value:
+            create_flat_regions(*args)
+        else:
+            create_regions(*args)
 
     def create_items(self):
-        item_names: list[ItemName | str] = []
-
         for c in self._starting_characters:
             self.multiworld.push_precollected(self.create_item(c))
 
-        item_names += [c for c in item_name_groups["Characters"] if c not in self._starting_characters]
-
-        # Add an item to receive for each crate drop location, as backfill
-        num_common_crate_drops = self.options.num_common_crate_drops.value
-        for _ in range(num_common_crate_drops):
-            # TODO: Can be any item rarity, but need to choose a ratio. Check wiki for rates?
-            item_names.append(ItemName.COMMON_ITEM)
-
-        num_legendary_crate_drops = self.options.num_legendary_crate_drops.value
-        for _ in range(num_legendary_crate_drops):
-            item_names.append(ItemName.LEGENDARY_ITEM)
-
-        num_common_upgrades = self.options.num_common_upgrades.value
-        item_names += [ItemName.COMMON_UPGRADE] * num_common_upgrades
-
-        num_uncommon_upgrades = self.options.num_uncommon_upgrades.value
-        item_names += [ItemName.UNCOMMON_UPGRADE] * num_uncommon_upgrades
-
-        num_rare_upgrades = self.options.num_rare_upgrades.value
-        item_names += [ItemName.RARE_UPGRADE] * num_rare_upgrades
-
-        num_legendary_upgrades = self.options.num_legendary_upgrades.value
-        item_names += [ItemName.LEGENDARY_UPGRADE] * num_legendary_upgrades
-
-        num_starting_shop_slots = self.options.num_starting_shop_slots.value
-        num_shop_slot_items = max(MAX_SHOP_SLOTS - num_starting_shop_slots, 0)
-        item_names += [ItemName.SHOP_SLOT] * num_shop_slot_items
-
-        for _ in range(self.options.num_shop_items):
-            pass
-
-        itempool = [self.create_item(item_name) for item_name in item_names]
-
-        total_locations = (
-            num_common_crate_drops + num_legendary_crate_drops + (len(self.waves_with_checks) * len(CHARACTERS))
-        )
-        num_filler_items = total_locations - len(itempool)
-        itempool += [self.create_filler() for _ in range(num_filler_items)]
-
+        itempool = self.create_itempool()
+        self._local_filler_items = self._take_local_filler(itempool)
         self.multiworld.itempool += itempool
 
-        # Place "Run Won" items at the Run Win event locations
-        for loc in self.location_name_groups["Run Win Specific Character"]:
+        # Place "Run Won" events at the Run Win event locations
+        for loc in run_won_location_names:
             item = self.create_item(ItemName.RUN_COMPLETE)
             self.multiworld.get_location(loc, self.player).place_locked_item(item)
 
+    def create_itempool(self) -> List[BrotatoItem]:
+        """Create the items to add to the multiworld's item pool, including filler for any locations left over."""
+        item_counts = self._get_item_counts()
+
+        counts = count_slot(self.options)
+        # Filler for every location, including the wave complete checks that bundling removes.
+        num_unbundled_filler = counts.num_locations + counts.num_removed_wave_checks - sum(item_counts.values())
+        # Split the filler into bundles and left over single items, so the number of items only depends on the
+        # options, see count_slot. Each bundle is worth `bundle_size` copies of the item drawn for it.
+        bundle_size = self.options.filler_bundle_size.value
+        num_bundles, num_single_items = divmod(max(num_unbundled_filler, 0), bundle_size)
+        # Draw all the filler at once instead of calling create_filler for each item.
+        bundled_names = self.random.choices(self._filler_items, k=num_bundles)
+        item_counts.update(bundled_filler_item(name, bundle_size) for name in bundled_names)
+        item_counts.update(self.random.choices(self._filler_items, k=num_single_items))
+
+        item_table = get_item_table()
+        player = self.player
+        itempool: List[BrotatoItem] = []
+        for item_name, count in item_counts.items():
+            item_base = item_table[self.item_name_to_id[item_name]]
+            classification = item_base.get_classification(item_name in self._skip_balancing_items)
+            code = item_base.code
+            itempool += [BrotatoItem(item_name, classification, code, player) for _ in range(count)]
+        return itempool
+
+    def _take_local_filler(self, itempool: List[BrotatoItem]) -> List[BrotatoItem]:
+        """Remove a random selection of filler from the item pool to place locally, see LocalFillerPercentage."""
+        local_filler_percentage = self.options.local_filler_percentage.value
+        if not local_filler_percentage:
+            return []
+        filler = [item for item in itempool if item.name in _filler_item_names]
+        local_filler = self.random.sample(filler, len(filler) * local_filler_percentage // 100)
+        local_filler_ids = {id(item) for item in local_filler}
+        itempool[:] = [item for item in itempool if id(item) not in local_filler_ids]
+        return local_filler
+
+    def _get_item_counts(self) -> Counter[str]:
+        """Get how many of each item to add to the item pool, not including filler."""
+        num_starting_shop_slots = self.options.num_starting_shop_slots.value
+        item_counts: Dict[str, int] = {
+            # Iterate over CHARACTERS instead of the "Characters" item group so the order doesn't depend on set order.
+            **{c: 1 for c in CHARACTERS if c not in self._starting_characters},
+            # Add an item to receive for each crate drop location, as backfill
+            # TODO: Can be any item rarity, but need to choose a ratio. Check wiki for rates?
+            ItemName.COMMON_ITEM.value: self.options.num_common_crate_drops.value,
+            ItemName.LEGENDARY_ITEM.value: self.options.num_legendary_crate_drops.value,
+            ItemName.COMMON_UPGRADE.value: self.options.num_common_upgrades.value,
+            ItemName.UNCOMMON_UPGRADE.value: self.options.num_uncommon_upgrades.value,
+            ItemName.RARE_UPGRADE.value: self.options.num_rare_upgrades.value,
+            ItemName.LEGENDARY_UPGRADE.value: self.options.num_legendary_upgrades.value,
+            ItemName.SHOP_SLOT.value: max(MAX_SHOP_SLOTS - num_starting_shop_slots, 0),
+        }
+        return Counter(item_counts)
+
     def generate_basic(self):
         pass
 
+    def pre_fill(self) -> None:
+        if not self._local_filler_items:
+            return
+
+        multiworld = self.multiworld
+        legendary_crate_names = self.location_name_groups["Legendary Crate Drops"]
+        # Legendary crate drops can't hold progression items anyway, so use them first. Leave the other locations we
+        # can reach with the starting characters to the main fill, so it has room to place the first characters.
+        legendary_crates: List[Location] = []
+        unreachable_locations: List[Location] = []
+        for location in multiworld.get_unfilled_locations(self.player):
+            if location.name in legendary_crate_names:
+                legendary_crates.append(location)
+            elif not location.can_reach(multiworld.state):
+                unreachable_locations.append(location)
+        self.random.shuffle(legendary_crates)
+        self.random.shuffle(unreachable_locations)
+
+        unplaced_filler = list(self._local_filler_items)
+        for location in legendary_crates + unreachable_locations:
+            if not unplaced_filler:
+                break
+            if location.can_fill(multiworld.state, unplaced_filler[-1], check_access=False):
+                multiworld.push_item(location, unplaced_filler.pop(), collect=False)
+        # Let the main fill place anything which didn't fit.
+        multiworld.itempool += unplaced_filler
+
     def get_filler_item_name(self):
         return self.random.choice(self._filler_items)
 
     def fill_slot_data(self) -> dict[str, Any]:
+        removed_wave_checks = {
+            character: self.waves_with_checks[len(self.waves_with_checks) - num_removed :]
+            for character, num_removed in zip(CHARACTERS, self._num_removed_wave_checks)
+            if num_removed
+        }
         return {
             "waves_with_checks": self.waves_with_checks,
+            # Waves without a check for each character with any removed by bundling filler, see FillerBundleSize.
+            "removed_wave_checks": removed_wave_checks,
             "num_wins_needed": self.options.num_victories.value,
             "num_consumables": self.options.num_common_crate_drops.value,
             "num_starting_shop_slots": self.options.num_starting_shop_slots.value,
             "num_legendary_consumables": self.options.num_legendary_crate_drops.value,
+            # Lets the client compute location and item IDs without requesting the data package.
+            "id_layout": get_world_id_layout(),
+            # Lets trackers check which locations are in logic without building the regions.
+            "logic": get_reachability_table(self.options, self.item_name_to_id, removed_wave_checks),
         }
+
+
+# Does nothing unless enabled with an environment variable, see Instrumentation.py.
+instrument_world(BrotatoWorld)
@@ -1,4 +1,7 @@
-from typing import ClassVar
+from typing import ClassVar, Dict, Optional, Tuple
+
+from BaseClasses import MultiWorld
+
 from .. import BrotatoWorld
 
 from test.bases import WorldTestBase
@@ -8,3 +11,27 @@ class BrotatoTestBase(WorldTestBase):
     game = "Brotato"
     world: BrotatoWorld
     player: ClassVar[int] = 1
+
+    # Multiworlds created by cached_world_setup, shared by every test class, keyed by the options and seed. Only the
+    # most recently used are kept, so the cache doesn't keep every multiworld alive for the whole test run.
+    _multiworld_cache: ClassVar[Dict[Tuple[str, Optional[int]], MultiWorld]] = {}
+    _multiworld_cache_size: ClassVar[int] = 4
+
+    def cached_world_setup(self, seed: Optional[int] = None) -> None:
+        """Like world_setup, but reuse the multiworld from an earlier test with the same options and seed, if any.
+
+        The multiworld is shared with other tests, so only use this in tests which don't change it or its state.
+        """
+        cache = BrotatoTestBase._multiworld_cache
+        key = (repr(sorted(self.options.items())), seed)
+        # Dicts keep insertion order, so reinserting the multiworld marks it as the most recently used.
+        multiworld = cache.pop(key, None)
+        if multiworld is None:
+            self.world_setup(seed)
+            cache[key] = self.multiworld
+            while len(cache) > self._multiworld_cache_size:
+                del cache[next(iter(cache))]
+        else:
+            cache[key] = multiworld
+            self.multiworld = multiworld
+            self.world = multiworld.worlds[self.player]
@@ -0,0 +1,108 @@
+"""Benchmarks for Brotato world generation.
+
+These aren't unit tests and aren't collected by the test runner. They need to be run from the root of an Archipelago
+installation with the Brotato world installed, as modules of the world, e.g.:
+
+    python -m worlds.brotato.test.benchmark.generation --help
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from argparse import Namespace
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from BaseClasses import CollectionState, MultiWorld
+from Fill import balance_multiworld_progression, distribute_items_restrictive
+from worlds.AutoWorld import AutoWorldRegister, call_all
+
+from ...Constants import (
+    MAX_COMMON_UPGRADES,
+    MAX_LEGENDARY_CRATE_DROPS,
+    MAX_LEGENDARY_UPGRADES,
+    MAX_NORMAL_CRATE_DROPS,
+    MAX_RARE_UPGRADES,
+    MAX_UNCOMMON_UPGRADES,
+)
+
+GAME = "Brotato"
+
+DEFAULT_OPTIONS: Dict[str, Any] = {}
+WORST_CASE_OPTIONS: Dict[str, Any] = {
+    "waves_per_drop": 1,
+    "num_common_crate_drops": MAX_NORMAL_CRATE_DROPS,
+    "num_legendary_crate_drops": MAX_LEGENDARY_CRATE_DROPS,
+    "num_common_upgrades": MAX_COMMON_UPGRADES,
+    "num_uncommon_upgrades": MAX_UNCOMMON_UPGRADES,
+    "num_rare_upgrades": MAX_RARE_UPGRADES,
+    "num_legendary_upgrades": MAX_LEGENDARY_UPGRADES,
+    "num_starting_shop_slots": 0,
+}
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "default": DEFAULT_OPTIONS,
+    "worst_case": WORST_CASE_OPTIONS,
+}
+
+# Each world step run with call_all, in the same order as Main.py.
+WORLD_STEPS = ("generate_early", "create_regions", "create_items", "set_rules", "generate_basic", "pre_fill")
+
+
+def setup_multiworld(num_players: int, options: Mapping[str, Any], seed: Optional[int] = None) -> MultiWorld:
+    """Create a multiworld of Brotato players which all use the same options, without running any world steps."""
+    multiworld = MultiWorld(num_players)
+    multiworld.game = {player: GAME for player in multiworld.player_ids}
+    multiworld.player_name = {player: f"Player{player}" for player in multiworld.player_ids}
+    multiworld.set_seed(seed)
+    multiworld.state = CollectionState(multiworld)
+
+    args = Namespace()
+    for name, option in AutoWorldRegister.world_types[GAME].options_dataclass.type_hints.items():
+        value = option.from_any(options.get(name, option.default))
+        setattr(args, name, {player: value for player in multiworld.player_ids})
+    multiworld.set_options(args)
+    return multiworld
+
+
+def generation_stages(multiworld: MultiWorld) -> Dict[str, Callable[[], Any]]:
+    """Get each stage of generation, in the order it's run in Main.py, excluding output."""
+    stages: Dict[str, Callable[[], Any]] = {step: _call_all_step(multiworld, step) for step in WORLD_STEPS}
+    stages["fill"] = lambda: distribute_items_restrictive(multiworld)
+    stages["post_fill"] = _call_all_step(multiworld, "post_fill")
+    if multiworld.players > 1:
+        stages["balancing"] = lambda: balance_multiworld_progression(multiworld)
+    stages["spoiler"] = lambda: multiworld.spoiler.create_playthrough(create_paths=False)
+    return stages
+
+
+def _call_all_step(multiworld: MultiWorld, step: str) -> Callable[[], Any]:
+    return lambda: call_all(multiworld, step)
+
+
+@dataclass
+class StageResult:
+    seconds: float
+    peak_memory_bytes: Optional[int] = None
+    retained_memory_bytes: Optional[int] = None
+
+
+def run_stage(stage: Callable[[], Any], trace_memory: bool = False) -> StageResult:
+    """Run a single stage of generation, timing it and optionally measuring the memory it allocates.
+
+    Memory is measured with tracemalloc, which slows down allocation-heavy code considerably, so wall times from runs
+    with memory tracing on shouldn't be compared with runs that have it off.
+    """
+    if trace_memory:
+        # Restart tracing so the peak only includes memory allocated during this stage.
+        tracemalloc.stop()
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    stage()
+    result = StageResult(seconds=time.perf_counter() - start)
+
+    if trace_memory:
+        result.retained_memory_bytes, result.peak_memory_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result
@@ -0,0 +1,81 @@
+"""Compare progression balancing time and sphere distribution for each value of the skip_balancing option.
+
+Generates a multiworld of Brotato players up to and including progression balancing for each option value, and reports
+how long balancing took and which spheres characters ended up in as JSON. Run from the root of an Archipelago
+installation:
+
+    python -m worlds.brotato.test.benchmark.balancing --players 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+from ...Constants import CHARACTERS
+from ...Options import SkipBalancing
+from . import SCENARIOS, generation_stages, run_stage, setup_multiworld
+
+_character_names = frozenset(CHARACTERS)
+
+
+def character_spheres(multiworld) -> List[int]:
+    """Get the sphere each character item was placed in, in no particular order."""
+    spheres = []
+    for sphere_index, sphere in enumerate(multiworld.get_spheres()):
+        spheres += [sphere_index] * sum(
+            1 for location in sphere if location.item is not None and location.item.name in _character_names
+        )
+    return spheres
+
+
+def benchmark_balancing(scenario: str, skip_balancing: str, num_players: int, seed: Optional[int]) -> Dict[str, Any]:
+    options = {**SCENARIOS[scenario], "skip_balancing": skip_balancing}
+    multiworld = setup_multiworld(num_players, options, seed)
+    stage_seconds = {
+        # The spoiler playthrough isn't needed to find the spheres.
+        name: run_stage(stage).seconds for name, stage in generation_stages(multiworld).items() if name != "spoiler"
+    }
+    spheres = character_spheres(multiworld)
+    return {
+        "scenario": scenario,
+        "skip_balancing": skip_balancing,
+        "players": num_players,
+        "seed": multiworld.seed,
+        "balancing_seconds": stage_seconds.get("balancing"),
+        "total_seconds": sum(stage_seconds.values()),
+        "character_spheres": {
+            "mean": statistics.mean(spheres) if spheres else None,
+            "max": max(spheres, default=None),
+            "histogram": dict(sorted(Counter(spheres).items())),
+        },
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=50, help="Number of Brotato players.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="default", help="Option set to use.")
+    parser.add_argument(
+        "--skip-balancing",
+        nargs="+",
+        choices=sorted(SkipBalancing.options),
+        default=sorted(SkipBalancing.options, key=SkipBalancing.options.get),
+        help="Values of the skip_balancing option to compare.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed to use for every multiworld.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for skip_balancing in args.skip_balancing:
+        print(f"Generating with skip_balancing={skip_balancing}...", file=sys.stderr)
+        results.append(benchmark_balancing(args.scenario, skip_balancing, args.players, args.seed))
+    json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
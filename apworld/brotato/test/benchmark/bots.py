@@ -0,0 +1,362 @@
+"""Load test a MultiServer with many headless Brotato clients.
+
+Each bot connects to a slot and plays through simulated runs at an accelerated speed, sending the same commands the
+client mod sends: Connect when connecting, followed by GetDataPackage only if the slot data has no ID layout and Get
+for the characters it has won runs with, LocationChecks for each wave with a check and loot crate, Set to record each
+won run in data storage, and StatusUpdate when the goal is reached. Bots also send Sync at the start of each run. The
+time between each command and the server's reply to it is recorded, and the latency percentiles for each command are
+reported at the end.
+
+To load test a local server, generate a game with Brotato players named Player1, Player2, etc. and host it:
+
+    python MultiServer.py output/AP_12345.zip
+
+then run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.bots --bots 500 ws://localhost:38281
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set
+
+import websockets
+
+from ...Constants import CHARACTERS, NUM_WAVES, RUN_WINS_DATA_STORAGE_KEY_TEMPLATE
+from ...Items import item_name_to_id
+from ...Locations import LocationKind, decode_location_id, encode_location_id
+from ...Rules import character_bits
+
+GAME = "Brotato"
+CLIENT_GOAL_STATUS = 30
+
+# Commands the server sends in reply to the commands the bots send. LocationChecks are matched to the RoomUpdate
+# containing the checked location instead, and Set and StatusUpdate have no reply.
+_REPLY_COMMANDS: Dict[str, str] = {
+    "GetDataPackage": "DataPackage",
+    "Connect": "Connected",
+    "Sync": "ReceivedItems",
+    "Get": "Retrieved",
+}
+_REPLIED_COMMANDS: Dict[str, str] = {reply: cmd for cmd, reply in _REPLY_COMMANDS.items()}
+
+_item_id_to_name: Dict[int, str] = {item_id: name for name, item_id in item_name_to_id.items()}
+
+
+class LatencyStats:
+    """Time between sending each command to the server and getting the reply, shared by all bots."""
+
+    latencies: Dict[str, List[float]]
+    num_sent: Dict[str, int]
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.num_sent = defaultdict(int)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for cmd in sorted(self.num_sent):
+            latencies = sorted(self.latencies[cmd])
+            result[cmd] = {"sent": self.num_sent[cmd], "replies": len(latencies)}
+            if latencies:
+                result[cmd].update(
+                    {
+                        f"p{percentile}_ms": latencies[min(len(latencies) - 1, len(latencies) * percentile // 100)]
+                        * 1000
+                        for percentile in (50, 90, 99)
+                    }
+                )
+                result[cmd]["max_ms"] = latencies[-1] * 1000
+        return result
+
+
+class BrotatoBot:
+    """A headless client for a single Brotato slot, which plays simulated runs until it reaches its goal."""
+
+    def __init__(
+        self,
+        url: str,
+        slot_name: str,
+        stats: LatencyStats,
+        password: str = "",
+        wave_seconds: float = 0.01,
+        death_chance: float = 0.02,
+        crate_chance: float = 0.5,
+        legendary_crate_chance: float = 0.1,
+        max_runs: int = 50,
+        connect_timeout: float = 60.0,
+        seed: Optional[int] = None,
+    ):
+        self.url = url
+        self.slot_name = slot_name
+        self.stats = stats
+        self.password = password
+        self.wave_seconds = wave_seconds
+        self.death_chance = death_chance
+        self.crate_chance = crate_chance
+        self.legendary_crate_chance = legendary_crate_chance
+        self.max_runs = max_runs
+        self.connect_timeout = connect_timeout
+        self.random = random.Random(seed)
+
+        self.slot_data: Dict[str, Any] = {}
+        # The waves with a check for each character, from the slot data.
+        self.waves_with_checks: Dict[str, Set[int]] = {}
+        self.characters: Set[str] = set()
+        self.run_wins_key = ""
+        self.won_characters: Set[str] = set()
+        self.checked_locations: Set[int] = set()
+        self.num_crates_picked_up = 0
+        self.num_legendary_crates_picked_up = 0
+        self.goal_completed = False
+
+        self._websocket: Any = None
+        self._reply_waiters: Dict[str, Deque[float]] = defaultdict(deque)
+        self._location_check_times: Dict[int, float] = {}
+        self._connected = asyncio.Event()
+        self._received_items = asyncio.Event()
+        self._retrieved_run_wins = asyncio.Event()
+        self._connection_error: Optional[Exception] = None
+
+    async def run(self) -> None:
+        """Connect to the server and play until the goal is reached or the maximum number of runs is played."""
+        async with websockets.connect(self.url, max_size=None, ping_interval=None) as websocket:
+            self._websocket = websocket
+            receive_task = asyncio.ensure_future(self._receive_loop())
+            try:
+                await self._wait_until_connected(receive_task)
+                for _ in range(self.max_runs):
+                    if self.goal_completed:
+                        break
+                    await self._play_run()
+            finally:
+                receive_task.cancel()
+
+    async def _wait_until_connected(self, receive_task: asyncio.Future) -> None:
+        """Wait for the server's replies to connecting.
+
+        Raises if the connection is refused or closed first, or if they don't all arrive within `connect_timeout`
+        seconds, so a bot whose connection fails under load stops instead of waiting forever.
+        """
+
+        async def wait_for_replies() -> None:
+            await self._connected.wait()
+            await self._received_items.wait()
+            await self._retrieved_run_wins.wait()
+
+        replies_task = asyncio.ensure_future(wait_for_replies())
+        done, _ = await asyncio.wait(
+            {replies_task, receive_task}, timeout=self.connect_timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        if replies_task not in done:
+            replies_task.cancel()
+            if receive_task in done:
+                # Raises the receive loop's exception, if it had one.
+                receive_task.result()
+                raise ConnectionError("The server closed the connection before the bot finished connecting.")
+            raise asyncio.TimeoutError(f"Not connected after {self.connect_timeout} seconds.")
+        if self._connection_error:
+            raise self._connection_error
+
+    async def _send(self, command: Dict[str, Any]) -> None:
+        cmd = command["cmd"]
+        now = time.perf_counter()
+        self.stats.num_sent[cmd] += 1
+        if cmd in _REPLY_COMMANDS:
+            self._reply_waiters[_REPLY_COMMANDS[cmd]].append(now)
+        elif cmd == "LocationChecks":
+            for location_id in command["locations"]:
+                self._location_check_times.setdefault(location_id, now)
+        await self._websocket.send(json.dumps([command]))
+
+    async def _check_location(self, location_id: int) -> None:
+        if location_id not in self.checked_locations:
+            self.checked_locations.add(location_id)
+            await self._send({"cmd": "LocationChecks", "locations": [location_id]})
+
+    async def _play_run(self) -> None:
+        await self._send({"cmd": "Sync"})
+        # Prefer characters which haven't won a run yet, since only the first win with each counts towards the goal.
+        not_won = sorted(self.characters - self.won_characters)
+        character = self.random.choice(not_won or sorted(self.characters))
+
+        for wave in range(1, NUM_WAVES + 1):
+            await asyncio.sleep(self.wave_seconds)
+            await self._drop_crates()
+            if self.random.random() < self.death_chance:
+                return
+            if wave in self.waves_with_checks[character]:
+                await self._check_location(encode_location_id(LocationKind.WAVE_COMPLETE, character, wave))
+        await self._win_run(character)
+
+    async def _win_run(self, character: str) -> None:
+        if character in self.won_characters:
+            return
+        self.won_characters.add(character)
+        await self._send(
+            {
+                "cmd": "Set",
+                "key": self.run_wins_key,
+                "default": 0,
+                "want_reply": False,
+                "operations": [{"operation": "or", "value": character_bits[character]}],
+            }
+        )
+        await self._check_goal()
+
+    async def _check_goal(self) -> None:
+        if len(self.won_characters) >= self.slot_data["num_wins_needed"] and not self.goal_completed:
+            self.goal_completed = True
+            await self._send({"cmd": "StatusUpdate", "status": CLIENT_GOAL_STATUS})
+
+    async def _drop_crates(self) -> None:
+        if (
+            self.num_crates_picked_up < self.slot_data["num_consumables"]
+            and self.random.random() < self.crate_chance
+        ):
+            self.num_crates_picked_up += 1
+            await self._check_location(encode_location_id(LocationKind.CRATE_DROP, num=self.num_crates_picked_up))
+        if (
+            self.num_legendary_crates_picked_up < self.slot_data["num_legendary_consumables"]
+            and self.random.random() < self.legendary_crate_chance
+        ):
+            self.num_legendary_crates_picked_up += 1
+            await self._check_location(
+                encode_location_id(LocationKind.LEGENDARY_CRATE_DROP, num=self.num_legendary_crates_picked_up)
+            )
+
+    async def _receive_loop(self) -> None:
+        async for message in self._websocket:
+            now = time.perf_counter()
+            for command in json.loads(message):
+                cmd = command["cmd"]
+                waiters = self._reply_waiters.get(cmd)
+                # Only the full resend of items is a reply to Sync, not items found by other players in the meantime.
+                if waiters and (cmd != "ReceivedItems" or command["index"] == 0):
+                    self.stats.latencies[_REPLIED_COMMANDS[cmd]].append(now - waiters.popleft())
+                await self._handle_command(command, now)
+
+    async def _handle_command(self, command: Dict[str, Any], now: float) -> None:
+        cmd = command["cmd"]
+        if cmd == "RoomInfo":
+            await self._send(
+                {
+                    "cmd": "Connect",
+                    "game": GAME,
+                    "name": self.slot_name,
+                    "password": self.password,
+                    "uuid": f"Brotato bot: {self.slot_name}",
+                    "version": {"major": 0, "minor": 4, "build": 2, "class": "Version"},
+                    "items_handling": 0b111,
+                    "tags": [],
+                    "slot_data": True,
+                }
+            )
+        elif cmd == "ConnectionRefused":
+            self._connection_error = ConnectionError(f"Connection refused: {command['errors']}")
+            self._connected.set()
+            self._received_items.set()
+            self._retrieved_run_wins.set()
+        elif cmd == "Connected":
+            if "id_layout" not in command["slot_data"]:
+                # Like the client, only worlds generated before the ID layout was added need the data package.
+                await self._send({"cmd": "GetDataPackage", "games": [GAME]})
+            self._on_connected(command)
+            await self._send({"cmd": "Get", "keys": [self.run_wins_key]})
+        elif cmd == "Retrieved":
+            run_wins = command["keys"].get(self.run_wins_key) or 0
+            self.won_characters.update(c for c, bit in character_bits.items() if run_wins & bit)
+            self._retrieved_run_wins.set()
+            await self._check_goal()
+        elif cmd == "RoomUpdate":
+            for location_id in command.get("checked_locations", []):
+                check_time = self._location_check_times.pop(location_id, None)
+                if check_time is not None:
+                    self.stats.latencies["LocationChecks"].append(now - check_time)
+        elif cmd == "ReceivedItems":
+            self._on_received_items(command)
+
+    def _on_connected(self, command: Dict[str, Any]) -> None:
+        self.slot_data = command["slot_data"]
+        # Worlds generated before filler bundling have no removed checks.
+        removed_wave_checks = self.slot_data.get("removed_wave_checks", {})
+        self.waves_with_checks = {
+            character: set(self.slot_data["waves_with_checks"]) - set(removed_wave_checks.get(character, ()))
+            for character in CHARACTERS
+        }
+        self.run_wins_key = RUN_WINS_DATA_STORAGE_KEY_TEMPLATE.format(team=command["team"], slot=command["slot"])
+        self.checked_locations.update(command["checked_locations"])
+        for location_id in command["checked_locations"]:
+            location_info = decode_location_id(location_id)
+            if location_info.kind is LocationKind.CRATE_DROP:
+                self.num_crates_picked_up = max(self.num_crates_picked_up, location_info.num)
+            elif location_info.kind is LocationKind.LEGENDARY_CRATE_DROP:
+                self.num_legendary_crates_picked_up = max(self.num_legendary_crates_picked_up, location_info.num)
+        self._connected.set()
+
+    def _on_received_items(self, command: Dict[str, Any]) -> None:
+        if command["index"] == 0:
+            # Either the first items after connecting, or a reply to Sync which resends every item.
+            self.characters.clear()
+        for item in command["items"]:
+            item_name = _item_id_to_name.get(item["item"])
+            if item_name in CHARACTERS:
+                self.characters.add(item_name)
+        self._received_items.set()
+
+
+async def run_bots(url: str, slot_names: Sequence[str], stats: LatencyStats, **bot_options: Any) -> Dict[str, Any]:
+    bots = [BrotatoBot(url, slot_name, stats, seed=i, **bot_options) for i, slot_name in enumerate(slot_names)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bot.run() for bot in bots), return_exceptions=True)
+    errors = [f"{bot.slot_name}: {result!r}" for bot, result in zip(bots, results) if isinstance(result, Exception)]
+    return {
+        "bots": len(bots),
+        "seconds": time.perf_counter() - start,
+        "goals_completed": sum(bot.goal_completed for bot in bots),
+        "errors": errors,
+        "latency": stats.summary(),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url", help="URL of the server, e.g. ws://localhost:38281.")
+    parser.add_argument("--bots", type=int, default=100, help="Number of bots to run at once.")
+    parser.add_argument(
+        "--name-template", default="Player{number}", help="Slot name of each bot, with {number} starting from 1."
+    )
+    parser.add_argument("--password", default="", help="Server password.")
+    parser.add_argument("--wave-seconds", type=float, default=0.01, help="Simulated length of each wave.")
+    parser.add_argument("--death-chance", type=float, default=0.02, help="Chance of losing the run on each wave.")
+    parser.add_argument("--max-runs", type=int, default=50, help="Most runs each bot plays before stopping.")
+    parser.add_argument(
+        "--connect-timeout", type=float, default=60.0, help="Seconds each bot waits for the server to accept it."
+    )
+    args = parser.parse_args(argv)
+
+    slot_names = [args.name_template.format(number=i) for i in range(1, args.bots + 1)]
+    result = asyncio.run(
+        run_bots(
+            args.url,
+            slot_names,
+            LatencyStats(),
+            password=args.password,
+            wave_seconds=args.wave_seconds,
+            death_chance=args.death_chance,
+            max_runs=args.max_runs,
+            connect_timeout=args.connect_timeout,
+        )
+    )
+    json.dump(result, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare fill time for different values of the local_filler_percentage option.
+
+Generates a multiworld of Brotato players up to and including the main fill for each percentage, and reports the time
+spent placing local filler in pre_fill and in the main fill as JSON. Run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.fill --players 50 --percentages 0 50 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Optional, Sequence
+
+from . import SCENARIOS, WORLD_STEPS, generation_stages, run_stage, setup_multiworld
+
+DEFAULT_PERCENTAGES = (0, 50, 100)
+
+
+def benchmark_fill(
+    scenario: str, local_filler_percentage: int, num_players: int, seed: Optional[int]
+) -> Dict[str, Any]:
+    options = {**SCENARIOS[scenario], "local_filler_percentage": local_filler_percentage}
+    multiworld = setup_multiworld(num_players, options, seed)
+    stages = generation_stages(multiworld)
+    stage_seconds = {name: run_stage(stages[name]).seconds for name in WORLD_STEPS}
+    num_local_filler = sum(1 for location in multiworld.get_filled_locations() if not location.locked)
+    num_itempool_items = len(multiworld.itempool)
+    stage_seconds["fill"] = run_stage(stages["fill"]).seconds
+    return {
+        "scenario": scenario,
+        "local_filler_percentage": local_filler_percentage,
+        "players": num_players,
+        "seed": multiworld.seed,
+        "local_filler_items": num_local_filler,
+        "itempool_items": num_itempool_items,
+        "pre_fill_seconds": stage_seconds["pre_fill"],
+        "fill_seconds": stage_seconds["fill"],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=50, help="Number of Brotato players.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="worst_case", help="Option set to use.")
+    parser.add_argument(
+        "--percentages", type=int, nargs="+", default=DEFAULT_PERCENTAGES, help="Local filler percentages to compare."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed to use for every multiworld.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for percentage in args.percentages:
+        print(f"Generating with local_filler_percentage={percentage}...", file=sys.stderr)
+        results.append(benchmark_fill(args.scenario, percentage, args.players, args.seed))
+    json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Measure how Brotato generation scales with the number of players and with extreme options.
+
+Generates multiworlds made up only of Brotato players, and reports wall time and (optionally) memory for each stage
+of generation as JSON. Run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.generation --players 1 10 100 500 --output generation.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import SCENARIOS, generation_stages, run_stage, setup_multiworld
+
+DEFAULT_PLAYER_COUNTS = (1, 10, 100, 500)
+
+
+def benchmark_generation(
+    scenario: str, num_players: int, seed: Optional[int] = None, trace_memory: bool = False
+) -> Dict[str, Any]:
+    options = SCENARIOS[scenario]
+    setup_start = time.perf_counter()
+    multiworld = setup_multiworld(num_players, options, seed)
+    setup_seconds = time.perf_counter() - setup_start
+
+    stage_results = {
+        name: asdict(run_stage(stage, trace_memory)) for name, stage in generation_stages(multiworld).items()
+    }
+    return {
+        "scenario": scenario,
+        "players": num_players,
+        "seed": multiworld.seed,
+        "options": options,
+        "setup_seconds": setup_seconds,
+        "total_seconds": setup_seconds + sum(result["seconds"] for result in stage_results.values()),
+        "stages": stage_results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=DEFAULT_PLAYER_COUNTS, help="Numbers of Brotato players to test."
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS), help="Option sets to test."
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Seed to use for every multiworld. Random if unset.")
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Measure peak memory of each stage with tracemalloc. This makes the wall times much less accurate.",
+    )
+    parser.add_argument("--output", default=None, help="File to write the JSON results to. Prints to stdout if unset.")
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, Any]] = []
+    for scenario in args.scenarios:
+        for num_players in args.players:
+            print(f"Generating {scenario} with {num_players} player(s)...", file=sys.stderr)
+            results.append(benchmark_generation(scenario, num_players, args.seed, args.trace_memory))
+
+    report = {
+        "python": platform.python_version(),
+        "trace_memory": args.trace_memory,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure how long it takes to create the Brotato item pool, compared to creating it one item at a time.
+
+Run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.item_pool --players 100 --scenario worst_case
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from BaseClasses import Item
+from worlds.AutoWorld import call_all
+
+from ... import BrotatoWorld
+from ...Constants import CHARACTERS, MAX_SHOP_SLOTS
+from ...Items import ItemName, item_name_groups
+from . import SCENARIOS, setup_multiworld
+
+
+def legacy_create_itempool(world: BrotatoWorld) -> List[Item]:
+    """Create the item pool the way BrotatoWorld.create_items used to, with a name and create_item call per item."""
+    options = world.options
+    item_names: List[ItemName | str] = []
+    item_names += [c for c in item_name_groups["Characters"] if c not in world._starting_characters]
+    for _ in range(options.num_common_crate_drops.value):
+        item_names.append(ItemName.COMMON_ITEM)
+    for _ in range(options.num_legendary_crate_drops.value):
+        item_names.append(ItemName.LEGENDARY_ITEM)
+    item_names += [ItemName.COMMON_UPGRADE] * options.num_common_upgrades.value
+    item_names += [ItemName.UNCOMMON_UPGRADE] * options.num_uncommon_upgrades.value
+    item_names += [ItemName.RARE_UPGRADE] * options.num_rare_upgrades.value
+    item_names += [ItemName.LEGENDARY_UPGRADE] * options.num_legendary_upgrades.value
+    item_names += [ItemName.SHOP_SLOT] * max(MAX_SHOP_SLOTS - options.num_starting_shop_slots.value, 0)
+
+    itempool = [world.create_item(item_name) for item_name in item_names]
+    total_locations = (
+        options.num_common_crate_drops.value
+        + options.num_legendary_crate_drops.value
+        + (len(world.waves_with_checks) * len(CHARACTERS))
+    )
+    itempool += [world.create_filler() for _ in range(total_locations - len(itempool))]
+    return itempool
+
+
+def _time_repeated(func: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    times: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min_seconds": min(times), "median_seconds": statistics.median(times), "max_seconds": max(times)}
+
+
+def benchmark_item_pool(scenario: str, num_players: int, repeats: int, seed: Optional[int] = None) -> Dict[str, Any]:
+    multiworld = setup_multiworld(num_players, SCENARIOS[scenario], seed)
+    call_all(multiworld, "generate_early")
+    worlds = [multiworld.worlds[player] for player in multiworld.player_ids]
+
+    def create_all(create_itempool: Callable[[BrotatoWorld], List[Item]]) -> Callable[[], None]:
+        return lambda: [create_itempool(world) for world in worlds]
+
+    return {
+        "scenario": scenario,
+        "players": num_players,
+        "seed": multiworld.seed,
+        "items_per_player": len(worlds[0].create_itempool()),
+        "create_itempool": _time_repeated(create_all(BrotatoWorld.create_itempool), repeats),
+        "legacy": _time_repeated(create_all(legacy_create_itempool), repeats),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=100, help="Number of Brotato players.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="worst_case", help="Option set to use.")
+    parser.add_argument("--repeats", type=int, default=10, help="Number of times to repeat each measurement.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed to use for the multiworld. Random if unset.")
+    args = parser.parse_args(argv)
+
+    result = benchmark_item_pool(args.scenario, args.players, args.repeats, args.seed)
+    json.dump(result, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Compare fill time with different ways of keeping progression items out of legendary loot crate drops.
+
+Generates a multiworld of Brotato players up to and including the main fill for each mode, and reports the time spent
+in fill and how many times the legendary crate item rules were called as JSON. The modes are:
+
+* closure: a separate closure for each location, checking the classification against a tuple, like older versions.
+* shared: the shared item rule from Regions.py, with the locations left as DEFAULT.
+* excluded: the shared item rule, with the locations EXCLUDED when the player has enough filler, see
+  Regions.legendary_crates_excluded. This is what the world does.
+
+Run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.legendary_crates --players 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from BaseClasses import Item, ItemClassification, Location, LocationProgressType, MultiWorld
+
+from ...Regions import _legendary_loot_crate_item_rule
+from . import SCENARIOS, WORLD_STEPS, generation_stages, run_stage, setup_multiworld
+
+MODES = ("closure", "shared", "excluded")
+
+
+def _closure_item_rule() -> Callable[[Item], bool]:
+    def legendary_loot_crate_item_rule(item: Item) -> bool:
+        return item.classification not in (
+            ItemClassification.progression,
+            ItemClassification.progression_skip_balancing,
+        )
+
+    return legendary_loot_crate_item_rule
+
+
+def _counted_rule(rule: Callable[[Item], bool], calls: List[int]) -> Callable[[Item], bool]:
+    def counted_rule(item: Item) -> bool:
+        calls[0] += 1
+        return rule(item)
+
+    return counted_rule
+
+
+def _legendary_crates(multiworld: MultiWorld) -> List[Location]:
+    legendary_crates = []
+    for world in multiworld.worlds.values():
+        legendary_crate_names = world.location_name_groups["Legendary Crate Drops"]
+        legendary_crates += [loc for loc in multiworld.get_locations(world.player) if loc.name in legendary_crate_names]
+    return legendary_crates
+
+
+def _set_mode(legendary_crates: Sequence[Location], mode: str, count_calls: Optional[List[int]]) -> None:
+    for location in legendary_crates:
+        if mode == "closure":
+            location.item_rule = _closure_item_rule()
+        else:
+            location.item_rule = _legendary_loot_crate_item_rule
+        if mode != "excluded":
+            location.progress_type = LocationProgressType.DEFAULT
+        if count_calls is not None:
+            location.item_rule = _counted_rule(location.item_rule, count_calls)
+
+
+def benchmark_legendary_crates(
+    scenario: str, mode: str, num_players: int, seed: Optional[int], count_calls: bool = False
+) -> Dict[str, Any]:
+    multiworld = setup_multiworld(num_players, SCENARIOS[scenario], seed)
+    stages = generation_stages(multiworld)
+    for name in WORLD_STEPS:
+        stages[name]()
+    legendary_crates = _legendary_crates(multiworld)
+    calls = [0] if count_calls else None
+    _set_mode(legendary_crates, mode, calls)
+    return {
+        "scenario": scenario,
+        "mode": mode,
+        "players": num_players,
+        "seed": multiworld.seed,
+        "legendary_crates": len(legendary_crates),
+        "excluded_legendary_crates": sum(
+            1 for loc in legendary_crates if loc.progress_type == LocationProgressType.EXCLUDED
+        ),
+        "fill_seconds": run_stage(stages["fill"]).seconds,
+        "item_rule_calls": calls[0] if calls else None,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=50, help="Number of Brotato players.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="worst_case", help="Option set to use.")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES, help="Modes to compare.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed to use for every multiworld.")
+    parser.add_argument(
+        "--count-calls",
+        action="store_true",
+        help="Count the item rule calls. The counting makes each call slower, so don't compare times with this on.",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for mode in args.modes:
+        print(f"Generating with {mode} legendary crate rules...", file=sys.stderr)
+        results.append(benchmark_legendary_crates(args.scenario, mode, args.players, args.seed, args.count_calls))
+    json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
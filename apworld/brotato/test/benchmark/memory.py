@@ -0,0 +1,122 @@
+"""Measure how much memory each Brotato player takes up in a generated multiworld.
+
+Reports the memory retained per player after fill, and the size of single Brotato location and item objects compared
+to the same classes without __slots__. Run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.memory --scenario worst_case
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+from BaseClasses import Item, ItemClassification, Location, LocationProgressType
+
+from ...Items import BrotatoItem
+from ...Locations import BrotatoLocation
+from . import SCENARIOS, WORLD_STEPS, generation_stages, setup_multiworld
+
+
+class UnslottedBrotatoLocation(Location):
+    """BrotatoLocation as it was before it used __slots__, for comparison."""
+
+    game = "Brotato"
+
+
+class UnslottedBrotatoItem(Item):
+    """BrotatoItem as it was before it used __slots__, for comparison."""
+
+    game = "Brotato"
+
+
+def _traced_bytes(create: Callable[[], Any]) -> int:
+    """Get the memory allocated by create() that's still in use once it returns, keeping the result alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = create()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def _generate(num_players: int, options: Mapping[str, Any], seed: Optional[int]) -> Any:
+    multiworld = setup_multiworld(num_players, options, seed)
+    stages = generation_stages(multiworld)
+    for stage_name in (*WORLD_STEPS, "fill"):
+        stages[stage_name]()
+    return multiworld
+
+
+def measure_bytes_per_player(options: Mapping[str, Any], num_players: int = 10, seed: Optional[int] = 0) -> float:
+    """Measure the memory retained by each player after fill, excluding memory shared by all players."""
+    single_player_bytes = _traced_bytes(lambda: _generate(1, options, seed))
+    multi_player_bytes = _traced_bytes(lambda: _generate(num_players + 1, options, seed))
+    return (multi_player_bytes - single_player_bytes) / num_players
+
+
+def measure_location_bytes(location_class: type, count: int = 10_000) -> float:
+    """Measure the size of each location after fill, excluding the name and item which are shared.
+
+    The same attributes are set as on locations created by BrotatoLocationBase.to_game_loc and filled with an item.
+    """
+    item = BrotatoItem("Common Item", ItemClassification.useful, 0, 1)
+
+    def create_locations():
+        locations = [location_class(1, "Loot Crate 1", i, None) for i in range(count)]
+        for location in locations:
+            location.progress_type = LocationProgressType.DEFAULT
+            location.item = item
+        return locations
+
+    return _traced_bytes(create_locations) / count
+
+
+def measure_item_bytes(item_class: type, count: int = 10_000) -> float:
+    """Measure the size of each item placed at a location, excluding the name which is shared."""
+    location = BrotatoLocation(1, "Loot Crate 1", 0, None)
+
+    def create_items():
+        items = [item_class("Common Item", ItemClassification.useful, i, 1) for i in range(count)]
+        for item in items:
+            item.location = location
+        return items
+
+    return _traced_bytes(create_items) / count
+
+
+def benchmark_memory(scenario: str, num_players: int, seed: Optional[int] = 0) -> Dict[str, Any]:
+    return {
+        "scenario": scenario,
+        "players": num_players,
+        "bytes_per_player": measure_bytes_per_player(SCENARIOS[scenario], num_players, seed),
+        "bytes_per_location": {
+            "unslotted": measure_location_bytes(UnslottedBrotatoLocation),
+            "slotted": measure_location_bytes(BrotatoLocation),
+        },
+        "bytes_per_item": {
+            "unslotted": measure_item_bytes(UnslottedBrotatoItem),
+            "slotted": measure_item_bytes(BrotatoItem),
+        },
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=10, help="Number of players to average over.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="worst_case", help="Option set to use.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed to use for the multiworld.")
+    args = parser.parse_args(argv)
+
+    result = benchmark_memory(args.scenario, args.players, args.seed)
+    json.dump(result, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Measure the throughput and latency overhead of the chunking proxy.
+
+A stand-in server replies to each message from the client with a ReceivedItems command for the requested number of
+items. The round trip is timed with the client connected directly to the server, then through the proxy. Run from the
+root of an Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.proxy --items 10 1000 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import websockets
+
+from ...ChunkingProxy import DEFAULT_MAX_MESSAGE_BYTES, ChunkingProxy
+
+
+def _received_items_message(num_items: int) -> str:
+    items = [
+        {"item": 0xF4E0_0000 + i % 65, "location": 0xF4E0_0000 + i, "player": 1, "flags": 1, "class": "NetworkItem"}
+        for i in range(num_items)
+    ]
+    return json.dumps([{"cmd": "ReceivedItems", "index": 0, "items": items}], separators=(",", ":"))
+
+
+async def _stand_in_server(websocket: Any, path: Optional[str] = None) -> None:
+    async for message in websocket:
+        num_items = json.loads(message)[0]["items"]
+        await websocket.send(_received_items_message(num_items))
+
+
+async def _time_round_trips(url: str, num_items: int, repeats: int) -> List[float]:
+    """Time sending a request and receiving every item in the reply, which may be split into several messages."""
+    times: List[float] = []
+    async with websockets.connect(url, max_size=None, ping_interval=None) as client:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await client.send(json.dumps([{"cmd": "Sync", "items": num_items}]))
+            received = 0
+            while True:
+                commands = json.loads(await client.recv())
+                received += sum(len(command["items"]) for command in commands)
+                if received >= num_items:
+                    break
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def _summarize(times: List[float], message_bytes: int) -> Dict[str, float]:
+    median = statistics.median(times)
+    return {
+        "median_ms": median * 1000,
+        "max_ms": max(times) * 1000,
+        "throughput_kib_per_second": message_bytes / median / 1024,
+    }
+
+
+async def benchmark_proxy(
+    item_counts: Sequence[int], repeats: int, max_message_bytes: int, chunk_interval: float
+) -> List[Dict[str, Any]]:
+    results = []
+    async with websockets.serve(_stand_in_server, "localhost", 0, max_size=None, ping_interval=None) as server:
+        server_url = f"ws://localhost:{server.sockets[0].getsockname()[1]}"
+        proxy = ChunkingProxy(server_url, max_message_bytes, chunk_interval)
+        async with proxy.serve("localhost", 0) as proxy_server:
+            proxy_url = f"ws://localhost:{proxy_server.sockets[0].getsockname()[1]}"
+            for num_items in item_counts:
+                message_bytes = len(_received_items_message(num_items).encode("utf-8"))
+                direct = _summarize(await _time_round_trips(server_url, num_items, repeats), message_bytes)
+                proxied = _summarize(await _time_round_trips(proxy_url, num_items, repeats), message_bytes)
+                results.append(
+                    {
+                        "items": num_items,
+                        "message_bytes": message_bytes,
+                        "direct": direct,
+                        "proxied": proxied,
+                        "overhead_ms": proxied["median_ms"] - direct["median_ms"],
+                    }
+                )
+        print(proxy.stats.report(), file=sys.stderr)
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--items", type=int, nargs="+", default=[10, 1000, 20000], help="Number of items in each server message."
+    )
+    parser.add_argument("--repeats", type=int, default=20, help="Number of round trips to time for each size.")
+    parser.add_argument("--max-message-bytes", type=int, default=DEFAULT_MAX_MESSAGE_BYTES)
+    parser.add_argument(
+        "--chunk-interval", type=float, default=0.0, help="Delay between split messages. Zero to measure only overhead."
+    )
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(benchmark_proxy(args.items, args.repeats, args.max_message_bytes, args.chunk_interval))
+    json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Check Brotato generation hasn't become slower or heavier than a checked-in baseline.
+
+Generates each multiworld in REGRESSION_SCENARIOS up to and including the main fill, with a fixed seed, and measures:
+
+* seconds: wall time of the world steps and fill, the fastest of several repeats.
+* peak_memory_bytes: peak memory allocated during the world steps and fill, measured with tracemalloc in a separate
+  run, since tracing slows generation down.
+* objects: how many regions, entrances, locations and items the multiworld has after pre_fill.
+
+Times and memory are compared against a baseline with a relative tolerance, and object counts must match exactly,
+since they only depend on the world's code and the seed. Exits with status 1 if anything regressed. Run from the root
+of an Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.regression
+
+Times and memory depend on the machine, so the checked-in `regression_baseline.json` only has object counts, and
+metrics missing from the baseline are reported but not compared. To compare times and memory, measure a baseline on
+your machine before making a change, and compare against it afterwards:
+
+    python -m worlds.brotato.test.benchmark.regression --update --baseline local_baseline.json
+    python -m worlds.brotato.test.benchmark.regression --baseline local_baseline.json --strict
+
+`--strict` makes metrics missing from the baseline fail the gate, so it can't pass without comparing anything. After
+an intended change to the object counts, update the checked-in baseline with:
+
+    python -m worlds.brotato.test.benchmark.regression --update --objects-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from BaseClasses import MultiWorld
+
+from . import SCENARIOS, WORLD_STEPS, generation_stages, setup_multiworld
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "regression_baseline.json")
+DEFAULT_TIME_TOLERANCE = 0.25
+DEFAULT_MEMORY_TOLERANCE = 0.10
+SEED = 0
+
+_STAGES = (*WORLD_STEPS, "fill")
+
+
+class RegressionScenario(NamedTuple):
+    scenario: str
+    """Name of the option set in SCENARIOS."""
+    players: int
+
+
+# Fixed, so results can be compared with the baseline. Changing these needs the baseline updated.
+REGRESSION_SCENARIOS: Dict[str, RegressionScenario] = {
+    "default_1": RegressionScenario("default", 1),
+    "default_50": RegressionScenario("default", 50),
+    "worst_case_10": RegressionScenario("worst_case", 10),
+}
+
+
+def count_objects(multiworld: MultiWorld) -> Dict[str, int]:
+    """Count the objects in a multiworld which the Brotato world creates."""
+    locations = multiworld.get_locations()
+    return {
+        "regions": len(multiworld.get_regions()),
+        "entrances": sum(len(region.exits) for region in multiworld.get_regions()),
+        "locations": len(locations),
+        "items": (
+            len(multiworld.itempool)
+            + sum(1 for location in locations if location.item is not None)
+            + sum(len(items) for items in multiworld.precollected_items.values())
+        ),
+    }
+
+
+def _generate(regression_scenario: RegressionScenario, counts: Optional[Dict[str, int]] = None) -> float:
+    """Generate the scenario, returning the seconds spent in the world steps and fill.
+
+    If `counts` is given, it's filled in with the object counts after pre_fill.
+    """
+    multiworld = setup_multiworld(regression_scenario.players, SCENARIOS[regression_scenario.scenario], SEED)
+    stages = generation_stages(multiworld)
+    seconds = 0.0
+    for name in _STAGES:
+        if name == "fill" and counts is not None:
+            counts.update(count_objects(multiworld))
+        start = time.perf_counter()
+        stages[name]()
+        seconds += time.perf_counter() - start
+    return seconds
+
+
+def _peak_memory_bytes(regression_scenario: RegressionScenario) -> int:
+    # Setting up the multiworld is included, which is small compared to the world steps and fill.
+    tracemalloc.start()
+    try:
+        _generate(regression_scenario)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_scenario(
+    regression_scenario: RegressionScenario, repeats: int = 3, objects_only: bool = False
+) -> Dict[str, Any]:
+    """Measure a scenario, generating it once for the object counts only if `objects_only` is set."""
+    counts: Dict[str, int] = {}
+    if objects_only:
+        _generate(regression_scenario, counts)
+        return {"objects": counts}
+    seconds = min(_generate(regression_scenario, counts if i == 0 else None) for i in range(repeats))
+    return {
+        "seconds": seconds,
+        "peak_memory_bytes": _peak_memory_bytes(regression_scenario),
+        "objects": counts,
+    }
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Any],
+    time_tolerance: float = DEFAULT_TIME_TOLERANCE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE,
+) -> List[str]:
+    """Compare measured results with the baseline, returning a description of each regression.
+
+    Times and peak memory regress when they're more than the tolerance (a fraction of the baseline value) above the
+    baseline, and are skipped if either the results or the baseline don't have them, see `find_unchecked_metrics`.
+    Object counts regress when they differ from the baseline at all.
+    """
+    regressions: List[str] = []
+    for name, result in results.items():
+        expected = baseline["scenarios"].get(name)
+        if expected is None:
+            regressions.append(f"{name}: not in the baseline.")
+            continue
+        for metric, tolerance in (("seconds", time_tolerance), ("peak_memory_bytes", memory_tolerance)):
+            if metric not in expected or metric not in result:
+                continue
+            limit = expected[metric] * (1 + tolerance)
+            if result[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} is {result[metric]:.6g}, more than {tolerance:.0%} above the baseline of "
+                    f"{expected[metric]:.6g}."
+                )
+        for kind in sorted(set(expected["objects"]) | set(result["objects"])):
+            expected_count = expected["objects"].get(kind)
+            count = result["objects"].get(kind)
+            if count != expected_count:
+                regressions.append(f"{name}: {count} {kind}, the baseline has {expected_count}.")
+    return regressions
+
+
+def find_unchecked_metrics(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any]) -> List[str]:
+    """Describe each measured time or peak memory compare_to_baseline skipped, since the baseline doesn't have it."""
+    unchecked: List[str] = []
+    for name, result in results.items():
+        expected = baseline["scenarios"].get(name, {})
+        for metric in ("seconds", "peak_memory_bytes"):
+            if metric in result and metric not in expected:
+                unchecked.append(f"{name}: {metric} is not in the baseline, so it wasn't compared.")
+    return unchecked
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, Any]:
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON file to compare against.")
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=sorted(REGRESSION_SCENARIOS),
+        default=sorted(REGRESSION_SCENARIOS),
+        help="Scenarios to measure.",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Times to generate each scenario, keeping the fastest.")
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=None,
+        help="Allowed slowdown as a fraction of the baseline. Defaults to the baseline's, or "
+        f"{DEFAULT_TIME_TOLERANCE}.",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=None,
+        help="Allowed peak memory increase as a fraction of the baseline. Defaults to the baseline's, or "
+        f"{DEFAULT_MEMORY_TOLERANCE}.",
+    )
+    parser.add_argument(
+        "--objects-only",
+        action="store_true",
+        help="Only compare object counts, which are exact, e.g. on machines too noisy to compare times.",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fail if a measured time or peak memory is missing from the baseline, instead of only reporting it.",
+    )
+    parser.add_argument("--update", action="store_true", help="Write the results to the baseline instead of comparing.")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in args.scenarios:
+        print(f"Measuring {name}...", file=sys.stderr)
+        results[name] = measure_scenario(REGRESSION_SCENARIOS[name], args.repeats, args.objects_only)
+    json.dump(results, sys.stdout, indent=2)
+    print()
+
+    baseline = load_baseline(args.baseline) if os.path.exists(args.baseline) else {}
+    tolerances = baseline.get("tolerances", {})
+    time_tolerance = args.time_tolerance
+    if time_tolerance is None:
+        time_tolerance = tolerances.get("seconds", DEFAULT_TIME_TOLERANCE)
+    memory_tolerance = args.memory_tolerance
+    if memory_tolerance is None:
+        memory_tolerance = tolerances.get("peak_memory_bytes", DEFAULT_MEMORY_TOLERANCE)
+
+    if args.update:
+        scenarios = dict(baseline.get("scenarios", {}))
+        for name, result in results.items():
+            # Keeps the baseline's times and memory when only updating object counts.
+            scenarios[name] = {**scenarios.get(name, {}), **result}
+        new_baseline = dict(baseline)
+        if not args.objects_only:
+            new_baseline.update(python=platform.python_version(), platform=platform.platform())
+        new_baseline["tolerances"] = {"seconds": time_tolerance, "peak_memory_bytes": memory_tolerance}
+        new_baseline["scenarios"] = dict(sorted(scenarios.items()))
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(new_baseline, baseline_file, indent=2)
+            baseline_file.write("\n")
+        print(f"Wrote {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}, create one with --update.", file=sys.stderr)
+        return 1
+    if "python" in baseline and baseline["python"] != platform.python_version():
+        print(
+            f"Warning: the baseline was measured with Python {baseline.get('python')}, not "
+            f"{platform.python_version()}, so times and memory may not be comparable.",
+            file=sys.stderr,
+        )
+    regressions = compare_to_baseline(results, baseline, time_tolerance, memory_tolerance)
+    unchecked = find_unchecked_metrics(results, baseline)
+    if args.strict:
+        regressions += unchecked
+    else:
+        for message in unchecked:
+            print(f"Warning: {message} Measure a local baseline with --update --baseline <file>.", file=sys.stderr)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    print(f"{len(regressions)} regression(s) in {len(results)} scenario(s).", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
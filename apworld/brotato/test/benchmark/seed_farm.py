@@ -0,0 +1,200 @@
+"""Generate many Brotato seeds across a grid of options, and record how often and why generation fails.
+
+Each combination of the option values in the grid, number of players and seed is generated in a process pool, up to
+and including fill and progression balancing, and then checked to be beatable like Main.py does. The results are
+summarized for each combination of options as JSON: the number of runs and failures, the reasons for the failures,
+the seeds that failed so they can be reproduced, and the distribution of time spent per seed. Run from the root of an
+Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.seed_farm --seeds 100 --players 1 8 --output seed_farm.json
+
+The grid can be replaced or extended with --grid, giving the values to try for each option, e.g.:
+
+    python -m worlds.brotato.test.benchmark.seed_farm --grid waves_per_drop=1,5 num_legendary_crate_drops=0,50
+
+Use --exclude-legendary-crates to make every legendary crate drop an EXCLUDED location, even for players without enough
+filler to fill them, see Regions.legendary_crates_excluded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from BaseClasses import LocationProgressType, MultiWorld
+
+from . import WORLD_STEPS, generation_stages, setup_multiworld
+
+DEFAULT_GRID: Dict[str, List[Any]] = {
+    "waves_per_drop": [1, 2, 5, 10],
+    "num_common_crate_drops": [0, 25, 50],
+    "num_legendary_crate_drops": [0, 25, 50],
+    "num_common_upgrades": [0, 15],
+    "num_starting_shop_slots": [0, 4],
+}
+
+# The placement is final once these have run, the spoiler playthrough and output don't change it.
+_FARM_STAGES = (*WORLD_STEPS, "fill", "post_fill", "balancing")
+
+_MAX_REASON_LENGTH = 200
+
+
+def parse_grid_entry(value: str) -> Tuple[str, List[Any]]:
+    """Parse an "option=value1,value2" argument into the option name and the values to try for it."""
+    name, sep, option_values = value.partition("=")
+    if not sep or not option_values:
+        raise argparse.ArgumentTypeError(f"Expected option=value1,value2,..., got {value!r}.")
+    return name, [int(v) if v.lstrip("-").isdigit() else v for v in option_values.split(",")]
+
+
+def grid_cases(grid: Dict[str, List[Any]]) -> Iterator[Dict[str, Any]]:
+    """Get every combination of the option values in the grid."""
+    names = sorted(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def _exclude_legendary_crates(multiworld: MultiWorld) -> None:
+    for world in multiworld.worlds.values():
+        legendary_crate_names = world.location_name_groups["Legendary Crate Drops"]
+        for location in multiworld.get_locations(world.player):
+            if location.name in legendary_crate_names:
+                location.progress_type = LocationProgressType.EXCLUDED
+
+
+def _failure_reason(error: BaseException) -> str:
+    # Only the first line, since fill errors include the whole list of unplaced items and locations.
+    lines = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {lines[0] if lines else ''}"[:_MAX_REASON_LENGTH]
+
+
+def generate_seed(
+    options: Dict[str, Any], num_players: int, seed: int, exclude_legendary_crates: bool = False
+) -> Tuple[Optional[str], float]:
+    """Generate a single multiworld, returning the reason it failed (or None) and how long it took."""
+    start = time.perf_counter()
+    try:
+        multiworld = setup_multiworld(num_players, options, seed)
+        stages = generation_stages(multiworld)
+        for name in _FARM_STAGES:
+            # There's no balancing with a single player.
+            if name in stages:
+                stages[name]()
+            if name == "create_regions" and exclude_legendary_crates:
+                _exclude_legendary_crates(multiworld)
+        if not multiworld.can_beat_game():
+            return "Game appears as unbeatable.", time.perf_counter() - start
+    except Exception as error:
+        return _failure_reason(error), time.perf_counter() - start
+    return None, time.perf_counter() - start
+
+
+def _seconds_summary(seconds: List[float]) -> Dict[str, float]:
+    seconds = sorted(seconds)
+    summary = {"mean": statistics.mean(seconds)}
+    for percentile in (50, 90, 99):
+        summary[f"p{percentile}"] = seconds[min(len(seconds) - 1, len(seconds) * percentile // 100)]
+    summary["max"] = seconds[-1]
+    return summary
+
+
+def summarize_case(
+    options: Dict[str, Any], num_players: int, results: Sequence[Tuple[int, Optional[str], float]]
+) -> Dict[str, Any]:
+    """Summarize the (seed, failure reason, seconds) results of every seed generated with the same options."""
+    failures = [(seed, reason) for seed, reason, _ in results if reason is not None]
+    return {
+        "options": options,
+        "players": num_players,
+        "runs": len(results),
+        "failures": len(failures),
+        "failure_rate": len(failures) / len(results),
+        "failure_reasons": dict(Counter(reason for _, reason in failures).most_common()),
+        "failed_seeds": sorted(seed for seed, _ in failures),
+        "seconds": _seconds_summary([seconds for _, _, seconds in results]),
+    }
+
+
+def run_seed_farm(
+    grid: Dict[str, List[Any]],
+    player_counts: Sequence[int],
+    seeds: Sequence[int],
+    processes: Optional[int] = None,
+    exclude_legendary_crates: bool = False,
+) -> List[Dict[str, Any]]:
+    cases = [(options, num_players) for options in grid_cases(grid) for num_players in player_counts]
+    results: List[List[Tuple[int, Optional[str], float]]] = [[] for _ in cases]
+    with ProcessPoolExecutor(processes) as executor:
+        futures = {
+            executor.submit(generate_seed, options, num_players, seed, exclude_legendary_crates): (case_index, seed)
+            for case_index, (options, num_players) in enumerate(cases)
+            for seed in seeds
+        }
+        for num_done, future in enumerate(as_completed(futures), 1):
+            case_index, seed = futures[future]
+            reason, seconds = future.result()
+            results[case_index].append((seed, reason, seconds))
+            if num_done % 100 == 0 or num_done == len(futures):
+                print(f"Generated {num_done}/{len(futures)} seeds.", file=sys.stderr)
+    return [
+        summarize_case(options, num_players, case_results)
+        for (options, num_players), case_results in zip(cases, results)
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seeds", type=int, default=20, help="Number of seeds to generate for each case.")
+    parser.add_argument("--first-seed", type=int, default=1, help="Seed of the first generation in each case.")
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=[1, 4], help="Numbers of Brotato players to generate."
+    )
+    parser.add_argument(
+        "--grid",
+        nargs="+",
+        type=parse_grid_entry,
+        default=[],
+        metavar="OPTION=VALUES",
+        help="Option values to try, e.g. waves_per_drop=1,2,5. Replaces the default values for the same option.",
+    )
+    parser.add_argument("--only-grid", action="store_true", help="Only use the options given with --grid.")
+    parser.add_argument(
+        "--exclude-legendary-crates", action="store_true", help="Make every legendary crate drop EXCLUDED."
+    )
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Number of worker processes.")
+    parser.add_argument("--output", default=None, help="File to write the JSON results to. Prints to stdout if unset.")
+    args = parser.parse_args(argv)
+
+    grid = {} if args.only_grid else dict(DEFAULT_GRID)
+    grid.update(args.grid)
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+
+    start = time.perf_counter()
+    cases = run_seed_farm(grid, args.players, seeds, args.processes, args.exclude_legendary_crates)
+    report = {
+        "grid": grid,
+        "players": args.players,
+        "seeds": [seeds.start, seeds.stop - 1],
+        "exclude_legendary_crates": args.exclude_legendary_crates,
+        "runs": sum(case["runs"] for case in cases),
+        "failures": sum(case["failures"] for case in cases),
+        "wall_seconds": time.perf_counter() - start,
+        "cases": cases,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measure how long it takes to sweep a multiworld of Brotato players.
+
+Sweeping (collecting every reachable item until nothing new is reachable) is what fill and the spoiler playthrough
+spend most of their time doing, and evaluating the Brotato entrance and completion rules is most of the work in a
+Brotato-only multiworld. Use --legacy-rules to swap in the item count based rules for comparison, and --flat-regions
+to use the region layout from Regions.create_flat_regions. Run from the root of an Archipelago installation:
+
+    python -m worlds.brotato.test.benchmark.sweep --players 100
+    python -m worlds.brotato.test.benchmark.sweep --players 100 --legacy-rules
+    python -m worlds.brotato.test.benchmark.sweep --players 100 --flat-regions
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from BaseClasses import CollectionState, MultiWorld
+from worlds.AutoWorld import call_all
+
+from ...Constants import CHARACTERS
+from ...Items import ItemName
+from . import SCENARIOS, WORLD_STEPS, setup_multiworld
+
+
+def use_legacy_rules(multiworld: MultiWorld) -> None:
+    """Replace the Brotato entrance and completion rules with rules that use CollectionState.has."""
+    for player in multiworld.player_ids:
+        entrance_rules: Dict[str, Callable[[CollectionState], bool]] = {}
+        for character in CHARACTERS:
+            rule = _legacy_character_rule(player, character)
+            entrance_rules[f"Start Game ({character})"] = rule
+            entrance_rules[f"Exit drop crates for {character}"] = rule
+        # Not every entrance exists with the flat region layout.
+        for region in multiworld.get_regions(player):
+            for entrance in region.exits:
+                if entrance.name in entrance_rules:
+                    entrance.access_rule = entrance_rules[entrance.name]
+
+        num_required_victories = multiworld.worlds[player].options.num_victories.value
+        multiworld.completion_condition[player] = _legacy_completion_condition(player, num_required_victories)
+
+
+def _legacy_character_rule(player: int, character: str) -> Callable[[CollectionState], bool]:
+    return lambda state: state.has(character, player)
+
+
+def _legacy_completion_condition(player: int, num_required_victories: int) -> Callable[[CollectionState], bool]:
+    return lambda state: state.has(ItemName.RUN_COMPLETE.value, player, count=num_required_victories)
+
+
+def _time_repeated(func: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    times: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min_seconds": min(times), "median_seconds": statistics.median(times), "max_seconds": max(times)}
+
+
+def benchmark_sweep(
+    scenario: str,
+    num_players: int,
+    repeats: int,
+    legacy_rules: bool = False,
+    seed: Optional[int] = None,
+    flat_regions: bool = False,
+) -> Dict[str, Any]:
+    multiworld = setup_multiworld(num_players, {**SCENARIOS[scenario], "flat_regions": flat_regions}, seed)
+    for step in WORLD_STEPS:
+        call_all(multiworld, step)
+    if legacy_rules:
+        use_legacy_rules(multiworld)
+
+    def sweep_from_start() -> None:
+        state = CollectionState(multiworld)
+        state.sweep_for_events()
+
+    return {
+        "scenario": scenario,
+        "players": num_players,
+        "seed": multiworld.seed,
+        "legacy_rules": legacy_rules,
+        "flat_regions": flat_regions,
+        "entrances": sum(len(region.exits) for region in multiworld.get_regions()),
+        "sweep_for_events": _time_repeated(sweep_from_start, repeats),
+        "get_all_state": _time_repeated(lambda: multiworld.get_all_state(False), repeats),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=100, help="Number of Brotato players.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="default", help="Option set to use.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of times to repeat each measurement.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed to use for the multiworld. Random if unset.")
+    parser.add_argument(
+        "--legacy-rules", action="store_true", help="Use CollectionState.has in rules instead of the Brotato bitmask."
+    )
+    parser.add_argument(
+        "--flat-regions", action="store_true", help="Use the region layout from Regions.create_flat_regions."
+    )
+    args = parser.parse_args(argv)
+
+    result = benchmark_sweep(args.scenario, args.players, args.repeats, args.legacy_rules, args.seed, args.flat_regions)
+    json.dump(result, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
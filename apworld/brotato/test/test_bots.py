@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, List
+from unittest import IsolatedAsyncioTestCase
+
+import websockets
+
+from ..Constants import CHARACTERS, DEFAULT_CHARACTERS
+from ..Items import item_name_to_id
+from ..IdLayout import get_id_layout
+from ..Locations import LocationKind, decode_location_id
+from .benchmark.bots import CLIENT_GOAL_STATUS, LatencyStats, run_bots
+
+_SLOT_DATA = {
+    "waves_with_checks": [5, 10, 15, 20],
+    "num_wins_needed": 2,
+    "num_consumables": 10,
+    "num_starting_shop_slots": 4,
+    "num_legendary_consumables": 5,
+    "id_layout": get_id_layout(item_name_to_id),
+}
+
+
+class TestBrotatoBots(IsolatedAsyncioTestCase):
+    async def test_bots_reach_goal(self):
+        checked_locations: Dict[str, List[int]] = {}
+        goal_statuses: List[str] = []
+        data_storage: Dict[str, int] = {}
+
+        async def stand_in_server(websocket: Any, path=None):
+            """Gives every slot the default characters, and supports the data storage commands the bots use."""
+            items = [item_name_to_id[character] for character in DEFAULT_CHARACTERS]
+            await websocket.send(json.dumps([{"cmd": "RoomInfo"}]))
+            async for message in websocket:
+                for command in json.loads(message):
+                    replies: List[Dict[str, Any]] = []
+                    if command["cmd"] == "GetDataPackage":
+                        replies.append({"cmd": "DataPackage", "data": {"games": {}}})
+                    elif command["cmd"] == "Connect":
+                        name = command["name"]
+                        checked_locations[name] = []
+                        slot = int(name[len("Player") :])
+                        connected = {"cmd": "Connected", "team": 0, "slot": slot, "slot_data": _SLOT_DATA}
+                        replies.append({**connected, "checked_locations": []})
+                        replies.append({"cmd": "ReceivedItems", "index": 0, "items": [{"item": i} for i in items]})
+                    elif command["cmd"] == "Sync":
+                        replies.append({"cmd": "ReceivedItems", "index": 0, "items": [{"item": i} for i in items]})
+                    elif command["cmd"] == "LocationChecks":
+                        checked_locations[name] += command["locations"]
+                        replies.append({"cmd": "RoomUpdate", "checked_locations": command["locations"]})
+                    elif command["cmd"] == "Get":
+                        replies.append({"cmd": "Retrieved", "keys": {k: data_storage.get(k) for k in command["keys"]}})
+                    elif command["cmd"] == "Set":
+                        value = data_storage.get(command["key"], command["default"])
+                        for operation in command["operations"]:
+                            assert operation["operation"] == "or"
+                            value |= operation["value"]
+                        data_storage[command["key"]] = value
+                    elif command["cmd"] == "StatusUpdate" and command["status"] == CLIENT_GOAL_STATUS:
+                        goal_statuses.append(name)
+                    if replies and websocket.open:
+                        await websocket.send(json.dumps(replies))
+
+        async with websockets.serve(stand_in_server, "localhost", 0, ping_interval=None) as server:
+            url = f"ws://localhost:{server.sockets[0].getsockname()[1]}"
+            slot_names = [f"Player{i}" for i in range(1, 6)]
+            stats = LatencyStats()
+            result = await run_bots(url, slot_names, stats, wave_seconds=0, death_chance=0)
+
+        assert result["errors"] == []
+        assert result["goals_completed"] == len(slot_names)
+        assert sorted(goal_statuses) == slot_names
+        for slot, name in enumerate(slot_names, start=1):
+            # Each bot wins runs with different characters, checking every wave with a check in each, and records the
+            # characters it won with in data storage.
+            locations = [decode_location_id(location_id) for location_id in checked_locations[name]]
+            assert len(set(checked_locations[name])) == len(checked_locations[name])
+            run_wins = data_storage[f"Brotato_RunWins_0_{slot}"]
+            run_won_characters = {character for i, character in enumerate(CHARACTERS) if run_wins & (1 << i)}
+            assert len(run_won_characters) == _SLOT_DATA["num_wins_needed"]
+            assert run_won_characters <= set(DEFAULT_CHARACTERS)
+            num_wave_checks = sum(loc.kind is LocationKind.WAVE_COMPLETE for loc in locations)
+            assert num_wave_checks >= len(run_won_characters) * len(_SLOT_DATA["waves_with_checks"])
+
+        latency = result["latency"]
+        # The slot data has the ID layout, so the bots don't need the data package.
+        assert "GetDataPackage" not in latency
+        for cmd in ("Connect", "Sync", "LocationChecks", "Get"):
+            # Bots stop once they reach their goal, possibly before the reply to their last command.
+            assert 0 < latency[cmd]["replies"] <= latency[cmd]["sent"]
+            assert latency[cmd]["p50_ms"] <= latency[cmd]["p99_ms"]
+        assert latency["StatusUpdate"]["sent"] == len(slot_names)
+        # One Set for each character a bot won a run with.
+        assert latency["Set"]["sent"] == len(slot_names) * _SLOT_DATA["num_wins_needed"]
+
+    async def test_bots_fail_when_connection_fails(self):
+        async def closing_server(websocket: Any, path=None):
+            await websocket.send(json.dumps([{"cmd": "RoomInfo"}]))
+            await websocket.recv()
+            # Close the connection before replying to Connect.
+
+        async def silent_server(websocket: Any, path=None):
+            await websocket.send(json.dumps([{"cmd": "RoomInfo"}]))
+            async for _ in websocket:
+                pass
+
+        for server_handler, error_type in ((closing_server, ConnectionError), (silent_server, asyncio.TimeoutError)):
+            async with websockets.serve(server_handler, "localhost", 0, ping_interval=None) as server:
+                url = f"ws://localhost:{server.sockets[0].getsockname()[1]}"
+                result = await asyncio.wait_for(
+                    run_bots(url, ["Player1", "Player2"], LatencyStats(), connect_timeout=0.5), timeout=10
+                )
+            assert len(result["errors"]) == 2, result["errors"]
+            assert all(error_type.__name__ in error for error in result["errors"]), result["errors"]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, List
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import websockets
+
+from ..ChunkingProxy import ChunkingProxy, split_message, split_received_items
+
+_MAX_MESSAGE_BYTES = 1024
+
+
+def _received_items(num_items: int, index: int = 0) -> Dict[str, Any]:
+    return {
+        "cmd": "ReceivedItems",
+        "index": index,
+        "items": [
+            {"item": 0xF4E0_0000 + i % 65, "location": 0xF4E0_0000 + i, "player": 1, "flags": 1, "class": "NetworkItem"}
+            for i in range(num_items)
+        ],
+    }
+
+
+def _print_json(num: int) -> Dict[str, Any]:
+    return {"cmd": "PrintJSON", "type": "ItemSend", "data": [{"text": f"Player sent item {num}"}]}
+
+
+def _received_item_commands(messages: List[str]) -> List[Dict[str, Any]]:
+    return [command for message in messages for command in json.loads(message) if command["cmd"] == "ReceivedItems"]
+
+
+class TestBrotatoSplitMessage(TestCase):
+    def test_small_message_unchanged(self):
+        commands = [{"cmd": "RoomUpdate", "hint_points": 1}, _received_items(2)]
+        messages = split_message(commands, _MAX_MESSAGE_BYTES)
+        assert len(messages) == 1
+        assert json.loads(messages[0]) == commands
+
+    def test_received_items_split_into_contiguous_chunks(self):
+        command = _received_items(100, index=7)
+        messages = split_message([command], _MAX_MESSAGE_BYTES)
+
+        assert len(messages) > 1
+        assert all(len(message.encode("utf-8")) <= _MAX_MESSAGE_BYTES for message in messages)
+        chunks = _received_item_commands(messages)
+        expected_index = 7
+        for chunk in chunks:
+            assert chunk["index"] == expected_index
+            expected_index += len(chunk["items"])
+        assert [item for chunk in chunks for item in chunk["items"]] == command["items"]
+
+    def test_many_commands_split_in_order(self):
+        commands = [{"cmd": "Connected", "slot": 1}, _received_items(50), *(_print_json(i) for i in range(200))]
+        messages = split_message(commands, _MAX_MESSAGE_BYTES)
+
+        assert all(len(message.encode("utf-8")) <= _MAX_MESSAGE_BYTES for message in messages)
+        unpacked = [command for message in messages for command in json.loads(message)]
+        assert unpacked[0] == commands[0]
+        assert [c for c in unpacked if c["cmd"] == "PrintJSON"] == commands[2:]
+        assert [item for chunk in _received_item_commands(messages) for item in chunk["items"]] == commands[1]["items"]
+
+    def test_single_item_larger_than_budget(self):
+        command = _received_items(3)
+        chunks = split_received_items(command, 10)
+        assert [chunk["items"] for chunk in chunks] == [[item] for item in command["items"]]
+        assert [chunk["index"] for chunk in chunks] == [0, 1, 2]
+
+
+class TestBrotatoChunkingProxy(IsolatedAsyncioTestCase):
+    async def _run_through_proxy(self, server_messages: List[str], client_message: str) -> List[str]:
+        """Send messages from a stand-in server to a client connected through the proxy."""
+        received_by_server: List[str] = []
+
+        async def stand_in_server(websocket, path=None):
+            received_by_server.append(await websocket.recv())
+            for message in server_messages:
+                await websocket.send(message)
+
+        async with websockets.serve(stand_in_server, "localhost", 0, ping_interval=None) as server:
+            server_port = server.sockets[0].getsockname()[1]
+            proxy = ChunkingProxy(f"ws://localhost:{server_port}", _MAX_MESSAGE_BYTES, chunk_interval=0.001)
+            async with proxy.serve("localhost", 0) as proxy_server:
+                proxy_port = proxy_server.sockets[0].getsockname()[1]
+                async with websockets.connect(f"ws://localhost:{proxy_port}", max_size=_MAX_MESSAGE_BYTES) as client:
+                    await client.send(client_message)
+                    received = []
+                    try:
+                        while True:
+                            received.append(await asyncio.wait_for(client.recv(), timeout=1))
+                    except websockets.ConnectionClosed:
+                        pass
+
+        assert received_by_server == [client_message]
+        self.stats = proxy.stats
+        return received
+
+    async def test_small_messages_pass_through(self):
+        server_messages = [json.dumps([_print_json(i)]) for i in range(10)]
+        received = await self._run_through_proxy(server_messages, json.dumps([{"cmd": "Sync"}]))
+        assert received == server_messages
+        assert self.stats.split_messages == 0
+        # Messages which aren't split still count towards the time spent processing.
+        assert self.stats.processing_seconds > 0
+
+    async def test_large_messages_split(self):
+        connect_reply = [{"cmd": "Connected", "slot": 1}, _received_items(200)]
+        server_messages = [json.dumps(connect_reply), json.dumps([_print_json(0)])]
+        received = await self._run_through_proxy(server_messages, json.dumps([{"cmd": "Connect"}]))
+
+        assert all(len(message.encode("utf-8")) <= _MAX_MESSAGE_BYTES for message in received)
+        commands = [command for message in received for command in json.loads(message)]
+        assert commands[0] == connect_reply[0]
+        assert commands[-1] == _print_json(0)
+        assert [item for chunk in _received_item_commands(received) for item in chunk["items"]] == (
+            connect_reply[1]["items"]
+        )
+        assert self.stats.split_messages == 1
+        assert self.stats.client_messages == len(received)
+        assert self.stats.oversized_client_messages == 0
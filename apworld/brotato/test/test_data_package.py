@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from .. import BrotatoWorld
+from ..DataPackage import build_id_manifest, load_id_manifest
+from ..Items import item_name_to_id
+from ..Locations import location_name_to_id
+
+_REBUILD_MESSAGE = "Rebuild it with `python -m worlds.brotato.DataPackage`."
+
+
+class TestBrotatoDataPackage(TestCase):
+    def test_existing_ids_unchanged(self):
+        manifest = load_id_manifest()
+        for kind, name_to_id in (
+            ("items", BrotatoWorld.item_name_to_id),
+            ("locations", BrotatoWorld.location_name_to_id),
+        ):
+            for name, manifest_id in manifest[kind].items():
+                assert name in name_to_id, f"{name} was removed, it should be retired instead. {_REBUILD_MESSAGE}"
+                assert name_to_id[name] == manifest_id, f"ID of {name} changed from {manifest_id}."
+            for name, retired_id in manifest[f"retired_{kind}"].items():
+                assert name not in name_to_id, f"{name} was retired and can't be added back."
+                assert retired_id not in name_to_id.values(), f"Retired ID {retired_id} of {name} was reused."
+
+    def test_id_manifest_up_to_date(self):
+        manifest = load_id_manifest()
+        assert manifest == build_id_manifest(manifest), f"The ID manifest is out of date. {_REBUILD_MESSAGE}"
+
+    def test_id_manifest_retires_removed_ids(self):
+        manifest = {
+            "items": {**item_name_to_id, "Removed Item": 1},
+            "locations": dict(location_name_to_id),
+            "retired_items": {},
+            "retired_locations": {"Removed Location": 2},
+        }
+        new_manifest = build_id_manifest(manifest)
+        assert new_manifest["items"] == item_name_to_id
+        assert new_manifest["retired_items"] == {"Removed Item": 1}
+        assert new_manifest["retired_locations"] == {"Removed Location": 2}
+
+    def test_id_manifest_rejects_changed_ids(self):
+        changed_name, changed_id = next(iter(item_name_to_id.items()))
+        with self.assertRaises(ValueError):
+            build_id_manifest({"items": {changed_name: changed_id + 1000}})
+        with self.assertRaises(ValueError):
+            build_id_manifest({"retired_items": {"Removed Item": changed_id}})
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+from BaseClasses import ItemClassification
+
+from . import BrotatoTestBase
+from ..Constants import DEFAULT_CHARACTERS, MAX_COMMON_UPGRADES
+from ..Feasibility import check_options, check_weighted_options, check_yaml_file, count_slot, options_from_values
+
+# One location for each character, and one item for each character besides the starting ones.
+_FEW_LOCATIONS_OPTIONS = {
+    "waves_per_drop": 20,
+    "num_common_crate_drops": 0,
+    "num_legendary_crate_drops": 0,
+    "num_common_upgrades": 0,
+    "num_uncommon_upgrades": 0,
+    "num_rare_upgrades": 0,
+    "num_legendary_upgrades": 0,
+}
+_TOO_MANY_ITEMS_OPTIONS = {**_FEW_LOCATIONS_OPTIONS, "num_common_upgrades": MAX_COMMON_UPGRADES}
+
+
+class TestBrotatoFeasibility(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def _run(self, **options):
+        """Check the counts from count_slot match the world generated with the same options."""
+        self.options = options
+        self.world_setup()
+        counts = count_slot(options_from_values(options))
+
+        locations = [loc for loc in self.multiworld.get_locations(self.player) if loc.item is None]
+        itempool = [item for item in self.multiworld.itempool if item.player == self.player]
+        assert counts.num_locations == len(locations)
+        assert counts.num_items == sum(1 for item in itempool if item.classification != ItemClassification.filler)
+        assert counts.num_filler_items == len(itempool) - counts.num_items
+
+    def test_counts_default_options(self):
+        self._run()
+
+    def test_counts_random_characters(self):
+        self._run(starting_characters=1, num_starting_characters=12, waves_per_drop=3)
+
+    def test_counts_many_items(self):
+        self._run(
+            waves_per_drop=1,
+            num_common_crate_drops=50,
+            num_legendary_crate_drops=50,
+            num_common_upgrades=50,
+            num_uncommon_upgrades=50,
+            num_rare_upgrades=50,
+            num_legendary_upgrades=50,
+            num_starting_shop_slots=0,
+        )
+
+    def test_counts_bundled_filler(self):
+        self._run(waves_per_drop=2, num_common_crate_drops=20, filler_bundle_size=10)
+        assert count_slot(options_from_values(self.options)).num_removed_wave_checks > 0
+
+    def test_counts_no_filler(self):
+        # Exactly as many items as locations.
+        options = {**_FEW_LOCATIONS_OPTIONS, "num_common_upgrades": len(DEFAULT_CHARACTERS)}
+        self._run(**options)
+        assert count_slot(options_from_values(options)).num_filler_items == 0
+
+    def test_default_options_feasible(self):
+        verdict = check_options(options_from_values({}))
+        assert verdict.feasible
+        assert verdict.errors == ()
+
+    def test_too_many_items(self):
+        verdict = check_options(options_from_values(_TOO_MANY_ITEMS_OPTIONS))
+        assert not verdict.feasible
+        assert verdict.counts.num_filler_items < 0
+
+    def test_message_size_warning(self):
+        options = options_from_values(
+            {"waves_per_drop": 1, "num_common_crate_drops": 50, "num_legendary_crate_drops": 50}
+        )
+        verdict = check_options(options, num_players=1000)
+        assert verdict.feasible
+        assert verdict.warnings
+
+    def test_weighted_options(self):
+        result = check_weighted_options("test.yaml", "Player", {**_FEW_LOCATIONS_OPTIONS, "num_common_upgrades": 5})
+        assert result.status == "OK"
+        assert result.num_rolls == 1
+
+        weighted_options = {**_FEW_LOCATIONS_OPTIONS, "num_common_upgrades": {0: 10, MAX_COMMON_UPGRADES: 1}}
+        result = check_weighted_options("test.yaml", "Player", weighted_options)
+        assert result.status == "CAN FAIL"
+        assert result.num_rolls == 2
+        assert [values["num_common_upgrades"] for values, _ in result.failing_rolls] == [MAX_COMMON_UPGRADES]
+
+        result = check_weighted_options("test.yaml", "Player", {**_TOO_MANY_ITEMS_OPTIONS, "waves_per_drop": "random"})
+        assert result.status == "CAN FAIL"
+        assert {values["waves_per_drop"] for values, _ in result.failing_rolls} == {20}
+
+        result = check_weighted_options("test.yaml", "Player", _TOO_MANY_ITEMS_OPTIONS)
+        assert result.status == "FAILS"
+
+    def test_yaml_file(self):
+        yaml = (
+            "name: Potato\n"
+            "game: Brotato\n"
+            "Brotato:\n"
+            "  waves_per_drop: 20\n"
+            "  num_common_crate_drops: 0\n"
+            "  num_legendary_crate_drops: 0\n"
+            "  num_common_upgrades: random-range-0-50\n"
+            "  num_uncommon_upgrades: 0\n"
+            "  num_rare_upgrades: 0\n"
+            "  num_legendary_upgrades: 0\n"
+            "---\n"
+            "name: Other\n"
+            "game: Other Game\n"
+        )
+        with tempfile.TemporaryDirectory() as yaml_dir:
+            path = os.path.join(yaml_dir, "players.yaml")
+            with open(path, "w", encoding="utf-8") as yaml_file:
+                yaml_file.write(yaml)
+            results = check_yaml_file(path)
+
+        assert [result.name for result in results] == ["Potato"]
+        assert results[0].status == "CAN FAIL"
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from BaseClasses import Item, LocationProgressType
+
+from NetUtils import NetworkItem
+
+from . import BrotatoTestBase
+from .benchmark import WORLD_STEPS, generation_stages, setup_multiworld
+from ..Constants import CHARACTERS
+from ..Feasibility import count_slot
+from ..Items import bundled_filler_item, filler_items, gold_item_amounts, xp_item_amounts
+from ..Locations import LocationKind, encode_location_id
+from ..Options import FillerBundleSize
+from ..PayloadSize import _WORST_CASE_LOCATION_ID, _message_size, _received_items_command
+from ..Reachability import location_in_logic
+from ..Regions import legendary_crates_excluded
+
+# Few locations besides the legendary crate drops, so bundling leaves less filler than there are legendary crates.
+_FEW_FILLER_OPTIONS: Dict[str, Any] = {
+    "waves_per_drop": 5,
+    "num_common_crate_drops": 0,
+    "num_legendary_crate_drops": 50,
+    "num_common_upgrades": 0,
+    "num_uncommon_upgrades": 0,
+    "num_rare_upgrades": 0,
+    "num_legendary_upgrades": 0,
+}
+
+
+def _network_item(item: Item) -> NetworkItem:
+    # Where the item was found doesn't matter, so use the same location and player for every item.
+    return NetworkItem(item.code, _WORST_CASE_LOCATION_ID, 2, 0)
+
+
+class TestBrotatoBundleFiller(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def test_every_filler_item_has_bundles(self):
+        for name in filler_items:
+            amounts = gold_item_amounts if name in gold_item_amounts else xp_item_amounts
+            for bundle_size in FillerBundleSize.options.values():
+                assert amounts[bundled_filler_item(name, bundle_size)] == amounts[name] * bundle_size
+
+    def _generate(self, filler_bundle_size: str, **options: Any) -> None:
+        """Generate up to pre_fill."""
+        self.options = {
+            "filler_bundle_size": filler_bundle_size,
+            "waves_per_drop": 1,
+            "num_common_crate_drops": 50,
+            "num_legendary_crate_drops": 10,
+            **options,
+        }
+        self.world_setup(1234)
+
+    def _received_items(self) -> List[Item]:
+        """Get every item the player receives from the server, such as after a release or collect.
+
+        These are the player's items with an ID, placed or not. Events have no ID, so they're never sent.
+        """
+        items = [item for item in self.multiworld.itempool if item.player == self.player]
+        items += [loc.item for loc in self.multiworld.get_locations(self.player) if loc.item is not None]
+        items += self.multiworld.precollected_items[self.player]
+        return [item for item in items if item.code is not None]
+
+    def test_fewer_received_items(self):
+        self._generate("off")
+        unbundled_items = self._received_items()
+        num_unbundled_locations = len(self.multiworld.get_unfilled_locations(self.player))
+        self._generate("ten")
+        bundled_items = self._received_items()
+        num_bundled_locations = len(self.multiworld.get_unfilled_locations(self.player))
+
+        num_saved = len(unbundled_items) - len(bundled_items)
+        assert num_saved > len(unbundled_items) // 2
+        # One location removed for each item saved, so the item pool still matches the locations.
+        assert num_unbundled_locations - num_bundled_locations == num_saved
+        assert count_slot(self.world.options).num_removed_wave_checks == num_saved
+        # The ReceivedItems message sent after a release or collect shrinks to match.
+        unbundled_size = _message_size(_received_items_command([_network_item(item) for item in unbundled_items]))
+        bundled_size = _message_size(_received_items_command([_network_item(item) for item in bundled_items]))
+        assert bundled_size < unbundled_size * 2 // 3
+
+    def test_removes_highest_waves(self):
+        self._generate("five", starting_characters=1, num_starting_characters=10)
+        slot_data = self.world.fill_slot_data()
+        removed_wave_checks = slot_data["removed_wave_checks"]
+        assert sum(len(waves) for waves in removed_wave_checks.values()) == (
+            count_slot(self.world.options).num_removed_wave_checks
+        )
+        starting_characters = self.world._starting_characters
+        # Characters the player doesn't start with are used first, and there are enough of them here.
+        assert not set(removed_wave_checks) & set(starting_characters)
+        num_removed = [len(removed_wave_checks.get(char, ())) for char in CHARACTERS if char not in starting_characters]
+        assert max(num_removed) - min(num_removed) <= 1
+
+        location_ids = {loc.address for loc in self.multiworld.get_locations(self.player)}
+        all_item_ids = set(self.world.item_name_to_id.values())
+        waves_with_checks = slot_data["waves_with_checks"]
+        for character in CHARACTERS:
+            removed_waves = removed_wave_checks.get(character, [])
+            assert removed_waves == waves_with_checks[len(waves_with_checks) - len(removed_waves) :]
+            for wave in waves_with_checks:
+                location_id = encode_location_id(LocationKind.WAVE_COMPLETE, character, wave)
+                assert (location_id in location_ids) == (wave not in removed_waves), (character, wave)
+                if wave in removed_waves:
+                    assert not location_in_logic(slot_data["logic"], location_id, all_item_ids), (character, wave)
+
+    def test_fills_with_few_filler_items(self):
+        for filler_bundle_size in ("five", "ten"):
+            with self.subTest(filler_bundle_size=filler_bundle_size):
+                options = {**_FEW_FILLER_OPTIONS, "filler_bundle_size": filler_bundle_size}
+                multiworld = setup_multiworld(1, options, seed=1)
+                stages = generation_stages(multiworld)
+                for name in (*WORLD_STEPS, "fill"):
+                    stages[name]()
+                player = multiworld.player_ids[0]
+                world = multiworld.worlds[player]
+                # Too little filler left after bundling to exclude every legendary crate drop.
+                assert count_slot(world.options).num_filler_items < options["num_legendary_crate_drops"]
+                assert not legendary_crates_excluded(world.options)
+                assert not any(
+                    loc.progress_type == LocationProgressType.EXCLUDED for loc in multiworld.get_locations(player)
+                )
+                assert not multiworld.get_unfilled_locations(player)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+from . import BrotatoTestBase
+from ..Constants import (
+    CRATE_DROP_LOCATION_TEMPLATE,
+    LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE,
+    NUM_WAVES,
+    WAVE_COMPLETE_LOCATION_TEMPLATE,
+)
+from ..Items import get_item_table
+
+# Slot data is sent on every connect, so keep it well below the size of the data package it replaces.
+_MAX_SLOT_DATA_BYTES = 4 * 1024
+
+
+def _location_name_to_id(id_layout: Dict[str, Any], slot_data: Dict[str, Any]) -> Dict[str, int]:
+    """Compute location IDs from the ID layout the same way the client does, see data_package.gd."""
+    location_name_to_id = {}
+    for char_index, char in enumerate(id_layout["characters"]):
+        char_offset = char_index * id_layout["character_stride"]
+        for wave in range(1, NUM_WAVES + 1):
+            location_name_to_id[WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=wave, char=char)] = (
+                id_layout["wave_complete_base_id"] + char_offset + wave - 1
+            )
+    for num in range(1, slot_data["num_consumables"] + 1):
+        location_name_to_id[CRATE_DROP_LOCATION_TEMPLATE.format(num=num)] = id_layout["crate_drop_base_id"] + num - 1
+    for num in range(1, slot_data["num_legendary_consumables"] + 1):
+        location_name_to_id[LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE.format(num=num)] = (
+            id_layout["legendary_crate_drop_base_id"] + num - 1
+        )
+    return location_name_to_id
+
+
+class TestBrotatoIdLayout(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def _slot_data(self, **options) -> Dict[str, Any]:
+        self.options = options
+        # Tests with the same options only read the multiworld, so they share it.
+        self.cached_world_setup()
+        # Round trip through JSON so the test sees what the client receives.
+        return json.loads(json.dumps(self.world.fill_slot_data()))
+
+    def test_layout_matches_location_ids(self):
+        slot_data = self._slot_data(waves_per_drop=1, num_common_crate_drops=50, num_legendary_crate_drops=50)
+        location_name_to_id = _location_name_to_id(slot_data["id_layout"], slot_data)
+        for location in self.multiworld.get_locations(self.player):
+            if location.address is not None:
+                assert location_name_to_id[location.name] == location.address, location.name
+                assert self.world.location_name_to_id[location.name] == location.address, location.name
+
+    def test_layout_matches_item_ids(self):
+        id_layout = self._slot_data()["id_layout"]
+        for name, item_id in self.world.item_name_to_id.items():
+            assert id_layout["items"][item_id - id_layout["item_base_id"]] == name
+        assert len([name for name in id_layout["items"] if name is not None]) == len(self.world.item_name_to_id)
+
+    def test_slot_data_is_small(self):
+        slot_data = self._slot_data(waves_per_drop=1, num_common_crate_drops=50, num_legendary_crate_drops=50)
+        slot_data_bytes = len(json.dumps(slot_data, separators=(",", ":")).encode("utf-8"))
+        assert slot_data_bytes <= _MAX_SLOT_DATA_BYTES
+        assert slot_data_bytes * 10 < self.world.estimate_message_sizes().data_package
+
+    def test_layout_matches_item_effects(self):
+        id_layout = self._slot_data()["id_layout"]
+        item_table = get_item_table()
+        for item_id, effect_entry in enumerate(id_layout["item_effects"], id_layout["item_base_id"]):
+            if effect_entry is None:
+                assert item_id not in item_table
+                continue
+            kind, amount, tier = effect_entry
+            effect = item_table[item_id].effect
+            assert id_layout["item_effect_kinds"][kind] == effect.kind.value
+            assert amount == effect.amount
+            assert (id_layout["item_tiers"][tier] if tier >= 0 else None) == (effect.tier and effect.tier.value)
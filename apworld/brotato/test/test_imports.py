@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+# Modules only the command line tools, benchmarks and the chunking proxy need. The world package is imported by every
+# process that loads worlds, including ones that only need the name-to-ID mappings, so importing it mustn't pull these
+# in. Checking what's imported instead of timing the import gives the same result on every machine.
+HEAVY_MODULES = (
+    "asyncio",
+    "concurrent.futures",
+    "multiprocessing",
+    "tracemalloc",
+    "websockets",
+    "zipfile",
+    "zlib",
+)
+
+_WORLD_PACKAGE = __package__.rsplit(".", 1)[0]
+# The directory containing "worlds", so the package can be imported in a new process.
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# Modules every process that loads worlds has already imported, so they're not counted.
+_PREIMPORTED_MODULES = ("logging", "BaseClasses", "NetUtils", "Options", "worlds.AutoWorld")
+
+
+def _modules_imported_by_world() -> set[str]:
+    """Import the world package in a new process, returning the modules it was the first to import."""
+    code = (
+        "import json, sys\n"
+        f"import {', '.join(_PREIMPORTED_MODULES)}\n"
+        "before = set(sys.modules)\n"
+        f"import {_WORLD_PACKAGE}\n"
+        "print(json.dumps(sorted(set(sys.modules) - before)))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=_ROOT_DIR, capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+class TestBrotatoImports(TestCase):
+    def test_import_skips_heavy_modules(self):
+        imported = _modules_imported_by_world()
+        assert _WORLD_PACKAGE in imported
+        heavy = sorted(
+            name
+            for name in imported
+            if any(name == module or name.startswith(f"{module}.") for module in HEAVY_MODULES)
+        )
+        assert not heavy, f"Importing {_WORLD_PACKAGE} imports {heavy}, import them where they're used instead."
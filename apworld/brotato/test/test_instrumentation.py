@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from unittest import mock
+
+from BaseClasses import CollectionState
+
+from . import BrotatoTestBase
+from .. import BrotatoWorld
+from ..Constants import CHARACTERS
+from ..Instrumentation import (
+    INSTRUMENTATION_FILE_ENV_VAR,
+    INSTRUMENTED_STAGES,
+    get_generation_stats,
+    instrument_world,
+    instrumented_stages,
+)
+
+
+class TestBrotatoInstrumentation(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+    options = {"waves_per_drop": 5, "num_common_crate_drops": 10, "num_legendary_crate_drops": 2}
+
+    def _instrumented(self):
+        return mock.patch.multiple(BrotatoWorld, **instrumented_stages(BrotatoWorld))
+
+    def _world_setup_instrumented(self):
+        with self._instrumented():
+            self.world_setup()
+
+    def test_disabled_by_default(self):
+        with mock.patch.dict(os.environ, clear=True):
+            instrument_world(BrotatoWorld)
+        for stage in INSTRUMENTED_STAGES:
+            assert not hasattr(getattr(BrotatoWorld, stage), "__wrapped__"), f"{stage} was instrumented"
+
+    def test_records_stages_and_counts(self):
+        self._world_setup_instrumented()
+        stats = get_generation_stats(self.multiworld)[self.player]
+
+        assert {"generate_early", "create_regions", "create_items", "set_rules"} <= set(stats.stage_seconds)
+        assert all(seconds >= 0 for seconds in stats.stage_seconds.values())
+
+        regions = list(self.multiworld.get_regions(self.player))
+        locations = self.multiworld.get_locations(self.player)
+        itempool = [item for item in self.multiworld.itempool if item.player == self.player]
+        assert stats.counts["regions"] == len(regions) == len(CHARACTERS) + 2
+        assert stats.counts["entrances"] == sum(len(region.exits) for region in regions)
+        assert stats.counts["locations"] == len(locations)
+        assert stats.counts["items"] == len(itempool) + len(self.multiworld.precollected_items[self.player])
+        assert 0 < stats.counts["filler_items"] < len(itempool)
+
+    def test_counts_rule_calls(self):
+        self._world_setup_instrumented()
+        stats = get_generation_stats(self.multiworld)[self.player]
+        assert not stats.rule_calls
+
+        state = CollectionState(self.multiworld)
+        assert not self.multiworld.completion_condition[self.player](state)
+        entrance = self.multiworld.get_entrance(f"Start Game ({CHARACTERS[0]})", self.player)
+        entrance.access_rule(state)
+        entrance.access_rule(state)
+        self.multiworld.get_entrance(f"Drop crates for {CHARACTERS[0]}", self.player).access_rule(state)
+
+        assert stats.rule_calls == {"goal": 1, "character_entrance": 2}
+
+    def test_emits_summary(self):
+        with tempfile.TemporaryDirectory() as summary_dir:
+            summary_path = os.path.join(summary_dir, "summary.json")
+            with self._instrumented(), mock.patch.dict(os.environ, {INSTRUMENTATION_FILE_ENV_VAR: summary_path}):
+                self.world_setup()
+                with self.assertLogs("Brotato") as logs:
+                    self.world.modify_multidata({})
+            with open(summary_path, encoding="utf-8") as summary_file:
+                summary = json.load(summary_file)
+
+        player_name = self.multiworld.get_player_name(self.player)
+        assert list(summary) == [player_name]
+        assert summary[player_name]["counts"]["locations"] == len(self.multiworld.get_locations(self.player))
+        assert "modify_multidata" in summary[player_name]["stage_seconds"]
+        assert any(player_name in message for message in logs.output)
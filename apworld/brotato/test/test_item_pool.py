@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+
+from . import BrotatoTestBase
+from ..Constants import CHARACTERS, DEFAULT_CHARACTERS, MAX_SHOP_SLOTS
+from ..Items import ItemEffectKind, ItemName, event_item_table, filler_items, get_item_table
+
+_WORLD_PACKAGE = __package__.rsplit(".", 1)[0]
+# The directory containing "worlds", so the package can be imported in a new process.
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+_ITEMPOOL_SCRIPT = f"""
+import json
+from {_WORLD_PACKAGE}.test.benchmark import generation_stages, setup_multiworld
+
+multiworld = setup_multiworld(1, {{"starting_characters": 1}}, 42)
+stages = generation_stages(multiworld)
+for step in ("generate_early", "create_regions", "create_items"):
+    stages[step]()
+print(json.dumps({{
+    "starting_characters": [item.name for item in multiworld.precollected_items[1]],
+    "itempool": [item.name for item in multiworld.itempool],
+}}))
+"""
+
+
+def _generate_itempool_in_new_process(hash_seed: str) -> dict[str, list[str]]:
+    """Create the items for a player with random starting characters, in a new process with the given hash seed."""
+    env = {**os.environ, "PYTHONHASHSEED": hash_seed}
+    result = subprocess.run(
+        [sys.executable, "-c", _ITEMPOOL_SCRIPT], cwd=_ROOT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+class TestBrotatoItemPool(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def _run(self, seed: int = 1234, **options) -> list[str]:
+        self.options = options
+        self.world_setup(seed)
+        itempool = [item for item in self.multiworld.itempool if item.player == self.player]
+        num_locations = len([loc for loc in self.multiworld.get_locations(self.player) if loc.item is None])
+        assert len(itempool) == num_locations
+        return [item.name for item in itempool]
+
+    def test_item_counts(self):
+        options = {
+            "num_common_crate_drops": 25,
+            "num_legendary_crate_drops": 5,
+            "num_common_upgrades": 10,
+            "num_uncommon_upgrades": 4,
+            "num_rare_upgrades": 3,
+            "num_legendary_upgrades": 2,
+            "num_starting_shop_slots": 2,
+        }
+        item_counts = Counter(self._run(**options))
+
+        for character in CHARACTERS:
+            assert item_counts[character] == int(character not in DEFAULT_CHARACTERS)
+        assert item_counts[ItemName.COMMON_ITEM.value] == 25
+        assert item_counts[ItemName.LEGENDARY_ITEM.value] == 5
+        assert item_counts[ItemName.COMMON_UPGRADE.value] == 10
+        assert item_counts[ItemName.UNCOMMON_UPGRADE.value] == 4
+        assert item_counts[ItemName.RARE_UPGRADE.value] == 3
+        assert item_counts[ItemName.LEGENDARY_UPGRADE.value] == 2
+        assert item_counts[ItemName.SHOP_SLOT.value] == MAX_SHOP_SLOTS - 2
+        assert set(item_counts) - set(filler_items) <= {
+            *CHARACTERS,
+            ItemName.COMMON_ITEM.value,
+            ItemName.LEGENDARY_ITEM.value,
+            ItemName.COMMON_UPGRADE.value,
+            ItemName.UNCOMMON_UPGRADE.value,
+            ItemName.RARE_UPGRADE.value,
+            ItemName.LEGENDARY_UPGRADE.value,
+            ItemName.SHOP_SLOT.value,
+        }
+
+    def test_same_seed_same_itempool(self):
+        # Sets of strings are iterated in a different order in each process, so generate in separate processes with
+        # different hash seeds to catch the pool depending on set order.
+        itempools = [_generate_itempool_in_new_process(hash_seed) for hash_seed in ("1", "2", "3")]
+        assert itempools[0] == itempools[1] == itempools[2]
+
+    def test_items_are_distinct(self):
+        # Each item in the pool is placed separately, so they can't share objects.
+        self.world_setup()
+        itempool = [item for item in self.multiworld.itempool if item.player == self.player]
+        assert len({id(item) for item in itempool}) == len(itempool)
+
+    def test_item_effects_match_names(self):
+        for item in [*get_item_table().values(), *event_item_table.values()]:
+            name, effect = item.name.value, item.effect
+            if effect.kind in (ItemEffectKind.ITEM, ItemEffectKind.UPGRADE):
+                assert name == f"{effect.tier.value} {effect.kind.value.capitalize()}"
+                continue
+            assert effect.tier is None, name
+            if effect.kind == ItemEffectKind.GOLD:
+                assert name == f"Gold ({effect.amount})"
+            elif effect.kind == ItemEffectKind.XP:
+                assert name == f"XP ({effect.amount})"
+            elif effect.kind == ItemEffectKind.CHARACTER:
+                assert name == CHARACTERS[effect.amount]
+            elif effect.kind == ItemEffectKind.SHOP_SLOT:
+                assert item.name == ItemName.SHOP_SLOT and effect.amount == 1
+            else:
+                assert effect.kind == ItemEffectKind.RUN_WON and item.name == ItemName.RUN_COMPLETE
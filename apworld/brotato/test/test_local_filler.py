@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from BaseClasses import CollectionState, Item, Location
+
+from . import BrotatoTestBase
+from ..Items import filler_items
+
+_filler_item_names = frozenset(filler_items)
+
+
+class TestBrotatoLocalFiller(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def _run(self, local_filler_percentage: int, **options) -> tuple[list[Location], list[Item]]:
+        """Generate up to pre_fill, returning the locations with local filler and the filler left in the item pool."""
+        self.options = {
+            "local_filler_percentage": local_filler_percentage,
+            "waves_per_drop": 2,
+            "num_common_crate_drops": 20,
+            "num_legendary_crate_drops": 10,
+            **options,
+        }
+        self.world_setup(1234)
+        filled_locations = [
+            loc for loc in self.multiworld.get_locations(self.player) if loc.item is not None and not loc.locked
+        ]
+        pool_filler = [
+            item for item in self.multiworld.itempool if item.player == self.player and item.name in _filler_item_names
+        ]
+        # The item pool still has exactly one item for each location left to fill.
+        unfilled_locations = self.multiworld.get_unfilled_locations(self.player)
+        assert len(unfilled_locations) == sum(1 for item in self.multiworld.itempool if item.player == self.player)
+        return filled_locations, pool_filler
+
+    def test_disabled(self):
+        filled_locations, pool_filler = self._run(0)
+        assert filled_locations == []
+        assert pool_filler
+
+    def test_places_percentage_of_filler(self):
+        filled_locations, pool_filler = self._run(50)
+        num_filler = len(filled_locations) + len(pool_filler)
+        assert len(filled_locations) == num_filler * 50 // 100
+        assert all(loc.item.name in _filler_item_names for loc in filled_locations)
+        assert all(loc.item.player == self.player and loc.item.location is loc for loc in filled_locations)
+
+    def test_places_legendary_crates_first(self):
+        filled_locations, _ = self._run(10)
+        legendary_crate_names = self.world.location_name_groups["Legendary Crate Drops"]
+        num_legendary_crates = sum(
+            1 for loc in self.multiworld.get_locations(self.player) if loc.name in legendary_crate_names
+        )
+        assert len(filled_locations) >= num_legendary_crates
+        filled_legendary_crates = [loc for loc in filled_locations if loc.name in legendary_crate_names]
+        assert len(filled_legendary_crates) == num_legendary_crates
+
+    def test_keeps_starting_locations_free(self):
+        # Fewer locations we can't reach at the start than filler, so some filler is left for the main fill.
+        filled_locations, pool_filler = self._run(100, waves_per_drop=1)
+        legendary_crate_names = self.world.location_name_groups["Legendary Crate Drops"]
+        starting_state = CollectionState(self.multiworld)
+        for loc in filled_locations:
+            assert loc.name in legendary_crate_names or not loc.can_reach(starting_state), loc.name
+            assert loc.item_rule(loc.item)
+        # Every location in a character region we don't start with has filler.
+        assert not any(
+            not loc.can_reach(starting_state) for loc in self.multiworld.get_unfilled_locations(self.player)
+        )
+        assert pool_filler
+
+    def test_same_seed_same_placement(self):
+        def placement() -> list[tuple[str, str]]:
+            filled_locations, _ = self._run(75, starting_characters=1)
+            return [(loc.name, loc.item.name) for loc in filled_locations]
+
+        assert placement() == placement()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from ..Constants import (
+    CHARACTER_LOCATION_ID_STRIDE,
+    CRATE_DROP_LOCATION_TEMPLATE,
+    LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE,
+    LOCATION_BASE_ID,
+    LOCATION_MAX_ID,
+    NUM_CHARACTERS,
+    NUM_WAVES,
+    SHOP_ITEM_LOCATION_TEMPLATE,
+    WAVE_COMPLETE_LOCATION_BASE_ID,
+    WAVE_COMPLETE_LOCATION_TEMPLATE,
+)
+from ..Locations import LocationKind, decode_location_id, encode_location_id, location_name_to_id
+
+
+def _location_name(kind: LocationKind, character: str | None, num: int | None, tier) -> str:
+    if kind is LocationKind.WAVE_COMPLETE:
+        return WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=num, char=character)
+    elif kind is LocationKind.SHOP_ITEM:
+        return SHOP_ITEM_LOCATION_TEMPLATE.format(tier=tier.value, num=num)
+    elif kind is LocationKind.CRATE_DROP:
+        return CRATE_DROP_LOCATION_TEMPLATE.format(num=num)
+    else:
+        return LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE.format(num=num)
+
+
+def _retired_run_won_ids() -> list[int]:
+    # The last ID in each character's block, see the location ID layout in Constants.py.
+    return [
+        WAVE_COMPLETE_LOCATION_BASE_ID + i * CHARACTER_LOCATION_ID_STRIDE + NUM_WAVES for i in range(NUM_CHARACTERS)
+    ]
+
+
+class TestBrotatoLocationIds(TestCase):
+    def test_decode_matches_location_names(self):
+        for location_name, location_id in location_name_to_id.items():
+            decoded = decode_location_id(location_id)
+            assert _location_name(*decoded) == location_name
+
+    def test_encode_is_inverse_of_decode(self):
+        for location_id in location_name_to_id.values():
+            assert encode_location_id(*decode_location_id(location_id)) == location_id
+
+    def test_ids_fill_layout(self):
+        retired_ids = set(_retired_run_won_ids())
+        expected_ids = [i for i in range(LOCATION_BASE_ID, LOCATION_MAX_ID + 1) if i not in retired_ids]
+        assert sorted(location_name_to_id.values()) == expected_ids
+
+    def test_known_ids(self):
+        # Spot check IDs from before the layout was made explicit, these should never change.
+        assert location_name_to_id["Wave 1 Completed (Well Rounded)"] == 0xF4E0_0000
+        assert "Run Won (Well Rounded)" not in location_name_to_id
+        assert 0xF4E0_0014 in _retired_run_won_ids()
+        assert location_name_to_id["Wave 20 Completed (Demon)"] == 0xF4E0_039A
+        assert location_name_to_id["Common Shop Item 1"] == 0xF4E0_039C
+        assert location_name_to_id["Loot Crate 1"] == 0xF4E0_03CE
+        assert location_name_to_id["Legendary Loot Crate 50"] == 0xF4E0_0431
+
+    def test_decode_invalid_ids(self):
+        for invalid_id in (LOCATION_BASE_ID - 1, LOCATION_MAX_ID + 1, 0, *_retired_run_won_ids()):
+            with self.assertRaises(ValueError):
+                decode_location_id(invalid_id)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import types
+from unittest import TestCase
+
+from BaseClasses import Location
+
+from ..Items import BrotatoItem
+from ..Locations import _LOCATION_ATTRIBUTES, BrotatoLocation, _location_defaults
+from .benchmark import WORST_CASE_OPTIONS
+from .benchmark.memory import (
+    UnslottedBrotatoItem,
+    UnslottedBrotatoLocation,
+    measure_bytes_per_player,
+    measure_item_bytes,
+    measure_location_bytes,
+)
+
+# Memory retained by each player with the options that create the most locations and items, after fill. This is a
+# coarse limit with plenty of headroom, meant to catch large regressions rather than small changes.
+WORST_CASE_BYTES_PER_PLAYER_CEILING = 1024 * 1024
+
+
+class TestBrotatoMemory(TestCase):
+    def test_worst_case_bytes_per_player(self):
+        bytes_per_player = measure_bytes_per_player(WORST_CASE_OPTIONS, num_players=5)
+        assert bytes_per_player < WORST_CASE_BYTES_PER_PLAYER_CEILING, (
+            f"Each player uses {bytes_per_player / 1024:.0f} KiB, "
+            f"limit is {WORST_CASE_BYTES_PER_PLAYER_CEILING / 1024:.0f} KiB."
+        )
+
+    def test_slotted_locations_smaller(self):
+        assert measure_location_bytes(BrotatoLocation) < measure_location_bytes(UnslottedBrotatoLocation)
+
+    def test_slotted_items_smaller(self):
+        assert measure_item_bytes(BrotatoItem) < measure_item_bytes(UnslottedBrotatoItem)
+
+    def test_no_instance_dict(self):
+        location = BrotatoLocation(1, "Loot Crate 1", 0, None)
+        location.item = BrotatoItem("Common Item", 0, 0, 1)
+        location.access_rule = lambda state: True
+        location.locked = True
+        assert not hasattr(BrotatoItem("Common Item", 0, 0, 1), "__dict__")
+        # Location isn't slotted, so the attribute exists, but nothing should have been stored in it.
+        assert location.__dict__ == {}
+
+    def test_location_attributes_match_base_class(self):
+        # BrotatoLocation stores these in slots, which is only correct while Location keeps them as plain class
+        # attributes. If this fails, Location has changed shape and _LOCATION_ATTRIBUTES needs to be updated to match.
+        # Attributes Location doesn't have at all are fine, since older and newer Archipelago versions differ.
+        descriptors = [
+            attribute
+            for attribute in _LOCATION_ATTRIBUTES
+            if attribute not in _location_defaults and hasattr(Location, attribute)
+        ]
+        assert not descriptors, (
+            f"Location implements {descriptors} as properties or slots, update _LOCATION_ATTRIBUTES."
+        )
+        new_defaults = [
+            name
+            for name, value in vars(Location).items()
+            if not name.startswith("__")
+            and name != "game"
+            and name not in _LOCATION_ATTRIBUTES
+            and not isinstance(value, (types.FunctionType, property, classmethod))
+        ]
+        assert not new_defaults, (
+            f"Location has new class-level defaults {new_defaults}, add them to _LOCATION_ATTRIBUTES."
+        )
+
+        location = BrotatoLocation(0, "Loot Crate 1")
+        for attribute, default in _location_defaults.items():
+            assert getattr(location, attribute) is default, attribute
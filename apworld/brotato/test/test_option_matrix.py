@@ -0,0 +1,125 @@
+"""Generate a player for every combination of a broad set of options, and check the world they create is consistent.
+
+Each case is generated up to and including pre_fill in a separate worker process, since each takes a while and they
+don't share anything. Set `BROTATO_TEST_PROCESSES` to change the number of processes, or to 1 to run every case in the
+test process (e.g. to use a debugger). The time each case took is printed to stderr, slowest first, and is also written
+as JSON to the path in `BROTATO_OPTION_MATRIX_REPORT`, if set.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+from unittest import TestCase
+
+from ..Constants import CHARACTERS, NUM_CHARACTERS
+from ..Feasibility import check_options, options_from_values
+from .benchmark import WORLD_STEPS, generation_stages, setup_multiworld
+
+PROCESSES_ENV_VAR = "BROTATO_TEST_PROCESSES"
+REPORT_ENV_VAR = "BROTATO_OPTION_MATRIX_REPORT"
+
+OPTION_MATRIX: Dict[str, List[Any]] = {
+    "waves_per_drop": [1, 5, 20],
+    # (num_common_crate_drops, num_legendary_crate_drops), to keep the number of cases down.
+    "crate_drops": [(0, 0), (25, 5), (50, 50)],
+    # (starting_characters, num_starting_characters)
+    "starting_characters": [(0, 5), (1, 1), (1, NUM_CHARACTERS)],
+    "num_starting_shop_slots": [0, 4],
+    "filler_bundle_size": [1, 10],
+}
+
+
+def option_matrix_cases() -> List[Dict[str, Any]]:
+    """Get the options for each case in OPTION_MATRIX."""
+    cases = []
+    for waves_per_drop, crate_drops, starting_characters, num_starting_shop_slots, filler_bundle_size in (
+        itertools.product(*OPTION_MATRIX.values())
+    ):
+        cases.append(
+            {
+                "waves_per_drop": waves_per_drop,
+                "num_common_crate_drops": crate_drops[0],
+                "num_legendary_crate_drops": crate_drops[1],
+                "starting_characters": starting_characters[0],
+                "num_starting_characters": starting_characters[1],
+                "num_starting_shop_slots": num_starting_shop_slots,
+                "filler_bundle_size": filler_bundle_size,
+            }
+        )
+    return cases
+
+
+def check_case(options: Dict[str, Any]) -> Tuple[List[str], float]:
+    """Generate a single player with the options up to pre_fill, returning any problems found and how long it took.
+
+    Options which can't be generated, according to Feasibility.check_options, are skipped and return no problems.
+    """
+    verdict = check_options(options_from_values(options), check_message_sizes=False)
+    if not verdict.feasible:
+        return [], 0.0
+
+    start = time.perf_counter()
+    multiworld = setup_multiworld(1, options, seed=0)
+    stages = generation_stages(multiworld)
+    for name in WORLD_STEPS:
+        stages[name]()
+    seconds = time.perf_counter() - start
+
+    player = multiworld.player_ids[0]
+    errors = []
+    locations = multiworld.get_locations(player)
+    # One "Run Won" event location for each character.
+    if len(locations) != verdict.counts.num_locations + NUM_CHARACTERS:
+        errors.append(f"{len(locations)} locations, expected {verdict.counts.num_locations + NUM_CHARACTERS}")
+    starting_characters = [item for item in multiworld.precollected_items[player] if item.name in CHARACTERS]
+    if len(starting_characters) != verdict.counts.num_starting_characters:
+        errors.append(
+            f"{len(starting_characters)} starting characters, expected {verdict.counts.num_starting_characters}"
+        )
+    num_unfilled = sum(1 for loc in locations if loc.item is None)
+    num_items = sum(1 for item in multiworld.itempool if item.player == player)
+    if num_unfilled != num_items:
+        errors.append(f"{num_unfilled} unfilled locations but {num_items} items left to place")
+    return errors, seconds
+
+
+def _case_name(options: Dict[str, Any]) -> str:
+    return ", ".join(f"{name}={value}" for name, value in options.items())
+
+
+class TestBrotatoOptionMatrix(TestCase):
+    def test_option_matrix(self):
+        cases = option_matrix_cases()
+        processes = int(os.environ.get(PROCESSES_ENV_VAR, 0)) or min(os.cpu_count() or 1, len(cases))
+        if processes == 1:
+            results = [check_case(options) for options in cases]
+        else:
+            with ProcessPoolExecutor(processes) as executor:
+                results = list(executor.map(check_case, cases))
+
+        report = sorted(
+            (
+                {"options": options, "seconds": round(seconds, 4), "errors": errors}
+                for options, (errors, seconds) in zip(cases, results)
+                # Skipped as infeasible
+                if seconds
+            ),
+            key=lambda case: case["seconds"],
+            reverse=True,
+        )
+        for case in report:
+            print(f"{case['seconds']:8.3f}s  {_case_name(case['options'])}", file=sys.stderr)
+        report_path = os.environ.get(REPORT_ENV_VAR)
+        if report_path:
+            with open(report_path, "w") as report_file:
+                json.dump(report, report_file, indent=2)
+
+        assert report, "Every case was skipped as infeasible"
+        failures = [f"{_case_name(case['options'])}: {'; '.join(case['errors'])}" for case in report if case["errors"]]
+        assert not failures, "\n".join(failures)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from NetUtils import NetworkItem, NetworkPlayer, NetworkSlot, SlotType
+
+from . import BrotatoTestBase
+from ..Feasibility import count_slot
+from ..Items import item_name_to_id
+from ..Locations import location_name_to_id
+from ..PayloadSize import (
+    _MAX_PLAYER_NAME_LENGTH,
+    _WORST_CASE_GAME_NAME,
+    _WORST_CASE_LOCATION_ID,
+    CLIENT_IN_BUFFER_BYTES,
+    _connected_command,
+    _message_size,
+    _received_items_command,
+    estimate_message_sizes,
+)
+
+# Godot's default WebSocket input buffer size, which the client used before increasing it.
+_GODOT_DEFAULT_IN_BUFFER_BYTES = 64 * 1024
+
+
+class TestBrotatoPayloadSize(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def test_default_options_fit_in_client_buffer(self):
+        self.world_setup()
+        sizes = self.world.estimate_message_sizes()
+        assert sizes.oversized_messages() == []
+        assert sizes.connect_reply > sizes.connected
+        assert sizes.connect_reply > sizes.received_items
+
+    def test_max_locations_fit_in_client_buffer(self):
+        self.options = {
+            "waves_per_drop": 1,
+            "num_common_crate_drops": 50,
+            "num_legendary_crate_drops": 50,
+        }
+        self.world_setup()
+        sizes = self.world.estimate_message_sizes()
+        assert sizes.oversized_messages() == []
+        # This is why the client needs a larger buffer than Godot's default.
+        assert "received_items" in sizes.oversized_messages(_GODOT_DEFAULT_IN_BUFFER_BYTES)
+
+    def test_more_checks_means_larger_messages(self):
+        self.options = {"waves_per_drop": 10}
+        self.world_setup()
+        fewer_checks_sizes = self.world.estimate_message_sizes()
+
+        self.options = {"waves_per_drop": 2}
+        self.world_setup()
+        more_checks_sizes = self.world.estimate_message_sizes()
+
+        assert more_checks_sizes.received_items > fewer_checks_sizes.received_items
+        assert more_checks_sizes.connected > fewer_checks_sizes.connected
+        assert more_checks_sizes.data_package == fewer_checks_sizes.data_package
+        assert more_checks_sizes.received_items < CLIENT_IN_BUFFER_BYTES
+
+    def test_estimate_matches_full_messages(self):
+        # The estimate works out the size of each list from one entry, check it against building the lists in full.
+        num_players = 12
+        self.options = {"waves_per_drop": 2, "num_common_crate_drops": 30}
+        self.world_setup()
+        slot_data = self.world.fill_slot_data()
+        sizes = estimate_message_sizes(self.world.options, num_players, slot_data)
+
+        counts = count_slot(self.world.options)
+        item = NetworkItem(max(item_name_to_id.values()), _WORST_CASE_LOCATION_ID, num_players, 0b100)
+        received_items = _received_items_command([item] * (counts.num_locations + counts.num_starting_characters))
+        name = "x" * _MAX_PLAYER_NAME_LENGTH
+        connected = _connected_command(
+            slot=num_players,
+            players=[NetworkPlayer(0, num_players, name, name)] * num_players,
+            locations=sorted(location_name_to_id.values())[: counts.num_locations],
+            slot_info={
+                slot: NetworkSlot(name, _WORST_CASE_GAME_NAME, SlotType.player) for slot in range(1, num_players + 1)
+            },
+            slot_data=slot_data,
+        )
+        assert sizes.received_items == _message_size(received_items)
+        connected_size = _message_size(connected)
+        assert sizes.connect_reply - sizes.connected == _message_size(connected, received_items) - connected_size
+        # The estimate counts every slot number with two digits, where slots 1-9 only have one.
+        assert sizes.connected == connected_size + 9
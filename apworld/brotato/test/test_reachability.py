@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import random
+from typing import Any, Dict, Sequence
+
+from BaseClasses import CollectionState
+
+from . import BrotatoTestBase
+from ..Constants import CHARACTERS
+from ..Items import ItemName
+from ..Reachability import goal_completed, location_in_logic
+
+_NUM_RANDOM_SUBSETS = 50
+
+
+class TestBrotatoReachability(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+    options = {
+        "waves_per_drop": 3,
+        "num_common_crate_drops": 20,
+        "num_legendary_crate_drops": 10,
+        "num_victories": 5,
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        # Every test uses the same options and only reads the multiworld, so they share it.
+        self.cached_world_setup()
+        # Round trip through JSON so the test sees what a tracker receives.
+        self.table: Dict[str, Any] = json.loads(json.dumps(self.world.fill_slot_data()["logic"]))
+
+    def _assert_matches_regions(self, characters: Sequence[str]):
+        state = CollectionState(self.multiworld)
+        for character in characters:
+            state.collect(self.world.create_item(character), True)
+        # The state starts with the starting characters, which the client also receives as items.
+        owned_item_ids = {item.code for item in self.multiworld.precollected_items[self.player]}
+        owned_item_ids.update(self.world.item_name_to_id[character] for character in characters)
+        for location in self.multiworld.get_locations(self.player):
+            if location.address is not None:
+                assert location_in_logic(self.table, location.address, owned_item_ids) == location.can_reach(state), (
+                    f"{location.name} with {characters}"
+                )
+
+    def test_starting_characters_only(self):
+        self._assert_matches_regions(())
+
+    def test_single_characters(self):
+        for character in CHARACTERS:
+            self._assert_matches_regions((character,))
+
+    def test_random_characters(self):
+        rand = random.Random(0)
+        for _ in range(_NUM_RANDOM_SUBSETS):
+            self._assert_matches_regions(rand.sample(CHARACTERS, rand.randint(2, len(CHARACTERS))))
+
+    def test_goal(self):
+        state = CollectionState(self.multiworld)
+        run_wins = 0
+        for character_index in range(self.options["num_victories"]):
+            assert goal_completed(self.table, run_wins) == self.multiworld.completion_condition[self.player](state)
+            assert not goal_completed(self.table, run_wins)
+            state.collect(self.world.create_item(ItemName.RUN_COMPLETE), True)
+            run_wins |= 1 << character_index
+            # Winning another run with the same character doesn't count twice.
+            assert goal_completed(self.table, run_wins | 1) == goal_completed(self.table, run_wins)
+        assert goal_completed(self.table, run_wins)
+        assert self.multiworld.completion_condition[self.player](state)
+        assert self.table["goal"]["data_storage_key"].format(team=0, slot=self.player) == "Brotato_RunWins_0_1"
+
+    def test_only_generated_crates_are_free(self):
+        crate_location_ids = {
+            location.address
+            for location in self.multiworld.get_locations(self.player)
+            if location.parent_region.name in ("Menu", "Loot Crates") and location.address is not None
+        }
+        free_location_ids = {
+            location_id
+            for first_id, last_id in self.table["free_location_ranges"]
+            for location_id in range(first_id, last_id + 1)
+        }
+        assert free_location_ids == crate_location_ids
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import itertools
+import random
+from typing import Iterable
+
+from BaseClasses import CollectionState, MultiWorld
+
+from . import BrotatoTestBase
+from ..Constants import CHARACTERS
+from ..Rules import character_bits
+
+_NUM_RANDOM_SUBSETS = 200
+
+
+class TestBrotatoFlatRegions(BrotatoTestBase):
+    """Check that create_flat_regions gives the same reachability as create_regions for every set of characters.
+
+    Every entrance rule in both layouts checks for a single character, and no location has an access rule, so a location
+    is reachable with a set of characters if and only if it's reachable with no characters or with one of the
+    characters in the set. This means checking the empty set and every single character is enough to show both layouts
+    are equivalent for all 2^44 sets of owned characters. Pairs of characters and random subsets are also checked in
+    case that stops being true.
+    """
+
+    run_default_tests = False
+    auto_construct = False
+    options = {"waves_per_drop": 5, "num_common_crate_drops": 20, "num_legendary_crate_drops": 10}
+
+    def _create_multiworld(self, flat_regions: bool) -> MultiWorld:
+        self.options = {**type(self).options, "flat_regions": flat_regions}
+        self.world_setup()
+        return self.multiworld
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.multiworlds = {
+            "regions": self._create_multiworld(flat_regions=False),
+            "flat_regions": self._create_multiworld(flat_regions=True),
+        }
+
+    def _reachable_locations(self, multiworld: MultiWorld, characters: Iterable[str]) -> set[str]:
+        state = CollectionState(multiworld)
+        state.brotato_characters[self.player] = sum(character_bits[c] for c in characters)
+        state.stale[self.player] = True
+        return {loc.name for loc in multiworld.get_locations(self.player) if loc.can_reach(state)}
+
+    def _assert_same_reachability(self, characters: Iterable[str]):
+        characters = tuple(characters)
+        reachable = {
+            name: self._reachable_locations(multiworld, characters) for name, multiworld in self.multiworlds.items()
+        }
+        assert reachable["regions"] == reachable["flat_regions"], f"Different reachability with {characters}"
+
+    def test_no_characters(self):
+        self._assert_same_reachability(())
+
+    def test_single_characters(self):
+        for character in CHARACTERS:
+            self._assert_same_reachability((character,))
+
+    def test_character_pairs(self):
+        for characters in itertools.combinations(CHARACTERS, 2):
+            self._assert_same_reachability(characters)
+
+    def test_random_character_subsets(self):
+        subset_random = random.Random(0)
+        for _ in range(_NUM_RANDOM_SUBSETS):
+            self._assert_same_reachability(c for c in CHARACTERS if subset_random.random() < 0.5)
+
+    def test_all_characters(self):
+        self._assert_same_reachability(CHARACTERS)
+
+    def test_fewer_entrances(self):
+        def num_entrances(multiworld: MultiWorld) -> int:
+            return sum(len(region.exits) for region in multiworld.get_regions(self.player))
+
+        assert num_entrances(self.multiworlds["regions"]) == 3 * len(CHARACTERS) + 1
+        assert num_entrances(self.multiworlds["flat_regions"]) == len(CHARACTERS)
+        assert len(self.multiworlds["flat_regions"].get_regions(self.player)) == len(CHARACTERS) + 1
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from BaseClasses import Item, ItemClassification, LocationProgressType
+
+from . import BrotatoTestBase
+from ..Constants import CHARACTERS, NUM_WAVES
+from ..Feasibility import count_slot
+from ..Regions import get_region_template
+
+
+class TestBrotatoRegionTemplate(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def _run(
+        self,
+        waves_per_drop: int,
+        num_common_crate_drops: int,
+        num_legendary_crate_drops: int,
+        **other_options: int,
+    ):
+        self.options = {
+            "waves_per_drop": waves_per_drop,
+            "num_common_crate_drops": num_common_crate_drops,
+            "num_legendary_crate_drops": num_legendary_crate_drops,
+            **other_options,
+        }
+        self.world_setup()
+
+        player_id = self.multiworld.player_ids[0]
+        waves_with_checks = list(range(waves_per_drop, NUM_WAVES + 1, waves_per_drop))
+
+        crate_region = self.multiworld.get_region("Loot Crates", player_id)
+        assert len(crate_region.locations) == num_common_crate_drops + num_legendary_crate_drops
+
+        for character in CHARACTERS:
+            character_region = self.multiworld.get_region(f"In-Game ({character})", player_id)
+            location_names = {loc.name for loc in character_region.locations}
+            expected_location_names = {f"Run Won ({character})"} | {
+                f"Wave {w} Completed ({character})" for w in waves_with_checks
+            }
+            assert location_names == expected_location_names
+            assert all(loc.parent_region is character_region for loc in character_region.locations)
+
+            # "Run Won" locations are events, holding a locked "Run Won" event item.
+            run_won_location = self.multiworld.get_location(f"Run Won ({character})", player_id)
+            assert run_won_location.address is None
+            assert run_won_location.locked and run_won_location.event
+            assert run_won_location.item.name == "Run Won" and run_won_location.item.code is None
+
+    def test_default_region_layout(self):
+        self._run(waves_per_drop=10, num_common_crate_drops=25, num_legendary_crate_drops=5)
+
+    def test_max_region_layout(self):
+        self._run(waves_per_drop=1, num_common_crate_drops=50, num_legendary_crate_drops=50)
+
+    def test_no_crates_region_layout(self):
+        # Only one check per character, so remove the upgrades to keep the item pool from outgrowing the locations.
+        self._run(
+            waves_per_drop=20,
+            num_common_crate_drops=0,
+            num_legendary_crate_drops=0,
+            num_common_upgrades=0,
+            num_uncommon_upgrades=0,
+            num_rare_upgrades=0,
+            num_legendary_upgrades=0,
+        )
+
+    def test_region_template_is_shared(self):
+        template = get_region_template((5, 10, 15, 20), 10, 2)
+        assert get_region_template((5, 10, 15, 20), 10, 2) is template
+        assert get_region_template((10, 20), 10, 2) is not template
+
+
+class TestBrotatoLegendaryCrates(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def _legendary_crates(self, **options):
+        self.options = {"waves_per_drop": 1, "num_legendary_crate_drops": 20, **options}
+        self.world_setup()
+        legendary_crate_names = self.world.location_name_groups["Legendary Crate Drops"]
+        legendary_crates = [
+            loc for loc in self.multiworld.get_locations(self.player) if loc.name in legendary_crate_names
+        ]
+        assert len(legendary_crates) == self.options["num_legendary_crate_drops"]
+        return legendary_crates
+
+    def test_rejects_every_progression_classification(self):
+        legendary_crate = self._legendary_crates()[0]
+        for classification in (
+            ItemClassification.progression,
+            ItemClassification.progression_skip_balancing,
+            ItemClassification.progression | ItemClassification.useful,
+            ItemClassification.progression | ItemClassification.trap,
+        ):
+            assert not legendary_crate.item_rule(Item("Other Progression", classification, None, 2)), classification
+        for classification in (
+            ItemClassification.filler,
+            ItemClassification.useful,
+            ItemClassification.trap,
+            ItemClassification.useful | ItemClassification.trap,
+        ):
+            assert legendary_crate.item_rule(Item("Other Item", classification, None, 2)), classification
+
+    def test_excluded_with_enough_filler(self):
+        legendary_crates = self._legendary_crates()
+        assert all(loc.progress_type == LocationProgressType.EXCLUDED for loc in legendary_crates)
+        # They still can't get progression items, e.g. from progression balancing.
+        assert not any(loc.item_rule(self.world.create_item(CHARACTERS[-1])) for loc in legendary_crates)
+
+    def test_not_excluded_without_enough_filler(self):
+        # With one check per character, there are only 5 filler items even without any upgrades.
+        legendary_crates = self._legendary_crates(
+            waves_per_drop=20,
+            num_common_crate_drops=0,
+            num_common_upgrades=0,
+            num_uncommon_upgrades=0,
+            num_rare_upgrades=0,
+            num_legendary_upgrades=0,
+        )
+        assert count_slot(self.world.options).num_filler_items == 5
+        assert all(loc.progress_type == LocationProgressType.DEFAULT for loc in legendary_crates)
+        assert not any(loc.item_rule(self.world.create_item(CHARACTERS[-1])) for loc in legendary_crates)
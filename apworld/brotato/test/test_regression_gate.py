@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from .benchmark.regression import (
+    REGRESSION_SCENARIOS,
+    compare_to_baseline,
+    find_unchecked_metrics,
+    load_baseline,
+    measure_scenario,
+)
+
+_BASELINE = {
+    "scenarios": {
+        "small": {"seconds": 1.0, "peak_memory_bytes": 1000, "objects": {"regions": 10, "locations": 20}},
+        "counts_only": {"objects": {"regions": 10}},
+    }
+}
+
+
+class TestBrotatoRegressionGate(TestCase):
+    def test_within_tolerance(self):
+        results = {"small": {"seconds": 1.2, "peak_memory_bytes": 1050, "objects": {"regions": 10, "locations": 20}}}
+        assert compare_to_baseline(results, _BASELINE, time_tolerance=0.25, memory_tolerance=0.1) == []
+
+    def test_slower_and_heavier(self):
+        results = {"small": {"seconds": 1.3, "peak_memory_bytes": 1200, "objects": {"regions": 10, "locations": 20}}}
+        regressions = compare_to_baseline(results, _BASELINE, time_tolerance=0.25, memory_tolerance=0.1)
+        assert len(regressions) == 2
+        assert regressions[0].startswith("small: seconds")
+        assert regressions[1].startswith("small: peak_memory_bytes")
+
+    def test_object_counts_are_exact(self):
+        # Fewer objects is a change too, which needs the baseline updated.
+        for objects in ({"regions": 11, "locations": 20}, {"regions": 9, "locations": 20}, {"regions": 10}):
+            results = {"small": {"seconds": 0.5, "peak_memory_bytes": 500, "objects": objects}}
+            assert len(compare_to_baseline(results, _BASELINE)) == 1, objects
+
+    def test_missing_metrics_are_skipped(self):
+        results = {
+            "small": {"objects": {"regions": 10, "locations": 20}},
+            "counts_only": {"seconds": 100.0, "peak_memory_bytes": 10**9, "objects": {"regions": 10}},
+        }
+        assert compare_to_baseline(results, _BASELINE) == []
+        assert compare_to_baseline({"new": {"objects": {}}}, _BASELINE) == ["new: not in the baseline."]
+
+    def test_metrics_missing_from_baseline_are_reported(self):
+        results = {
+            "small": {"seconds": 1.0, "peak_memory_bytes": 1000, "objects": {"regions": 10, "locations": 20}},
+            "counts_only": {"seconds": 0.1, "peak_memory_bytes": 100, "objects": {"regions": 10}},
+        }
+        unchecked = find_unchecked_metrics(results, _BASELINE)
+        assert len(unchecked) == 2
+        assert unchecked[0].startswith("counts_only: seconds is not in the baseline")
+        assert unchecked[1].startswith("counts_only: peak_memory_bytes is not in the baseline")
+        assert find_unchecked_metrics({"counts_only": {"objects": {"regions": 10}}}, _BASELINE) == []
+
+    def test_checked_in_baseline_has_no_machine_metrics(self):
+        # Times and memory depend on the machine, so they belong in a local baseline.
+        baseline = load_baseline()
+        for name in REGRESSION_SCENARIOS:
+            assert set(baseline["scenarios"][name]) == {"objects"}, name
+
+    def test_object_counts_match_checked_in_baseline(self):
+        results = {
+            name: measure_scenario(scenario, objects_only=True) for name, scenario in REGRESSION_SCENARIOS.items()
+        }
+        regressions = compare_to_baseline(results, load_baseline())
+        assert not regressions, (
+            "\n".join(regressions) + "\nIf this is intended, update the baseline with "
+            "`python -m worlds.brotato.test.benchmark.regression --update --objects-only`."
+        )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from BaseClasses import CollectionState
+
+from . import BrotatoTestBase
+from ..Constants import CHARACTERS, DEFAULT_CHARACTERS
+from ..Items import ItemName
+from ..Rules import character_bits
+
+
+class TestBrotatoRules(BrotatoTestBase):
+    options = {"num_victories": 3}
+
+    def test_character_bitmask_tracks_owned_characters(self):
+        state = CollectionState(self.multiworld)
+        expected_mask = sum(character_bits[c] for c in DEFAULT_CHARACTERS)
+        assert state.brotato_characters[self.player] == expected_mask
+
+        demon = self.world.create_item("Demon")
+        state.collect(demon, True)
+        assert state.brotato_characters[self.player] == expected_mask | character_bits["Demon"]
+        assert state._brotato_has_character(self.player, "Demon")
+
+        state.remove(demon)
+        assert state.brotato_characters[self.player] == expected_mask
+        assert not state._brotato_has_character(self.player, "Demon")
+
+    def test_character_entrances_use_owned_characters(self):
+        state = CollectionState(self.multiworld)
+        for character in CHARACTERS:
+            entrance = self.multiworld.get_entrance(f"Start Game ({character})", self.player)
+            assert entrance.access_rule(state) == (character in DEFAULT_CHARACTERS)
+
+        state.collect(self.world.create_item("Demon"), True)
+        assert self.multiworld.get_entrance("Start Game (Demon)", self.player).access_rule(state)
+
+    def test_run_win_counter_tracks_completion(self):
+        state = CollectionState(self.multiworld)
+        completion_condition = self.multiworld.completion_condition[self.player]
+        run_wins = [self.world.create_item(ItemName.RUN_COMPLETE) for _ in range(3)]
+
+        for run_win in run_wins[:2]:
+            state.collect(run_win, True)
+        assert state.brotato_run_wins[self.player] == 2
+        assert not completion_condition(state)
+
+        state.collect(run_wins[2], True)
+        assert completion_condition(state)
+
+        copied_state = state.copy()
+        copied_state.remove(run_wins[2])
+        assert not completion_condition(copied_state)
+        assert completion_condition(state)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from unittest import TestCase, mock
+
+from .. import BrotatoWorld
+from .benchmark.seed_farm import generate_seed, grid_cases, parse_grid_entry, summarize_case
+
+
+class TestBrotatoSeedFarm(TestCase):
+    def test_grid_cases(self):
+        grid = dict([parse_grid_entry("waves_per_drop=1,5"), parse_grid_entry("starting_characters=random,0")])
+        assert grid == {"waves_per_drop": [1, 5], "starting_characters": ["random", 0]}
+        assert list(grid_cases(grid)) == [
+            {"starting_characters": "random", "waves_per_drop": 1},
+            {"starting_characters": "random", "waves_per_drop": 5},
+            {"starting_characters": 0, "waves_per_drop": 1},
+            {"starting_characters": 0, "waves_per_drop": 5},
+        ]
+
+    def test_records_first_line_of_error(self):
+        error = RuntimeError("No more spots to place items\nUnplaced items: ...")
+        with mock.patch.object(BrotatoWorld, "create_items", side_effect=error):
+            reason, seconds = generate_seed({}, num_players=2, seed=1)
+        assert reason == "RuntimeError: No more spots to place items"
+        assert seconds > 0
+
+    def test_summarize_case(self):
+        results = [(1, None, 1.0), (2, "FillError: No more spots", 3.0), (3, None, 2.0), (4, "FillError: x", 4.0)]
+        summary = summarize_case({"waves_per_drop": 1}, 4, results)
+        assert summary["runs"] == 4
+        assert summary["failures"] == 2
+        assert summary["failure_rate"] == 0.5
+        assert summary["failure_reasons"] == {"FillError: No more spots": 1, "FillError: x": 1}
+        assert summary["failed_seeds"] == [2, 4]
+        assert summary["seconds"]["mean"] == 2.5
+        assert summary["seconds"]["p50"] == 3.0
+        assert summary["seconds"]["max"] == 4.0
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from BaseClasses import CollectionState, ItemClassification
+
+from . import BrotatoTestBase
+from ..Constants import CHARACTERS
+from ..Items import ItemName
+
+_RUN_WON = ItemName.RUN_COMPLETE.value
+
+
+class TestBrotatoSkipBalancing(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def _run(self, skip_balancing: str) -> dict[str, ItemClassification]:
+        """Generate with the skip_balancing option, returning the classification of each progression item."""
+        self.options = {"skip_balancing": skip_balancing, "num_legendary_crate_drops": 5}
+        # Tests with the same options only read the multiworld, so they share it.
+        self.cached_world_setup()
+        items = [item for item in self.multiworld.itempool if item.player == self.player]
+        items += [loc.item for loc in self.multiworld.get_locations(self.player) if loc.item is not None]
+        classifications = {item.name: item.classification for item in items if item.advancement}
+        # Every copy of an item should have the same classification.
+        for item in items:
+            if item.name in classifications:
+                assert item.classification == classifications[item.name], item.name
+        assert _RUN_WON in classifications
+        assert set(classifications) - {_RUN_WON} <= set(CHARACTERS)
+        return classifications
+
+    def _assert_skips_balancing(self, classifications: dict[str, ItemClassification], names: set[str]):
+        for name, classification in classifications.items():
+            expected = ItemClassification.progression
+            if name in names:
+                expected = ItemClassification.progression_skip_balancing
+            assert classification == expected, f"{name} is {classification!r}"
+            assert self.world.create_item(name).classification == expected
+
+    def test_none(self):
+        self._assert_skips_balancing(self._run("none"), set())
+
+    def test_run_won(self):
+        self._assert_skips_balancing(self._run("run_won"), {_RUN_WON})
+
+    def test_characters(self):
+        self._assert_skips_balancing(self._run("characters"), set(CHARACTERS))
+
+    def test_all(self):
+        self._assert_skips_balancing(self._run("all"), {_RUN_WON, *CHARACTERS})
+
+    def test_legendary_crates_reject_skipped_characters(self):
+        self._run("characters")
+        character = self.world.create_item(CHARACTERS[-1])
+        legendary_crate_names = self.world.location_name_groups["Legendary Crate Drops"]
+        legendary_crates = [
+            loc for loc in self.multiworld.get_locations(self.player) if loc.name in legendary_crate_names
+        ]
+        assert legendary_crates
+        assert not any(loc.item_rule(character) for loc in legendary_crates)
+
+    def test_skipped_characters_unlock_regions(self):
+        self._run("all")
+        character = CHARACTERS[-1]
+        region = self.multiworld.get_region(f"In-Game ({character})", self.player)
+        state = CollectionState(self.multiworld)
+        assert not region.can_reach(state)
+        state.collect(self.world.create_item(character))
+        assert region.can_reach(state)
@@ -57,7 +57,7 @@ class TestBrotatoStartingCharacters(BrotatoTestBase):
         self._run(num_characters=5)
 
     def test_custom_starting_characters_15(self):
-        self._run(num_characters=5)
+        self._run(num_characters=15)
 
     def test_custom_starting_characters_max(self):
         self._run(num_characters=len(CHARACTERS), expected_characters=CHARACTERS)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from . import BrotatoTestBase
+
+
+class TestBrotatoWorldCache(BrotatoTestBase):
+    run_default_tests = False
+    auto_construct = False
+
+    def _cached_multiworld(self, num_victories: int):
+        self.options = {"num_victories": num_victories}
+        self.cached_world_setup()
+        return self.multiworld
+
+    def test_reuses_multiworld_with_same_options(self):
+        multiworld = self._cached_multiworld(3)
+        assert self._cached_multiworld(3) is multiworld
+        assert self.world is multiworld.worlds[self.player]
+        assert self._cached_multiworld(4) is not multiworld
+
+    def test_keeps_only_most_recently_used(self):
+        cache_size = self._multiworld_cache_size
+        first = self._cached_multiworld(1)
+        second = self._cached_multiworld(2)
+        for num_victories in range(3, cache_size + 1):
+            self._cached_multiworld(num_victories)
+        # Using the first multiworld again keeps it when the next one is added, so the second is dropped instead.
+        assert self._cached_multiworld(1) is first
+        self._cached_multiworld(cache_size + 1)
+        assert len(self._multiworld_cache) == cache_size
+        assert self._cached_multiworld(1) is first
+        assert self._cached_multiworld(2) is not second
@@ -54,7 +54,8 @@ func _init(
 	total_consumable_drops_: int,
 	total_legendary_consumable_drops_: int,
 	num_starting_shop_slots_: int,
-	waves_with_checks: Array
+	waves_with_checks: Array,
+	removed_wave_checks: Dictionary
 ):
 	num_wins_needed = num_wins_needed_
 	total_consumable_drops = total_consumable_drops_
@@ -64,6 +65,9 @@ func _init(
 		character_progress[character] = ApCharacterProgress.new()
 		for wave in waves_with_checks:
 			character_progress[character].reached_check_wave[int(wave)] = false
+		# Checks removed by bundling filler, see FillerBundleSize in the apworld.
+		for wave in removed_wave_checks.get(character, []):
+			character_progress[character].reached_check_wave.erase(int(wave))
 
 # Helpers to get combined values
 func num_shop_slots() -> int:
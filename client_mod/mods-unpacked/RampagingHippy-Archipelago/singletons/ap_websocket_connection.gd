@@ -53,7 +53,8 @@ func _ready():
 	#   - Max in/out buffer = 64 KB
 	#   - Max in/out packets = 1024 
 	# We increase the in buffer to 256 KB because some messages we receive are too large
-	# for 64. The other defaults are fine though.
+	# for 64. The other defaults are fine though. If this changes, update
+	# CLIENT_IN_BUFFER_BYTES in the apworld's PayloadSize.py to match.
 	_client.set_buffers(256, 1024, 64, 1024)
 	
 	# Always process so we don't disconnect if the game is paused for too long.
@@ -11,6 +11,12 @@ onready var websocket_client
 
 
 const DataPackage = preload("./data_package.gd")
+# The last data package received from a server, so we don't need to request it again
+# when reconnecting to a server with the same data package.
+const DATA_PACKAGE_CACHE_PATH = "user://archipelago_brotato_data_package.json"
+# Versions of ID_LAYOUT_VERSION in IdLayout.py in the apworld this client understands.
+# Version 1 is from worlds generated before "Run Won" locations became events.
+const ID_LAYOUT_VERSIONS = [1, 2]
 
 export var player: String
 export var password: String
@@ -19,6 +25,17 @@ var constants = _constants_namespace.new()
 var game_state
 
 var _data_package: DataPackage.BrotatoDataPackage
+# Checksum of the server's data package, from RoomInfo. Only used for worlds generated
+# before the ID layout was added to slot data, see _on_connected.
+var _data_package_checksum
+# Commands received while waiting for the data package, handled once it arrives.
+var _pending_connected_command = null
+var _pending_received_items_commands: Array = []
+# Data storage key to record the characters the player won runs with in, see
+# RUN_WINS_DATA_STORAGE_KEY_TEMPLATE in the apworld's Constants.py. Null for worlds
+# generated before "Run Won" locations became events, which have locations to check
+# instead.
+var _run_wins_key = null
 
 # Item received signals
 signal character_received(character)
@@ -44,6 +61,7 @@ func _ready():
 	_status = websocket_client.connect("on_connected", self, "_on_connected")
 	_status = websocket_client.connect("on_data_package", self, "_on_data_package")
 	_status = websocket_client.connect("on_received_items", self, "_on_received_items")
+	_status = websocket_client.connect("on_retrieved", self, "_on_retrieved")
 	_status = websocket_client.connect("on_connection_refused", self, "_on_connection_refused")
 
 func _on_connection_state_changed(new_state: int):\
@@ -51,6 +69,10 @@ func _on_connection_state_changed(new_state: int):\
 	if new_state == 3:
 		# Reset game data to get a clean slate in case we reconnect
 		ModLoaderLog.debug("Disconnected from multiworld.", LOG_NAME)
+		_data_package = null
+		_pending_connected_command = null
+		_pending_received_items_commands.clear()
+		_run_wins_key = null
 
 func connected_to_multiworld() -> bool:
 	# Convenience method to check if connected to AP, so other scenes don't need to 
@@ -158,10 +180,18 @@ func wave_won(character_id: String, wave_number: int):
 func run_won(character_id: String):
 	## Notify the client that the player won a run with a particular character.
 	##
-	## If the player hasn't won a run with that character before, then the corresponding
-	## location check will be sent to the server.
+	## If the player hasn't won a run with that character before, then the win is
+	## recorded in data storage, or the corresponding location check is sent to the
+	## server for worlds generated before "Run Won" locations became events.
 	var character_name = constants.CHARACTER_ID_TO_NAME[character_id]
-	if not game_state.character_progress[character_name].won_run:
+	if game_state.character_progress[character_name].won_run:
+		return
+	if _run_wins_key != null:
+		game_state.character_progress[character_name].won_run = true
+		var character_bit = 1 << constants.CHARACTER_NAME_TO_ID.keys().find(character_name)
+		websocket_client.set_value(_run_wins_key, 0, false, [{"operation": "or", "value": character_bit}])
+		run_complete_received()
+	else:
 		var location_name = "Run Won (%s)" % character_name
 		var location_id = _data_package.location_name_to_id[location_name]
 		
@@ -177,8 +207,11 @@ func run_complete_received():
 		websocket_client.status_update(30)
 
 # WebSocket Command received handlers
-func _on_room_info(_room_info):
-	websocket_client.get_data_package(["Brotato"])
+func _on_room_info(room_info):
+	# Connect straight away, the slot data has everything needed to compute location and
+	# item IDs. We only need the data package if the slot data doesn't have the layout.
+	_data_package_checksum = room_info.get("datapackage_checksums", {}).get(GAME)
+	websocket_client.send_connect(GAME, player, password)
 
 func _on_connection_refused(command):
 	var errors = command["errors"]
@@ -187,6 +220,29 @@ func _on_connection_refused(command):
 	emit_signal("on_connection_refused", errors)
 
 func _on_connected(command):
+	var slot_data = command["slot_data"]
+	# JSON numbers are parsed as floats, which Array.has doesn't consider equal to ints.
+	var id_layout_version = slot_data.get("id_layout", {}).get("version")
+	if id_layout_version != null and int(id_layout_version) in ID_LAYOUT_VERSIONS:
+		_data_package = DataPackage.BrotatoDataPackage.from_id_layout(
+			slot_data["id_layout"],
+			slot_data["num_consumables"],
+			slot_data["num_legendary_consumables"]
+		)
+	else:
+		# The world was generated before the ID layout was added to the slot data, or
+		# with a layout this client doesn't understand.
+		var cached_data_package = _load_cached_data_package(_data_package_checksum)
+		if cached_data_package == null:
+			# Handle this once we have the data package, see _on_data_package.
+			_pending_connected_command = command
+			websocket_client.get_data_package([GAME])
+			return
+		ModLoaderLog.debug("Using cached data package with checksum %s" % _data_package_checksum, LOG_NAME)
+		_data_package = DataPackage.BrotatoDataPackage.from_data_package(cached_data_package)
+	_handle_connected(command)
+
+func _handle_connected(command):
 	var location_groups: DataPackage.BrotatoLocationGroups = _data_package.location_groups
 
 	# Get options and other info from the slot data
@@ -196,7 +252,9 @@ func _on_connected(command):
 		slot_data["num_consumables"],
 		slot_data["num_legendary_consumables"],
 		slot_data["num_starting_shop_slots"],
-		slot_data["waves_with_checks"])
+		slot_data["waves_with_checks"],
+		# Not in the slot data of worlds generated before filler bundling.
+		slot_data.get("removed_wave_checks", {}))
 
 	# Look through the checked locations to find some additonal progress
 	for location_id in command["checked_locations"]:
@@ -220,45 +278,100 @@ func _on_connected(command):
 			var wave_number = character_wave_complete[0]
 			var wave_character = character_wave_complete[1]
 			game_state.character_progress[wave_character].reached_check_wave[wave_number] = true
+
+	if location_groups.character_run_complete.empty():
+		# "Run Won" locations are events, so the runs won are in data storage instead,
+		# see _on_retrieved.
+		_run_wins_key = constants.RUN_WINS_DATA_STORAGE_KEY % [int(command["team"]), int(command["slot"])]
+		websocket_client.get_value([_run_wins_key])
 		
 func _on_received_items(command):
+	if _data_package == null:
+		# Still waiting for the data package, see _on_connected.
+		_pending_received_items_commands.append(command)
+		return
+
 	var items = command["items"]
 	# NOTE: We used to have some debug logs in each if/elif branch to say what item(s)
 	# we got, but for larger payloads, such as connecting to a completed game or when a
 	# game is released/collected, the log commands caused a several-second slowdown when
 	# combined. Add logs here only when debugging something, don't keep.
 	for item in items:
-		var item_name: String = _data_package.item_id_to_name[item["item"]]
-		if constants.CHARACTER_NAME_TO_ID.has(item_name):
-			game_state.character_progress[item_name].unlocked = true
-			emit_signal("character_received", item_name)
-		elif item_name in constants.XP_ITEM_NAME_TO_VALUE:
-			var xp_value = constants.XP_ITEM_NAME_TO_VALUE[item_name]
-			game_state.starting_xp += xp_value
-			emit_signal("xp_received", xp_value)
-		elif item_name in constants.GOLD_DROP_NAME_TO_VALUE:
-			var gold_value = constants.GOLD_DROP_NAME_TO_VALUE[item_name]
-			game_state.starting_gold += gold_value
-			emit_signal("gold_received", gold_value)
-		elif item_name in constants.ITEM_DROP_NAME_TO_TIER:
-			var item_tier = constants.ITEM_DROP_NAME_TO_TIER[item_name]
-			game_state.received_items_by_tier[item_tier] += 1
-			emit_signal("item_received", item_tier)
-		elif item_name in constants.UPGRADE_NAME_TO_TIER:
-			var upgrade_tier = constants.UPGRADE_NAME_TO_TIER[item_name]
-			game_state.received_upgrades_by_tier[upgrade_tier] += 1
-			emit_signal("upgrade_received", upgrade_tier)
-		elif item_name == constants.SHOP_SLOT_ITEM_NAME:
-			game_state.num_received_shop_slots += 1
+		# [kind, amount, tier], see BrotatoDataPackage.item_effects.
+		var effect: Array = _data_package.item_effects[item["item"]]
+		var kind: String = effect[0]
+		if kind == "character":
+			# Character items are named after the character.
+			var character: String = _data_package.item_id_to_name[item["item"]]
+			game_state.character_progress[character].unlocked = true
+			emit_signal("character_received", character)
+		elif kind == "xp":
+			game_state.starting_xp += effect[1]
+			emit_signal("xp_received", effect[1])
+		elif kind == "gold":
+			game_state.starting_gold += effect[1]
+			emit_signal("gold_received", effect[1])
+		elif kind == "item":
+			game_state.received_items_by_tier[effect[2]] += 1
+			emit_signal("item_received", effect[2])
+		elif kind == "upgrade":
+			game_state.received_upgrades_by_tier[effect[2]] += 1
+			emit_signal("upgrade_received", effect[2])
+		elif kind == "shop_slot":
+			game_state.num_received_shop_slots += effect[1]
 			var total_shop_slots = get_num_shop_slots()
 			emit_signal("shop_slot_received", total_shop_slots)
-		elif item_name == "Run Won":
+		elif kind == "run_won":
+			# Only sent by worlds generated before "Run Won" locations became events.
 			run_complete_received()
 		else:
-			ModLoaderLog.warning("No handler for item defined: %s." % item_name, LOG_NAME)
+			ModLoaderLog.warning("No handler for item defined: %s." % _data_package.item_id_to_name[item["item"]], LOG_NAME)
+
+func _on_retrieved(command):
+	if _run_wins_key == null or command["keys"].get(_run_wins_key) == null:
+		return
+	# A bitmask of the characters the player won runs with, in the same order as
+	# CHARACTER_NAME_TO_ID.
+	var run_wins = int(command["keys"][_run_wins_key])
+	var characters = constants.CHARACTER_NAME_TO_ID.keys()
+	for character_index in range(characters.size()):
+		var character_progress = game_state.character_progress[characters[character_index]]
+		if (run_wins & (1 << character_index)) != 0 and not character_progress.won_run:
+			character_progress.won_run = true
+			run_complete_received()
 
 func _on_data_package(received_data_package):
 	ModLoaderLog.debug("Got the data package", LOG_NAME)
 	var data_package_info = received_data_package["data"]["games"][GAME]
+	_save_cached_data_package(data_package_info)
 	_data_package = DataPackage.BrotatoDataPackage.from_data_package(data_package_info)
-	websocket_client.send_connect(GAME, player, password)
+
+	if _pending_connected_command != null:
+		_handle_connected(_pending_connected_command)
+		_pending_connected_command = null
+	for received_items_command in _pending_received_items_commands:
+		_on_received_items(received_items_command)
+	_pending_received_items_commands.clear()
+
+func _load_cached_data_package(checksum):
+	## Get the cached data package if it has the given checksum, otherwise null.
+	if checksum == null:
+		return null
+	var cache_file = File.new()
+	if cache_file.open(DATA_PACKAGE_CACHE_PATH, File.READ) != OK:
+		return null
+	var parsed = JSON.parse(cache_file.get_as_text())
+	cache_file.close()
+	if parsed.error != OK or not parsed.result is Dictionary or parsed.result.get("checksum") != checksum:
+		return null
+	return parsed.result
+
+func _save_cached_data_package(data_package_info: Dictionary):
+	if not data_package_info.has("checksum"):
+		return
+	var cache_file = File.new()
+	if cache_file.open(DATA_PACKAGE_CACHE_PATH, File.WRITE) != OK:
+		ModLoaderLog.warning("Failed to cache the data package.", LOG_NAME)
+		return
+	cache_file.store_string(JSON.print(data_package_info))
+	cache_file.close()
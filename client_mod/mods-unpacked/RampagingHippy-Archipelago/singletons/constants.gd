@@ -76,6 +76,12 @@ const GOLD_DROP_NAME_TO_VALUE = {
 	"Gold (50)": 50,
 	"Gold (100)": 100,
 	"Gold (200)": 200,
+	# Bundles of the above, see FillerBundleSize in the apworld.
+	"Gold (125)": 125,
+	"Gold (250)": 250,
+	"Gold (500)": 500,
+	"Gold (1000)": 1000,
+	"Gold (2000)": 2000,
 }
 
 const XP_ITEM_NAME_TO_VALUE = {
@@ -85,8 +91,28 @@ const XP_ITEM_NAME_TO_VALUE = {
 	"XP (50)": 50,
 	"XP (100)": 100,
 	"XP (150)": 150,
+	# Bundles of the above, see FillerBundleSize in the apworld.
+	"XP (125)": 125,
+	"XP (250)": 250,
+	"XP (500)": 500,
+	"XP (750)": 750,
+	"XP (1000)": 1000,
+	"XP (1500)": 1500,
 }
 
+# Tier names in the "item_tiers" entry of the ID layout, see ItemRarity in the apworld's
+# Constants.py.
+const TIER_NAME_TO_TIER = {
+	"Common": Tier.COMMON,
+	"Uncommon": Tier.UNCOMMON,
+	"Rare": Tier.RARE,
+	"Legendary": Tier.LEGENDARY
+}
+
+# Data storage key for the characters the player won runs with, formatted with the team
+# and slot. Must match RUN_WINS_DATA_STORAGE_KEY_TEMPLATE in the apworld's Constants.py.
+const RUN_WINS_DATA_STORAGE_KEY = "Brotato_RunWins_%d_%d"
+
 func _init():
 	for char_name in CHARACTER_NAME_TO_ID:
 		var char_id = CHARACTER_NAME_TO_ID[char_name]
@@ -1,5 +1,7 @@
 const LOG_NAME = "RampagingHippy-Archipelago/DataPackage"
 
+const _constants_namespace = preload("./constants.gd")
+
 class BrotatoLocationGroups:
 	## Container for id-to-value for various types of locations we want to reference at runtime.
 	var consumables: Dictionary
@@ -58,27 +60,54 @@ class BrotatoDataPackage:
 	var location_name_to_id: Dictionary
 	var location_id_to_name: Dictionary
 	var location_groups: BrotatoLocationGroups
+	# What each item does when received, as [kind, amount, tier], keyed by item ID. See
+	# ItemEffect in the apworld's Items.py. Tier is -1 for items without one.
+	var item_effects: Dictionary
 
 	func _init(
 		item_name_to_id_: Dictionary,
 		location_name_to_id_: Dictionary,
 		item_id_to_name_: Dictionary,
 		location_id_to_name_: Dictionary,
-		location_groups_: BrotatoLocationGroups
+		location_groups_: BrotatoLocationGroups,
+		item_effects_: Dictionary
 	):
 		item_name_to_id = item_name_to_id_
 		item_id_to_name = item_id_to_name_
 		location_name_to_id = location_name_to_id_
 		location_id_to_name = location_id_to_name_
 		location_groups = location_groups_
-		
+		item_effects = item_effects_
+
+	static func _item_effect_from_name(item_name: String) -> Array:
+		# For data packages and ID layouts from worlds generated before item effects were
+		# added to the ID layout. Must match get_item_effect in the apworld's Items.py.
+		var constants = _constants_namespace
+		if constants.CHARACTER_NAME_TO_ID.has(item_name):
+			return ["character", constants.CHARACTER_NAME_TO_ID.keys().find(item_name), -1]
+		elif item_name in constants.XP_ITEM_NAME_TO_VALUE:
+			return ["xp", constants.XP_ITEM_NAME_TO_VALUE[item_name], -1]
+		elif item_name in constants.GOLD_DROP_NAME_TO_VALUE:
+			return ["gold", constants.GOLD_DROP_NAME_TO_VALUE[item_name], -1]
+		elif item_name in constants.ITEM_DROP_NAME_TO_TIER:
+			return ["item", 0, constants.ITEM_DROP_NAME_TO_TIER[item_name]]
+		elif item_name in constants.UPGRADE_NAME_TO_TIER:
+			return ["upgrade", 0, constants.UPGRADE_NAME_TO_TIER[item_name]]
+		elif item_name == constants.SHOP_SLOT_ITEM_NAME:
+			return ["shop_slot", 1, -1]
+		elif item_name == "Run Won":
+			return ["run_won", 1, -1]
+		return ["unknown", 0, -1]
+
 	static func from_data_package(data_package: Dictionary) -> BrotatoDataPackage:
 		# Expects that you already extracted the game's data package from the message
 		var item_name_to_id_ = data_package["item_name_to_id"]
 		var item_id_to_name_ = Dictionary()
+		var item_effects_ = Dictionary()
 		for item_name in item_name_to_id_:
 			var item_id = item_name_to_id_[item_name]
 			item_id_to_name_[item_id] = item_name
+			item_effects_[item_id] = _item_effect_from_name(item_name)
 
 		var location_name_to_id_ = data_package["location_name_to_id"]
 		var location_id_to_name_ = Dictionary()
@@ -93,5 +122,73 @@ class BrotatoDataPackage:
 			location_name_to_id_,
 			item_id_to_name_,
 			location_id_to_name_,
-			location_groups_
+			location_groups_,
+			item_effects_
+		)
+
+	static func from_id_layout(id_layout: Dictionary, num_consumables: int, num_legendary_consumables: int) -> BrotatoDataPackage:
+		# Build the same tables from the "id_layout" slot data entry, so we don't need to
+		# request the data package. See IdLayout.py in the apworld for the layout. Only
+		# the locations the client checks are included.
+		#
+		# JSON numbers are parsed as floats, so the IDs computed here are floats too, the
+		# same as the IDs in the data package and received items.
+		var item_name_to_id_ = Dictionary()
+		var item_id_to_name_ = Dictionary()
+		var item_effects_ = Dictionary()
+		var items = id_layout["items"]
+		for item_index in range(items.size()):
+			var item_name = items[item_index]
+			if item_name == null:
+				continue
+			var item_id = id_layout["item_base_id"] + item_index
+			item_name_to_id_[item_name] = item_id
+			item_id_to_name_[item_id] = item_name
+			if id_layout.has("item_effects"):
+				# [kind, amount, tier], with kind and tier as indexes into the lists of
+				# their names, and tier -1 for items without one.
+				var effect = id_layout["item_effects"][item_index]
+				var tier_index = int(effect[2])
+				var tier = -1
+				if tier_index >= 0:
+					tier = _constants_namespace.TIER_NAME_TO_TIER[id_layout["item_tiers"][tier_index]]
+				item_effects_[item_id] = [id_layout["item_effect_kinds"][int(effect[0])], int(effect[1]), tier]
+			else:
+				item_effects_[item_id] = _item_effect_from_name(item_name)
+
+		var location_name_to_id_ = Dictionary()
+		var characters = id_layout["characters"]
+		var character_stride = id_layout["character_stride"]
+		for character_index in range(characters.size()):
+			var character = characters[character_index]
+			var character_offset = character_index * character_stride
+			# The last ID in each character's block was for the run complete location.
+			for wave_number in range(1, int(character_stride)):
+				var wave_location_name = "Wave %d Completed (%s)" % [wave_number, character]
+				location_name_to_id_[wave_location_name] = id_layout["wave_complete_base_id"] + character_offset + wave_number - 1
+			if id_layout.has("run_complete_base_id"):
+				# Only in version 1 layouts. "Run Won" locations are now events without IDs.
+				var run_location_name = "Run Won (%s)" % character
+				location_name_to_id_[run_location_name] = id_layout["run_complete_base_id"] + character_offset
+
+		for crate_number in range(1, num_consumables + 1):
+			location_name_to_id_["Loot Crate %d" % crate_number] = id_layout["crate_drop_base_id"] + crate_number - 1
+
+		for legendary_crate_number in range(1, num_legendary_consumables + 1):
+			var legendary_location_name = "Legendary Loot Crate %d" % legendary_crate_number
+			location_name_to_id_[legendary_location_name] = id_layout["legendary_crate_drop_base_id"] + legendary_crate_number - 1
+
+		var location_id_to_name_ = Dictionary()
+		for location_name in location_name_to_id_:
+			location_id_to_name_[location_name_to_id_[location_name]] = location_name
+
+		var location_groups_ = BrotatoLocationGroups.from_location_table(location_name_to_id_)
+
+		return BrotatoDataPackage.new(
+			item_name_to_id_,
+			location_name_to_id_,
+			item_id_to_name_,
+			location_id_to_name_,
+			location_groups_,
+			item_effects_
 		)